@@ -0,0 +1 @@
+"""Benchmarks do dashboard com dados sintéticos (ver ``executar.py``)."""
@@ -0,0 +1,279 @@
+"""Suíte de benchmarks do dashboard sobre dados sintéticos, totalmente offline.
+
+Para cada escala (1x = tamanho real), gera os CSVs com ``benchmarks.sintetico``
+e mede, cada etapa em um subprocesso próprio (para o pico de memória não
+misturar etapas):
+
+- ``ingestao_fonte``: carga completa a partir dos CSVs (parse + snapshots);
+- ``ingestao_snapshot``: carga a partir dos snapshots Parquet;
+- ``analises``: cada estrutura pré-calculada e cada análise do registro;
+- ``app``: primeira execução do script do Streamlit e uma reexecução.
+
+Os resultados vão para ``benchmarks/resultados/<data>-<commit>.json``; com
+``--comparar`` a execução é comparada com a anterior (ou com um arquivo)::
+
+    python -m benchmarks.executar --escalas 1 10 100 --comparar
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import sintetico
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIR_DADOS = Path(__file__).resolve().parent / 'dados'
+DIR_RESULTADOS = Path(__file__).resolve().parent / 'resultados'
+ETAPAS = ('ingestao_fonte', 'ingestao_snapshot', 'analises', 'app')
+
+# Variação a partir da qual a comparação marca regressão (e o mínimo absoluto, em s)
+LIMIAR_REGRESSAO = 0.10
+LIMIAR_ABSOLUTO = 0.02
+
+
+def _pico_mb():
+    """Pico de memória residente do processo (MB)."""
+    # No Linux o ru_maxrss sobrevive ao exec e herdaria o pico do processo pai
+    status = Path('/proc/self/status')
+    if status.exists():
+        for linha in status.read_text().splitlines():
+            if linha.startswith('VmHWM:'):
+                return round(int(linha.split()[1]) / 2**10, 1)
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(pico / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+
+def _cronometrar(funcao, repeticoes=1):
+    """Menor tempo (s) de ``repeticoes`` chamadas e o último retorno."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        retorno = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), retorno
+
+
+def _config(fonte, snapshots):
+    from brasileirao.fontes import ConfigDados
+    return ConfigDados(diretorio=Path(snapshots), fonte_base=str(fonte))
+
+
+def medir_ingestao(fonte, snapshots, repeticoes, do_zero=False):
+    """Carga completa; ``do_zero`` apaga os snapshots antes de cada repetição."""
+    from brasileirao.incremental import carregar
+
+    def carga():
+        if do_zero:
+            shutil.rmtree(snapshots, ignore_errors=True)
+        return carregar(_config(fonte, snapshots))
+
+    melhor = None
+    for _ in range(repeticoes):
+        segundos, estado = _cronometrar(carga)
+        if melhor is None or segundos < melhor[0]:
+            melhor = segundos, estado.relatorio_carga
+    segundos, relatorio = melhor
+    medidas = [{'item': 'total', 'segundos': segundos}]
+    for linha in relatorio:
+        for fase in ('leitura_s', 'interpretacao_s', 'snapshot_s'):
+            # Fases paralelas entre datasets: informativas, fora do critério de regressão
+            medidas.append({'item': f"{linha['dataset']}.{fase[:-2]}", 'segundos': linha[fase], 'detalhe': True})
+    return medidas
+
+
+def medir_analises(fonte, snapshots, repeticoes):
+    from brasileirao.agregados import construir_agregados
+    from brasileirao.analises import REGISTRO, Contexto
+    from brasileirao.confrontos import construir_confrontos
+    from brasileirao.incremental import carregar
+    from brasileirao.partidas import IndicePartidas
+    from brasileirao.tabela import construir_tabela
+    from brasileirao.temporadas import IndiceTemporadas
+
+    dados = carregar(_config(fonte, snapshots)).dados
+    medidas, estruturas = [], {}
+    construtores = {
+        'agregados': lambda: construir_agregados(dados),
+        'tabela': lambda: construir_tabela(dados.get('full')),
+        'confrontos': lambda: construir_confrontos(dados),
+        'temporadas': lambda: IndiceTemporadas(dados),
+        'partidas': lambda: IndicePartidas(dados),
+    }
+    for nome, construir in construtores.items():
+        segundos, estruturas[nome] = _cronometrar(construir, repeticoes)
+        medidas.append({'item': f'contexto.{nome}', 'segundos': segundos})
+    contexto = Contexto(dados, versao='benchmark', **estruturas)
+    for chave in REGISTRO.chaves():
+        def avaliar():
+            REGISTRO.limpar()
+            return REGISTRO.avaliar(chave, contexto)
+        segundos, _ = _cronometrar(avaliar, repeticoes)
+        medidas.append({'item': f'analise.{chave}', 'segundos': segundos})
+        # Intervalo de temporadas que não coincide com um agregado pronto
+        temporadas = contexto.temporadas.temporadas
+        if len(temporadas) > 2:
+            def avaliar_intervalo():
+                REGISTRO.limpar()
+                return REGISTRO.avaliar(chave, contexto, inicio=temporadas[1], fim=temporadas[-2])
+            segundos, _ = _cronometrar(avaliar_intervalo, repeticoes)
+            medidas.append({'item': f'analise.{chave}.intervalo', 'segundos': segundos})
+    return medidas
+
+
+def medir_app(fonte, snapshots, repeticoes):
+    from streamlit.testing.v1 import AppTest
+    os.environ.update(BRASILEIRAO_FONTE=str(fonte), BRASILEIRAO_DIR_DADOS=str(snapshots),
+                      BRASILEIRAO_OFFLINE='1')
+    app = AppTest.from_file(str(RAIZ / 'brasileirao_app.py'), default_timeout=600)
+    segundos, _ = _cronometrar(app.run)
+    medidas = [{'item': 'primeira_execucao', 'segundos': segundos}]
+    segundos, _ = _cronometrar(app.run, repeticoes)
+    medidas.append({'item': 'reexecucao', 'segundos': segundos})
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return medidas
+
+
+MEDIDORES = {
+    'ingestao_fonte': lambda *args: medir_ingestao(*args, do_zero=True),
+    'ingestao_snapshot': medir_ingestao,
+    'analises': medir_analises,
+    'app': medir_app,
+}
+
+
+def _executar_etapa(etapa, fonte, snapshots, repeticoes):
+    """Roda uma etapa em um subprocesso e devolve as medidas com o pico de memória."""
+    comando = [sys.executable, '-m', 'benchmarks.executar', '--etapa', etapa,
+               '--fonte', str(fonte), '--snapshots', str(snapshots), '--repeticoes', str(repeticoes)]
+    processo = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True)
+    if processo.returncode != 0:
+        erro = (processo.stderr.strip().splitlines() or ['?'])[-1]
+        return [{'item': 'erro', 'segundos': None, 'erro': erro}]
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+
+def _commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        sujo = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=RAIZ,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconhecido'
+    return f'{commit}-modificado' if sujo else commit
+
+
+def executar(escalas, etapas=ETAPAS, repeticoes=3, dir_dados=DIR_DADOS):
+    """Gera os dados que faltarem, mede as etapas e devolve o resultado da execução."""
+    medidas = []
+    for escala in escalas:
+        fonte = Path(dir_dados) / f'escala-{escala}'
+        if not (fonte / 'linhas.json').exists():
+            linhas = sintetico.gerar(fonte, escala)
+            (fonte / 'linhas.json').write_text(json.dumps(linhas))
+        linhas = json.loads((fonte / 'linhas.json').read_text())
+        snapshots = fonte / 'snapshots'
+        for etapa in etapas:
+            resultado = _executar_etapa(etapa, fonte, snapshots, repeticoes)
+            for medida in resultado:
+                medidas.append({'escala': escala, 'linhas': sum(linhas.values()), 'etapa': etapa, **medida})
+            total = next((m['segundos'] for m in resultado if m['item'] == 'total'),
+                         sum(m['segundos'] or 0 for m in resultado))
+            print(f'escala {escala:>3}x  {etapa:<18} {total:8.3f}s  pico {resultado[-1].get("pico_mb", "-")} MB',
+                  file=sys.stderr)
+    return {
+        'commit': _commit(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'ambiente': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'repeticoes': repeticoes,
+        'medidas': medidas,
+    }
+
+
+def gravar(resultado, dir_resultados=DIR_RESULTADOS):
+    dir_resultados = Path(dir_resultados)
+    dir_resultados.mkdir(parents=True, exist_ok=True)
+    caminho = dir_resultados / f"{resultado['data'].replace(':', '')}-{resultado['commit']}.json"
+    caminho.write_text(json.dumps(resultado, indent=1, ensure_ascii=False))
+    return caminho
+
+
+def _tabela(resultado):
+    df = pd.DataFrame(resultado['medidas'])
+    df['detalhe'] = df.get('detalhe', pd.Series(False, index=df.index)).fillna(False).astype(bool)
+    return df.set_index(['escala', 'etapa', 'item'])[['segundos', 'pico_mb', 'detalhe']]
+
+
+def comparar(anterior, atual):
+    """Tabela ``antes``/``agora`` por medida, com a variação e a marca de regressão."""
+    antes, agora = _tabela(anterior), _tabela(atual)
+    df = antes.drop(columns='detalhe').join(agora, lsuffix='_antes', rsuffix='_agora', how='inner')
+    df['variacao_%'] = (100 * (df['segundos_agora'] / df['segundos_antes'] - 1)).round(1)
+    df['regressao'] = ((df['segundos_agora'] > df['segundos_antes'] * (1 + LIMIAR_REGRESSAO))
+                       & (df['segundos_agora'] - df['segundos_antes'] > LIMIAR_ABSOLUTO)
+                       & ~df['detalhe'])
+    return df.drop(columns='detalhe')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--etapas', nargs='+', choices=ETAPAS, default=list(ETAPAS))
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--dados', default=str(DIR_DADOS), help='onde guardar os CSVs sintéticos')
+    parser.add_argument('--resultados', default=str(DIR_RESULTADOS))
+    parser.add_argument('--comparar', nargs='?', const='', metavar='ARQUIVO',
+                        help='compara com ARQUIVO (padrão: o resultado anterior)')
+    # Execução interna de uma etapa (subprocesso)
+    parser.add_argument('--etapa', choices=ETAPAS, help=argparse.SUPPRESS)
+    parser.add_argument('--fonte', help=argparse.SUPPRESS)
+    parser.add_argument('--snapshots', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.etapa:
+        medidas = MEDIDORES[args.etapa](args.fonte, args.snapshots, args.repeticoes)
+        for medida in medidas:
+            medida['segundos'] = round(medida['segundos'], 5)
+        medidas[-1]['pico_mb'] = _pico_mb()
+        for medida in medidas:
+            medida.setdefault('pico_mb', medidas[-1]['pico_mb'])
+        print(json.dumps(medidas))
+        return
+
+    anteriores = sorted(Path(args.resultados).glob('*.json'))
+    resultado = executar(args.escalas, args.etapas, args.repeticoes, args.dados)
+    caminho = gravar(resultado, args.resultados)
+    print(f'Resultados gravados em {caminho}')
+    if args.comparar is not None:
+        base = Path(args.comparar) if args.comparar else (anteriores[-1] if anteriores else None)
+        if base is None:
+            print('Nenhum resultado anterior para comparar.')
+            return
+        tabela = comparar(json.loads(base.read_text()), resultado)
+        with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+            print(f'Comparação com {base.name}:')
+            print(tabela)
+        regressoes = tabela[tabela['regressao']]
+        if len(regressoes):
+            print(f'{len(regressoes)} medida(s) mais de {LIMIAR_REGRESSAO:.0%} mais lenta(s).')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
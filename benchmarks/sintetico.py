@@ -0,0 +1,159 @@
+"""Gerador de CSVs sintéticos com o mesmo esquema dos datasets do Brasileirão.
+
+A escala 1 tem aproximadamente o tamanho real: 20 temporadas (2003-2022) de
+20 times em turno e returno (7.600 partidas), com gols, cartões e estatísticas
+só a partir de 2014, como nos dados originais. Na escala N cada temporada tem
+N vezes mais rodadas (os mesmos 20 times se enfrentam 2N vezes), então todas
+as tabelas crescem N vezes mantendo times, atletas e temporadas realistas.
+
+Tudo é gerado de forma vetorizada e determinística (``semente``)::
+
+    python -m benchmarks.sintetico destino --escala 10
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from brasileirao.fontes import ARQUIVOS
+
+TEMPORADAS = range(2003, 2023)
+INICIO_EVENTOS = 2014
+TIMES = 20
+ELENCO = 30
+ESTADOS = ('SP', 'RJ', 'MG', 'RS', 'PR', 'BA', 'PE', 'CE', 'GO', 'SC')
+FORMACOES = ('4-4-2', '4-3-3', '3-5-2', '4-2-3-1', '3-4-3')
+POSICOES = ('Goleiro', 'Zagueiro', 'Lateral', 'Volante', 'Meia', 'Atacante')
+
+
+def _rodadas(times, rng):
+    """Pares (mandante, visitante) de um turno e returno pelo método do círculo."""
+    ordem = list(rng.permutation(times))
+    turno = []
+    for _ in range(len(ordem) - 1):
+        turno.append([(ordem[i], ordem[-1 - i]) for i in range(len(ordem) // 2)])
+        ordem = [ordem[0], ordem[-1], *ordem[1:-1]]
+    return turno + [[(v, m) for m, v in rodada] for rodada in turno]
+
+
+def gerar_partidas(escala, rng):
+    nomes = np.array([f'Clube {i:03d}' for i in range(TIMES * 2)])
+    linhas = []
+    for temporada in TEMPORADAS:
+        times = rng.choice(len(nomes), TIMES, replace=False)
+        rodadas = [r for _ in range(escala) for r in _rodadas(times, rng)]
+        # Rodadas espalhadas de abril a dezembro (várias por dia nas escalas altas)
+        dias = np.linspace(0, 245, len(rodadas)).astype(int)
+        for rodada, (jogos, dia) in enumerate(zip(rodadas, dias), start=1):
+            for mandante, visitante in jogos:
+                linhas.append((temporada, rodada, dia, mandante, visitante))
+    temporada, rodada, dia, mandante, visitante = map(np.array, zip(*linhas))
+    n = len(temporada)
+    datas = pd.to_datetime(temporada.astype(str), format='%Y') + pd.to_timedelta(90 + dia, unit='D')
+    placar_m, placar_v = rng.poisson(1.45, n), rng.poisson(1.05, n)
+    vencedor = np.where(placar_m > placar_v, nomes[mandante],
+                        np.where(placar_v > placar_m, nomes[visitante], '-'))
+    return pd.DataFrame({
+        'ID': np.arange(1, n + 1),
+        'rodata': rodada,
+        'data': datas.strftime('%d/%m/%Y'),
+        'hora': rng.choice(['16:00', '18:30', '19:00', '21:30'], n),
+        'mandante': nomes[mandante],
+        'visitante': nomes[visitante],
+        'formacao_mandante': rng.choice(FORMACOES, n),
+        'formacao_visitante': rng.choice(FORMACOES, n),
+        'tecnico_mandante': np.char.add('Técnico ', (mandante * 3 + temporada % 3).astype(str)),
+        'tecnico_visitante': np.char.add('Técnico ', (visitante * 3 + temporada % 3).astype(str)),
+        'vencedor': vencedor,
+        'arena': np.char.add('Arena ', nomes[mandante]),
+        'mandante_Placar': placar_m,
+        'visitante_Placar': placar_v,
+        'mandante_Estado': np.array(ESTADOS)[mandante % len(ESTADOS)],
+        'visitante_Estado': np.array(ESTADOS)[visitante % len(ESTADOS)],
+    })
+
+
+def _atletas(clubes, rng):
+    return np.char.add(np.char.add(clubes.astype(str), ' - Atleta '), rng.integers(1, ELENCO + 1, len(clubes)).astype(str))
+
+
+def _minutos(n, rng):
+    minutos = rng.integers(1, 91, n).astype(str)
+    acrescimo = rng.random(n) < 0.05
+    minutos[acrescimo] = np.char.add(np.where(rng.random(acrescimo.sum()) < 0.5, '45+', '90+'),
+                                     rng.integers(1, 6, acrescimo.sum()).astype(str))
+    return minutos
+
+
+def gerar_eventos(full, rng):
+    """Gols, cartões e estatísticas das partidas a partir de ``INICIO_EVENTOS``."""
+    partidas = full[full['data'].str[-4:].astype(int) >= INICIO_EVENTOS]
+    ids, rodadas = partidas['ID'].to_numpy(), partidas['rodata'].to_numpy()
+    mandante, visitante = partidas['mandante'].to_numpy(), partidas['visitante'].to_numpy()
+
+    # Um gol por linha: cada partida repete mandante_Placar vezes o mandante etc.
+    gm, gv = partidas['mandante_Placar'].to_numpy(), partidas['visitante_Placar'].to_numpy()
+    idx = np.concatenate([np.repeat(np.arange(len(ids)), gm), np.repeat(np.arange(len(ids)), gv)])
+    clubes = np.concatenate([np.repeat(mandante, gm), np.repeat(visitante, gv)])
+    ordem = np.argsort(idx, kind='stable')
+    idx, clubes = idx[ordem], clubes[ordem]
+    tipo = rng.choice(np.array(['', 'Penalty', 'Gol Contra'], dtype=object), len(idx), p=[0.87, 0.1, 0.03])
+    gols = pd.DataFrame({
+        'partida_id': ids[idx], 'rodata': rodadas[idx], 'clube': clubes,
+        'atleta': _atletas(clubes, rng), 'minuto': _minutos(len(idx), rng),
+        'tipo_de_gol': pd.Series(tipo).replace('', None),
+    })
+
+    por_clube = rng.poisson(2.7, (len(ids), 2))
+    idx = np.concatenate([np.repeat(np.arange(len(ids)), por_clube[:, 0]),
+                          np.repeat(np.arange(len(ids)), por_clube[:, 1])])
+    clubes = np.concatenate([np.repeat(mandante, por_clube[:, 0]), np.repeat(visitante, por_clube[:, 1])])
+    ordem = np.argsort(idx, kind='stable')
+    idx, clubes = idx[ordem], clubes[ordem]
+    cartoes = pd.DataFrame({
+        'partida_id': ids[idx], 'rodata': rodadas[idx], 'clube': clubes,
+        'cartao': rng.choice(['Amarelo', 'Vermelho'], len(idx), p=[0.93, 0.07]),
+        'atleta': _atletas(clubes, rng), 'num_camisa': rng.integers(1, 40, len(idx)),
+        'posicao': rng.choice(POSICOES, len(idx)), 'minuto': _minutos(len(idx), rng),
+    })
+
+    n = len(ids) * 2
+    estatisticas = pd.DataFrame({
+        'partida_id': np.repeat(ids, 2), 'rodata': np.repeat(rodadas, 2),
+        'clube': np.column_stack([mandante, visitante]).ravel(),
+        'chutes': rng.integers(4, 25, n), 'chutes_no_alvo': rng.integers(0, 10, n),
+        'posse_de_bola': np.char.add(rng.integers(30, 71, n).astype(str), '%'),
+        'passes': rng.integers(200, 650, n),
+        'precisao_passes': np.char.add(rng.integers(60, 92, n).astype(str), '%'),
+        'faltas': rng.integers(5, 25, n), 'cartao_amarelo': rng.integers(0, 6, n),
+        'cartao_vermelho': rng.choice([0, 1], n, p=[0.94, 0.06]),
+        'impedimentos': rng.integers(0, 6, n), 'escanteios': rng.integers(0, 12, n),
+    })
+    return gols, cartoes, estatisticas
+
+
+def gerar(destino, escala=1, semente=0):
+    """Grava os quatro CSVs em ``destino`` e devolve ``{nome: linhas}``."""
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(semente)
+    full = gerar_partidas(escala, rng)
+    gols, cartoes, estatisticas = gerar_eventos(full, rng)
+    tabelas = {'full': full, 'gols': gols, 'cartoes': cartoes, 'estatisticas': estatisticas}
+    for nome, df in tabelas.items():
+        df.to_csv(destino / ARQUIVOS[nome], index=False)
+    return {nome: len(df) for nome, df in tabelas.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera CSVs sintéticos do Brasileirão.')
+    parser.add_argument('destino')
+    parser.add_argument('--escala', type=int, default=1)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+    print(gerar(args.destino, args.escala, args.semente))
+
+
+if __name__ == '__main__':
+    main()
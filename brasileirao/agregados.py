@@ -0,0 +1,198 @@
+"""Armazém de agregados pré-calculados para as abas do dashboard.
+
+Todos os rankings são montados de uma vez, quando os dados carregam, com um
+único ``groupby`` por DataFrame de origem. Cada resultado fica guardado sob a
+chave ``(metrica, temporada, filtro)`` (``temporada=None`` é o histórico todo),
+e as abas só fazem consultas O(1) ao armazém, sem reprocessar os dados.
+"""
+import pandas as pd
+
+from . import classificacao
+
+# Métricas ordenadas do menor para o maior; as demais, do maior para o menor
+ORDEM_CRESCENTE = {'jogos_estado'}
+
+TOP_PARTIDAS = 10
+
+
+def ano_dos_eventos(df, df_full):
+    """Ano de cada linha de gols/cartões: a coluna ``ano`` ou o ano da partida."""
+    if 'ano' in df.columns:
+        return df['ano']
+    if df_full is not None and 'partida_id' in df.columns and 'ano' in df_full.columns:
+        ano_partida = pd.Series(df_full['ano'].to_numpy(), index=df_full['ID'].to_numpy())
+        return df['partida_id'].map(ano_partida).rename('ano')
+    return pd.Series(pd.NA, index=df.index, name='ano', dtype='Int16')
+
+
+class ArmazemAgregados:
+    """Rankings indexados por ``(metrica, temporada, filtro)``."""
+
+    def __init__(self):
+        self._tabelas = {}
+        self.temporadas = []
+        # Datasets cujos rankings estão no armazém (com ou sem o frame em memória)
+        self.datasets = set()
+
+    def guardar(self, metrica, temporada, filtro, valor):
+        self._tabelas[(metrica, temporada, filtro)] = valor
+
+    def obter(self, metrica, temporada=None, filtro=None):
+        """Ranking de uma temporada (ou do histórico, com ``temporada=None``).
+
+        Devolve uma cópia rasa: com Copy-on-Write, alterar o resultado copia os
+        dados e não mexe no ranking guardado, que é compartilhado entre sessões.
+        """
+        valor = self._tabelas.get((metrica, temporada, filtro))
+        return pd.Series(dtype='int64') if valor is None else valor.copy(deep=False)
+
+    def intervalo(self, metrica, inicio=None, fim=None, filtro=None):
+        """Combina os rankings das temporadas de ``inicio`` a ``fim`` (inclusive; ``None`` = sem limite)."""
+        temporadas = [t for t in self.temporadas
+                      if (inicio is None or t >= inicio) and (fim is None or t <= fim)]
+        if temporadas == self.temporadas:
+            return self.obter(metrica, None, filtro)
+        if len(temporadas) == 1:
+            return self.obter(metrica, temporadas[0], filtro)
+        partes = [self.obter(metrica, t, filtro) for t in temporadas]
+        if not partes:
+            return pd.Series(dtype='int64')
+        return _combinar(metrica, partes)
+
+    def somar(self, outro):
+        """Novo armazém com os rankings deste somados aos de ``outro``.
+
+        Usado na atualização incremental: ``outro`` é o armazém montado só com
+        as linhas novas, e o custo depende do tamanho dos rankings, não do
+        histórico de partidas.
+        """
+        armazem = ArmazemAgregados()
+        armazem.temporadas = sorted(set(self.temporadas) | set(outro.temporadas))
+        armazem.datasets = self.datasets | outro.datasets
+        for chave in self._tabelas.keys() | outro._tabelas.keys():
+            partes = [a._tabelas[chave] for a in (self, outro) if chave in a._tabelas]
+            armazem._tabelas[chave] = _combinar(chave[0], partes) if len(partes) > 1 else partes[0]
+        return armazem
+
+    def por_temporada(self):
+        """Cópia só com os rankings por temporada, sem os do histórico."""
+        armazem = ArmazemAgregados()
+        armazem.temporadas = list(self.temporadas)
+        armazem.datasets = set(self.datasets)
+        armazem._tabelas = {chave: valor for chave, valor in self._tabelas.items() if chave[1] is not None}
+        return armazem
+
+    def chaves(self):
+        return list(self._tabelas)
+
+
+def _combinar(metrica, partes):
+    """Soma rankings (ou junta tops de partidas) de recortes disjuntos."""
+    if isinstance(partes[0], pd.DataFrame):
+        # O top N da união está contido na união dos tops de cada parte
+        partidas = pd.concat(partes)
+        return partidas.sort_values('total_gols', ascending=False, kind='stable').head(TOP_PARTIDAS)
+    soma = pd.concat(partes).groupby(level=0, observed=True).sum()
+    return _ordenar(metrica, soma)
+
+
+def _ordenar(metrica, serie):
+    serie = serie[serie > 0]
+    return serie.sort_values(ascending=metrica in ORDEM_CRESCENTE, kind='stable')
+
+
+def _guardar_por_temporada(armazem, metrica, contagem, filtro=None):
+    """Guarda ``contagem`` (indexada por ``(ano, item)``) por temporada e no total."""
+    for ano, serie in contagem.groupby(level=0, observed=True):
+        if pd.notna(ano):
+            armazem.guardar(metrica, int(ano), filtro, _ordenar(metrica, serie.droplevel(0)))
+    total = contagem.groupby(level=1, observed=True).sum()
+    armazem.guardar(metrica, None, filtro, _ordenar(metrica, total))
+
+
+def _agregar_jogos(armazem, df_full):
+    anos = df_full['ano']
+    if 'vencedor' in df_full.columns:
+        vitorias = df_full.groupby([anos, 'vencedor'], observed=True).size()
+        vitorias = vitorias[vitorias.index.get_level_values(1) != '-']
+        _guardar_por_temporada(armazem, 'vitorias', vitorias)
+
+    if 'mandante_Estado' in df_full.columns and 'visitante_Estado' in df_full.columns:
+        estados = pd.concat([
+            df_full.groupby([anos, 'mandante_Estado'], observed=True).size(),
+            df_full.groupby([anos, 'visitante_Estado'], observed=True).size(),
+        ])
+        estados = estados.groupby(level=[0, 1], observed=True).sum()
+        _guardar_por_temporada(armazem, 'jogos_estado', estados)
+
+    if 'mandante_Placar' in df_full.columns and 'visitante_Placar' in df_full.columns:
+        total_gols = (df_full['mandante_Placar'].astype('int16')
+                      + df_full['visitante_Placar'].astype('int16')).rename('total_gols')
+        ordem = total_gols.sort_values(ascending=False, kind='stable').index
+        partidas = df_full.loc[ordem].assign(total_gols=total_gols.loc[ordem])
+        armazem.guardar('partidas_mais_gols', None, None, partidas.head(TOP_PARTIDAS))
+        for ano, grupo in partidas.groupby('ano', sort=False):
+            armazem.guardar('partidas_mais_gols', int(ano), None, grupo.head(TOP_PARTIDAS))
+
+
+def contar_eventos(df, df_full, evento):
+    """Contagens de gols/cartões por ``(ano, classe, atleta)`` e por ``(ano, partida_id)``.
+
+    Contagens de partes diferentes dos dados podem ser somadas com
+    ``somar_contagens`` (modo de streaming).
+    """
+    anos = ano_dos_eventos(df, df_full)
+    classes = classificacao.codigos(df, evento)
+    contagem = df.groupby([anos, classes, 'atleta'], observed=True, dropna=False).size()
+    contagem = contagem[contagem.index.get_level_values(2).notna()]
+    por_partida = None
+    if 'partida_id' in df.columns:
+        por_partida = df.groupby([anos, 'partida_id'], observed=True, dropna=False).size()
+    return contagem, por_partida
+
+
+def somar_contagens(*contagens):
+    """Soma contagens com o mesmo formato de índice (partes ``None`` são ignoradas)."""
+    partes = [c for c in contagens if c is not None]
+    if len(partes) < 2:
+        return partes[0] if partes else None
+    niveis = list(range(partes[0].index.nlevels))
+    return pd.concat(partes).groupby(level=niveis, observed=True, dropna=False).sum()
+
+
+def guardar_eventos(armazem, metrica, evento, contagem, por_partida=None):
+    """Rankings de atletas a partir da contagem por (ano, classe, atleta).
+
+    Gera o ranking geral e um por classe do evento (pênalti, gol contra,
+    amarelo, ...), filtrando pelo código inteiro da classe, e o total de
+    eventos por partida (``<metrica>_por_partida``).
+    """
+    por_atleta = contagem.groupby(level=[0, 2], observed=True, dropna=False).sum()
+    _guardar_por_temporada(armazem, metrica, por_atleta)
+
+    codigos = contagem.index.get_level_values(1)
+    for filtro, codigo in classificacao.filtros(evento).items():
+        selecionados = contagem[codigos == codigo]
+        selecionados = selecionados.groupby(level=[0, 2], observed=True, dropna=False).sum()
+        _guardar_por_temporada(armazem, metrica, selecionados, filtro)
+
+    if por_partida is not None:
+        _guardar_por_temporada(armazem, f'{metrica}_por_partida', por_partida)
+
+
+def construir_agregados(dados):
+    """Monta o armazém a partir de ``{nome: df}`` (datasets ausentes são ignorados)."""
+    armazem = ArmazemAgregados()
+    df_full = dados.get('full')
+    if df_full is not None and 'ano' in df_full.columns:
+        armazem.temporadas = sorted(int(a) for a in df_full['ano'].dropna().unique())
+        _agregar_jogos(armazem, df_full)
+        armazem.datasets.add('full')
+
+    for nome, evento in classificacao.DATASET_EVENTO.items():
+        df = dados.get(nome)
+        if df is not None and 'atleta' in df.columns:
+            guardar_eventos(armazem, nome, evento, *contar_eventos(df, df_full, evento))
+            armazem.datasets.add(nome)
+
+    return armazem
@@ -0,0 +1,248 @@
+"""Registro das análises exibidas no dashboard.
+
+Cada análise declara os datasets de que depende, uma função de cálculo e os
+textos de apresentação. O app avalia só a análise selecionada, e o resultado
+fica memoizado por ``(análise, versão dos dados, parâmetros)``. Toda análise
+recebe o intervalo de temporadas ``inicio``/``fim`` (``None`` = sem limite),
+que pode ser fixado na registração ou vir do seletor do app. Para incluir
+uma análise nova basta registrá-la aqui com ``@REGISTRO.registrar(...)``.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from .agregados import construir_agregados
+from .confrontos import construir_confrontos
+from .instrumentacao import contar_cache, secao
+from .partidas import ExploradorPartidas, IndicePartidas
+from .tabela import construir_tabela
+from .temporadas import IndiceTemporadas, formatar_periodo
+
+
+@dataclass(frozen=True)
+class Contexto:
+    """O que uma análise pode consultar: datasets, estruturas pré-calculadas e versão."""
+    dados: dict
+    agregados: object
+    versao: str
+    temporadas: object = None
+    tabela: object = None
+    confrontos: object = None
+    partidas: object = None
+    explorador: object = None
+
+
+def montar_contexto(dados, versao='', agregados=None, tabela=None):
+    """Contexto completo a partir de ``{nome: df}`` já preparados, fora do Streamlit.
+
+    ``agregados``/``tabela`` já calculados (ex.: os de um ``Estado``) são reaproveitados.
+    """
+    return Contexto(
+        dados=dados,
+        agregados=construir_agregados(dados) if agregados is None else agregados,
+        versao=versao,
+        temporadas=IndiceTemporadas(dados),
+        tabela=construir_tabela(dados.get('full')) if tabela is None else tabela,
+        confrontos=construir_confrontos(dados),
+        partidas=IndicePartidas(dados),
+        explorador=ExploradorPartidas(dados.get('full')),
+    )
+
+
+@dataclass(frozen=True)
+class Analise:
+    chave: str
+    rotulo: str
+    titulo: str
+    entradas: tuple
+    calcular: object
+    tipo: str = 'ranking'
+    parametros: dict = field(default_factory=dict)
+    apresentacao: dict = field(default_factory=dict)
+
+    def textos(self, **params):
+        """Rótulo, título e textos de apresentação com os parâmetros (ex.: ``{periodo}``) preenchidos."""
+        params = {**self.parametros, **params}
+        params['periodo'] = formatar_periodo(params.get('inicio'), params.get('fim'))
+        textos = {'chave': self.chave, 'periodo': params['periodo'], 'inicio': params.get('inicio'),
+                  'fim': params.get('fim'), 'rotulo': self.rotulo, 'titulo': self.titulo, **self.apresentacao}
+        return {chave: valor.format(**params) if isinstance(valor, str) else valor for chave, valor in textos.items()}
+
+
+class RegistroAnalises:
+    def __init__(self, memo_max=128):
+        self._analises = OrderedDict()
+        self._memo = OrderedDict()
+        self._memo_max = memo_max
+        self._trava = threading.Lock()
+
+    def registrar(self, chave, rotulo, titulo, entradas, tipo='ranking', parametros=None, **apresentacao):
+        """Decorador que registra a função de cálculo ``f(contexto, inicio, fim, **parametros)``."""
+        def decorador(calcular):
+            self._analises[chave] = Analise(
+                chave, rotulo, titulo, tuple(entradas), calcular, tipo,
+                {'inicio': None, 'fim': None, **(parametros or {})}, apresentacao)
+            return calcular
+        return decorador
+
+    def __iter__(self):
+        return iter(self._analises.values())
+
+    def __getitem__(self, chave):
+        return self._analises[chave]
+
+    def chaves(self):
+        return list(self._analises)
+
+    def faltantes(self, chave, contexto):
+        """Datasets exigidos pela análise que não foram carregados.
+
+        Rankings só leem o armazém de agregados, então para eles basta o dataset
+        estar agregado (caso de gols/cartões no modo de streaming).
+        """
+        analise = self._analises[chave]
+        agregados = getattr(contexto.agregados, 'datasets', set()) if analise.tipo == 'ranking' else set()
+        return [nome for nome in analise.entradas
+                if contexto.dados.get(nome) is None and nome not in agregados]
+
+    def avaliar(self, chave, contexto, **params):
+        """Calcula (ou reaproveita) o resultado de uma única análise."""
+        analise = self._analises[chave]
+        params = {**analise.parametros, **params}
+        chave_memo = (chave, contexto.versao, tuple(sorted(params.items())))
+        with self._trava:
+            if chave_memo in self._memo:
+                self._memo.move_to_end(chave_memo)
+                contar_cache('analises', True)
+                return self._memo[chave_memo]
+        contar_cache('analises', False)
+        with secao(f'calculo {chave}', 'analise', **params):
+            resultado = analise.calcular(contexto, **params)
+        with self._trava:
+            self._memo[chave_memo] = resultado
+            while len(self._memo) > self._memo_max:
+                self._memo.popitem(last=False)
+        return resultado
+
+    def limpar(self):
+        with self._trava:
+            self._memo.clear()
+
+
+REGISTRO = RegistroAnalises()
+
+
+@REGISTRO.registrar(
+    'vencedor_temporada', '🏆 Time Vencedor {periodo}', '🏆 Time que mais venceu jogos em {periodo}',
+    entradas=('full',), parametros={'inicio': 2008, 'fim': 2008},
+    metrica='Time com mais vitórias', unidade='vitórias',
+    titulo_tabela='Top 10 times com mais vitórias em {periodo}', colunas=('Time', 'Vitórias'),
+    titulo_grafico='Top 10 Times - Vitórias em {periodo}', eixo='Número de Vitórias', item='Time',
+    escala='Greens', top_tabela=10, top_grafico=10,
+    vazio='Não foram encontrados jogos de {periodo} nos dados.')
+def vencedor_temporada(ctx, inicio, fim):
+    return ctx.agregados.intervalo('vitorias', inicio, fim)
+
+
+@REGISTRO.registrar(
+    'estado_menos_jogos', '🗺️ Estado com Menos Jogos', '🗺️ Estado com menos jogos ({periodo})',
+    entradas=('full',), parametros={'inicio': 2003, 'fim': 2022},
+    metrica='Estado com menos jogos', unidade='jogos',
+    titulo_tabela='Estados com menos jogos', colunas=('Estado', 'Número de Jogos'),
+    titulo_grafico='10 Estados com Menos Jogos ({periodo})', eixo='Número de Jogos', item='Estado',
+    escala='Reds_r', top_tabela=10, top_grafico=10,
+    vazio='Não foram encontrados jogos no período.')
+def estado_menos_jogos(ctx, inicio, fim):
+    return ctx.agregados.intervalo('jogos_estado', inicio, fim)
+
+
+@REGISTRO.registrar(
+    'artilheiro', '⚽ Artilheiro Geral', '⚽ Artilheiro Geral', entradas=('gols',),
+    metrica='Artilheiro Geral', unidade='gols',
+    titulo_tabela='Top 20 Artilheiros', colunas=('Jogador', 'Gols'),
+    titulo_grafico='Top 15 Artilheiros', eixo='Gols', item='Jogador',
+    escala='Blues', top_tabela=20, top_grafico=15, inclinar=True,
+    vazio='Não foram encontrados gols nos dados.')
+def artilheiro(ctx, inicio, fim):
+    return ctx.agregados.intervalo('gols', inicio, fim)
+
+
+@REGISTRO.registrar(
+    'artilheiro_penaltis', '🎯 Artilheiro de Pênaltis', '🎯 Artilheiro de Pênaltis', entradas=('gols',),
+    metrica='Maior cobrador de pênaltis', unidade='gols',
+    titulo_tabela='Top 15 Cobradores de Pênaltis', colunas=('Jogador', 'Pênaltis Convertidos'),
+    titulo_grafico='Top 15 Cobradores de Pênaltis', eixo='Pênaltis', item='Jogador',
+    escala='Purples', top_tabela=15, top_grafico=15, inclinar=True,
+    vazio='Não foram encontrados gols de pênalti nos dados.')
+def artilheiro_penaltis(ctx, inicio, fim):
+    return ctx.agregados.intervalo('gols', inicio, fim, filtro='penalti')
+
+
+@REGISTRO.registrar(
+    'gols_contra', '🔄 Gols Contra', '🔄 Gols Contra', entradas=('gols',),
+    metrica='Jogador com mais gols contra', unidade='gols contra',
+    titulo_tabela='Top 15 Jogadores com Gols Contra', colunas=('Jogador', 'Gols Contra'),
+    titulo_grafico='Top 15 Jogadores com Gols Contra', eixo='Gols Contra', item='Jogador',
+    escala='Oranges', top_tabela=15, top_grafico=15, inclinar=True,
+    vazio='Não foram encontrados gols contra nos dados.')
+def gols_contra(ctx, inicio, fim):
+    return ctx.agregados.intervalo('gols', inicio, fim, filtro='contra')
+
+
+@REGISTRO.registrar(
+    'cartoes_amarelos', '🟨 Cartões Amarelos', '🟨 Cartões Amarelos', entradas=('cartoes',),
+    metrica='Jogador com mais cartões amarelos', unidade='cartões',
+    titulo_tabela='Top 20 Jogadores - Cartões Amarelos', colunas=('Jogador', 'Cartões Amarelos'),
+    titulo_grafico='Top 15 - Cartões Amarelos', eixo='Cartões Amarelos', item='Jogador',
+    escala='YlOrBr', top_tabela=20, top_grafico=15, inclinar=True,
+    vazio='Não foram encontrados cartões amarelos nos dados.')
+def cartoes_amarelos(ctx, inicio, fim):
+    return ctx.agregados.intervalo('cartoes', inicio, fim, filtro='amarelo')
+
+
+@REGISTRO.registrar(
+    'cartoes_vermelhos', '🟥 Cartões Vermelhos', '🟥 Cartões Vermelhos', entradas=('cartoes',),
+    metrica='Jogador com mais cartões vermelhos', unidade='cartões',
+    titulo_tabela='Top 20 Jogadores - Cartões Vermelhos', colunas=('Jogador', 'Cartões Vermelhos'),
+    titulo_grafico='Top 15 - Cartões Vermelhos', eixo='Cartões Vermelhos', item='Jogador',
+    escala='Reds', top_tabela=20, top_grafico=15, inclinar=True,
+    vazio='Não foram encontrados cartões vermelhos nos dados.')
+def cartoes_vermelhos(ctx, inicio, fim):
+    return ctx.agregados.intervalo('cartoes', inicio, fim, filtro='vermelho')
+
+
+@REGISTRO.registrar(
+    'partida_mais_gols', '🎲 Partida com Mais Gols', '🎲 Partida com Mais Gols', entradas=('full',),
+    tipo='partidas', vazio='Não foram encontradas partidas nos dados.')
+def partida_mais_gols(ctx, inicio, fim):
+    return ctx.agregados.intervalo('partidas_mais_gols', inicio, fim)
+
+
+@REGISTRO.registrar(
+    'classificacao', '📈 Classificação', '📈 Classificação Rodada a Rodada', entradas=('full',),
+    tipo='tabela', vazio='Não há partidas para montar a classificação de {periodo}.')
+def classificacao(ctx, inicio, fim):
+    """Tabela final e evolução das posições da última temporada do período."""
+    tabela = ctx.tabela
+    if tabela is None:
+        return {}
+    candidatas = [t for t in tabela.temporadas
+                  if (inicio is None or t >= inicio) and (fim is None or t <= fim)]
+    if not candidatas:
+        return {}
+    temporada = candidatas[-1]
+    return {
+        'temporada': temporada,
+        'tabela': tabela.tabela(temporada),
+        'evolucao': tabela.evolucao(temporada),
+    }
+
+
+@REGISTRO.registrar(
+    'confrontos', '🤝 Confrontos', '🤝 Confronto Direto e Perfil dos Times', entradas=('full',),
+    tipo='confrontos', vazio='Não foram encontradas partidas para os confrontos de {periodo}.')
+def confrontos(ctx, inicio, fim):
+    """Recorte do período; cada confronto ou perfil é então uma indexação de array."""
+    if ctx.confrontos is None:
+        return {}
+    return ctx.confrontos.recorte(inicio, fim)
@@ -0,0 +1,99 @@
+"""Classificação de ``tipo_de_gol`` e ``cartao`` em códigos inteiros.
+
+Os textos brutos variam (acentos, maiúsculas, português/inglês/espanhol), então
+cada valor distinto é normalizado e comparado uma única vez com a tabela de
+regras abaixo, na carga. O resultado é uma coluna ``int8`` (``classe_gol`` /
+``classe_cartao``) e os filtros passam a ser comparações de inteiros.
+
+Para criar uma categoria nova, acrescente o nome em ``CLASSES`` e os termos em
+``REGRAS``; os agregados passam a gerar o ranking da nova classe sozinhos.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Classes por tipo de evento; o código é a posição na tupla e o código 0 é o
+# valor padrão (sem classificação específica)
+CLASSES = {
+    'gol': ('normal', 'contra', 'penalti'),
+    'cartao': ('outro', 'amarelo', 'vermelho'),
+}
+
+# Regras avaliadas em ordem: a primeira classe com algum termo presente como
+# palavra inteira no texto normalizado (minúsculas, sem acentos) vence
+REGRAS = {
+    'gol': (
+        ('contra', ('gol contra', 'contra', 'own goal', 'autogol', 'en propia')),
+        ('penalti', ('penalti', 'penalty', 'penal', 'pk')),
+    ),
+    'cartao': (
+        ('vermelho', ('vermelho', 'red', 'rojo', 'roja')),
+        ('amarelo', ('amarelo', 'yellow', 'amarillo', 'amarilla')),
+    ),
+}
+
+# Coluna de origem e coluna de código de cada tipo de evento
+COLUNAS = {
+    'gol': ('tipo_de_gol', 'classe_gol'),
+    'cartao': ('cartao', 'classe_cartao'),
+}
+
+DATASET_EVENTO = {'gols': 'gol', 'cartoes': 'cartao'}
+
+
+def normalizar(texto):
+    """Minúsculas, sem acentos e com espaços simples."""
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    sem_acento = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acento.lower().split())
+
+
+def classe_de(valor, evento, regras=REGRAS, classes=CLASSES):
+    """Código da classe de um valor bruto."""
+    if pd.isna(valor):
+        return 0
+    texto = normalizar(valor)
+    for classe, termos in regras[evento]:
+        if any(re.search(rf'\b{re.escape(termo)}\b', texto) for termo in termos):
+            return classes[evento].index(classe)
+    return 0
+
+
+def codificar(serie, evento, regras=REGRAS, classes=CLASSES):
+    """Array ``int8`` com o código de cada linha; cada valor distinto é classificado uma vez."""
+    categorias = serie if isinstance(serie.dtype, pd.CategoricalDtype) else serie.astype('category')
+    tabela = np.array(
+        [classe_de(v, evento, regras, classes) for v in categorias.cat.categories] + [0],
+        dtype='int8')
+    # Nulos têm código de categoria -1, que aponta para o 0 no fim da tabela
+    return tabela[categorias.cat.codes.to_numpy()]
+
+
+def codigos(df, evento):
+    """Coluna de código do evento: a já calculada na carga ou calculada na hora."""
+    origem, destino = COLUNAS[evento]
+    if destino in df.columns:
+        return df[destino]
+    if origem not in df.columns:
+        return pd.Series(0, index=df.index, dtype='int8', name=destino)
+    return pd.Series(codificar(df[origem], evento), index=df.index, name=destino)
+
+
+def filtros(evento, classes=CLASSES):
+    """``{nome_da_classe: código}`` de todas as classes além da padrão."""
+    return {nome: codigo for codigo, nome in enumerate(classes[evento]) if codigo}
+
+
+def classificar(dados):
+    """Acrescenta ``classe_gol`` em gols e ``classe_cartao`` em cartões."""
+    classificados = dict(dados)
+    for nome, evento in DATASET_EVENTO.items():
+        df = dados.get(nome)
+        if df is None:
+            continue
+        origem, destino = COLUNAS[evento]
+        if origem in df.columns:
+            classificados[nome] = df.assign(**{destino: codificar(df[origem], evento)})
+    return classificados
@@ -0,0 +1,36 @@
+"""Frames compartilhados entre as sessões do processo, somente leitura.
+
+Os dados são carregados uma vez por processo e o mesmo ``Estado`` atende todas
+as sessões. Para nenhuma sessão alterar o que as outras veem, os frames ficam
+atrás de ``DadosSomenteLeitura``: cada acesso devolve uma visão rasa
+(``copy(deep=False)``), que aponta para os mesmos arrays sem copiá-los. Com
+Copy-on-Write, escrever na visão (``df['x'] = ...``, ``df.loc[...] = ...``)
+copia só a coluna alterada e nunca chega ao frame de origem.
+"""
+from collections.abc import Mapping
+
+import pandas as pd
+
+# Copy-on-Write é o padrão (e a única opção) a partir do pandas 3
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+class DadosSomenteLeitura(Mapping):
+    """``{nome: df}`` imutável que entrega visões sem cópia dos frames compartilhados."""
+
+    def __init__(self, dados):
+        self._dados = dict(dados._dados if isinstance(dados, DadosSomenteLeitura) else dados)
+
+    def __getitem__(self, nome):
+        df = self._dados[nome]
+        return None if df is None else df.copy(deep=False)
+
+    def __iter__(self):
+        return iter(self._dados)
+
+    def __len__(self):
+        return len(self._dados)
+
+    def __repr__(self):
+        return f'DadosSomenteLeitura({list(self._dados)})'
@@ -0,0 +1,190 @@
+"""Confronto direto entre times e perfil de cada time.
+
+Os resultados de todas as partidas ficam em um array denso
+``[temporada, mando, time, adversario, campo]`` indexado pelo código do time
+no dicionário compartilhado (``mando`` 0 = em casa, 1 = fora). Gols e cartões
+de ``gols``/``cartoes`` são somados por ``clube`` em arrays
+``[temporada, time, classe]``. Um recorte de temporadas soma esses arrays uma
+vez; depois disso, qualquer confronto ou perfil é indexação de array.
+"""
+import numpy as np
+import pandas as pd
+
+from . import classificacao
+from .tabela import codigos_times
+
+CAMPOS = ('jogos', 'vitorias', 'empates', 'derrotas', 'gols_pro', 'gols_contra')
+CASA, FORA = 0, 1
+MANDOS = ('Casa', 'Fora')
+TOP_ARTILHEIROS = 5
+
+
+def _codigos(serie, times):
+    """Códigos de uma coluna de clubes no dicionário ``times``."""
+    if isinstance(serie.dtype, pd.CategoricalDtype) and list(serie.cat.categories) == list(times):
+        return serie.cat.codes.to_numpy()
+    return pd.Categorical(serie, categories=times).codes
+
+
+def _por_time(df, evento, times, temporadas):
+    """Array ``[temporada, time, classe]`` com a contagem de eventos por clube."""
+    classes = classificacao.CLASSES[evento]
+    S, T, C = len(temporadas), len(times), len(classes)
+    if df is None or 'clube' not in df.columns or 'ano' not in df.columns:
+        return np.zeros((S, T, C), dtype='int32')
+    time = _codigos(df['clube'], times)
+    anos = df['ano'].to_numpy(dtype='float64')
+    s = np.minimum(np.searchsorted(temporadas, anos), max(S - 1, 0))
+    validos = (time >= 0) & (temporadas[s] == anos) if S else np.zeros(len(df), dtype=bool)
+    classe = np.asarray(classificacao.codigos(df, evento))
+    chave = (s[validos] * T + time[validos]) * C + classe[validos]
+    return np.bincount(chave, minlength=S * T * C).reshape(S, T, C).astype('int32')
+
+
+class RecorteConfrontos:
+    """Confrontos e perfis somados em um intervalo de temporadas."""
+
+    def __init__(self, times, matriz, gols, cartoes, artilheiros, periodo):
+        self.times = times
+        self.matriz = matriz            # [mando, time, adversario, campo]
+        self.gols = gols                # [time, classe de gol]
+        self.cartoes = cartoes          # [time, classe de cartão]
+        self.artilheiros = artilheiros  # Series (clube, atleta) -> gols
+        self.periodo = periodo
+        self._codigo = {t: i for i, t in enumerate(times)}
+
+    def __len__(self):
+        return len(self.times_ativos())
+
+    def codigo(self, time):
+        return self._codigo[time]
+
+    def times_ativos(self):
+        """Times com pelo menos um jogo no recorte, em ordem alfabética."""
+        jogos = self.matriz[:, :, :, 0].sum(axis=(0, 2))
+        return [self.times[i] for i in np.flatnonzero(jogos)]
+
+    def confronto(self, time, adversario):
+        """Campanha de ``time`` contra ``adversario``: linhas Casa, Fora e Total."""
+        a, b = self._codigo[time], self._codigo[adversario]
+        valores = self.matriz[:, a, b, :]
+        return pd.DataFrame(np.vstack([valores, valores.sum(axis=0)]),
+                            index=[*MANDOS, 'Total'], columns=CAMPOS)
+
+    def campanha(self, time):
+        """Campanha geral de ``time`` (soma sobre os adversários) por mando."""
+        a = self._codigo[time]
+        valores = self.matriz[:, a, :, :].sum(axis=1)
+        return pd.DataFrame(np.vstack([valores, valores.sum(axis=0)]),
+                            index=[*MANDOS, 'Total'], columns=CAMPOS)
+
+    def adversarios(self, time):
+        """Campanha de ``time`` contra cada adversário enfrentado."""
+        a = self._codigo[time]
+        valores = self.matriz[:, a, :, :].sum(axis=0)
+        enfrentados = np.flatnonzero(valores[:, 0])
+        df = pd.DataFrame(valores[enfrentados], columns=CAMPOS,
+                          index=pd.Index([self.times[i] for i in enfrentados], name='adversario'))
+        return df.sort_values(['jogos', 'vitorias'], ascending=False, kind='stable')
+
+    def tabela(self):
+        """Formato longo ``(time, adversario, mando, campos...)`` dos pares que se enfrentaram."""
+        mando, time, adversario = np.nonzero(self.matriz[..., 0])
+        nomes = np.array(self.times, dtype=object)
+        df = pd.DataFrame(self.matriz[mando, time, adversario], columns=CAMPOS)
+        df.insert(0, 'mando', np.array(MANDOS)[mando])
+        df.insert(0, 'adversario', nomes[adversario])
+        df.insert(0, 'time', nomes[time])
+        return df
+
+    def perfil(self, time):
+        """Campanha, gols e cartões por classe e artilheiros de ``time``."""
+        a = self._codigo[time]
+        if time in self.artilheiros.index.get_level_values(0):
+            artilheiros = self.artilheiros.xs(time, level=0).head(TOP_ARTILHEIROS)
+        else:
+            artilheiros = pd.Series(dtype='int64')
+        return {
+            'campanha': self.campanha(time),
+            'gols': pd.Series(self.gols[a], index=classificacao.CLASSES['gol']),
+            'cartoes': pd.Series(self.cartoes[a], index=classificacao.CLASSES['cartao']),
+            'artilheiros': artilheiros,
+        }
+
+
+class Confrontos:
+    """Arrays por temporada de onde saem os recortes."""
+
+    def __init__(self, temporadas, times, matriz, gols, cartoes, artilheiros):
+        self.temporadas = temporadas    # [S]
+        self.times = times              # [T]
+        self.matriz = matriz            # [S, mando, time, adversario, campo] int16
+        self.gols = gols                # [S, time, classe] int32
+        self.cartoes = cartoes          # [S, time, classe] int32
+        self.artilheiros = artilheiros  # Series (ano, clube, atleta) -> gols
+
+    def recorte(self, inicio=None, fim=None):
+        """Soma as temporadas de ``inicio`` a ``fim`` (inclusive; ``None`` = sem limite)."""
+        a = 0 if inicio is None else int(np.searchsorted(self.temporadas, inicio, side='left'))
+        b = len(self.temporadas) if fim is None else int(np.searchsorted(self.temporadas, fim, side='right'))
+        artilheiros = self.artilheiros
+        if len(artilheiros):
+            anos = artilheiros.index.get_level_values(0)
+            mascara = np.ones(len(anos), dtype=bool)
+            if inicio is not None:
+                mascara &= anos >= inicio
+            if fim is not None:
+                mascara &= anos <= fim
+            artilheiros = artilheiros[mascara]
+            artilheiros = artilheiros.groupby(level=[1, 2], observed=True).sum()
+            artilheiros = artilheiros[artilheiros > 0].sort_values(ascending=False, kind='stable')
+        return RecorteConfrontos(
+            self.times,
+            self.matriz[a:b].sum(axis=0, dtype='int32'),
+            self.gols[a:b].sum(axis=0),
+            self.cartoes[a:b].sum(axis=0),
+            artilheiros,
+            (inicio, fim),
+        )
+
+
+def construir_confrontos(dados):
+    """Monta os arrays de confronto direto e de perfil a partir de ``{nome: df}``."""
+    df_full = dados.get('full')
+    colunas = ('mandante', 'visitante', 'mandante_Placar', 'visitante_Placar', 'ano')
+    if df_full is None or not set(colunas) <= set(df_full.columns):
+        return None
+    validos = (df_full['ano'].notna() & df_full['mandante_Placar'].notna()
+               & df_full['visitante_Placar'].notna()).to_numpy()
+    casa, fora, times = codigos_times(df_full)
+    anos = df_full['ano'].to_numpy(dtype='float64')[validos]
+    temporadas, s = np.unique(anos.astype('int64'), return_inverse=True)
+    casa, fora = casa[validos], fora[validos]
+    gm = df_full['mandante_Placar'].to_numpy()[validos].astype('int64')
+    gv = df_full['visitante_Placar'].to_numpy()[validos].astype('int64')
+    S, T, K = len(temporadas), len(times), len(CAMPOS)
+
+    # Cada jogo entra duas vezes: (mandante, CASA, visitante) e (visitante, FORA, mandante)
+    s2 = np.tile(s, 2)
+    mando = np.repeat([CASA, FORA], len(s))
+    time = np.concatenate([casa, fora])
+    adversario = np.concatenate([fora, casa])
+    pro = np.concatenate([gm, gv])
+    contra = np.concatenate([gv, gm])
+    chave = ((s2 * 2 + mando) * T + time) * T + adversario
+    por_jogo = (np.ones_like(pro), pro > contra, pro == contra, pro < contra, pro, contra)
+    matriz = np.empty((S, 2, T, T, K), dtype='int16')
+    for k, valores in enumerate(por_jogo):
+        matriz[..., k] = np.bincount(chave, weights=valores, minlength=S * 2 * T * T).reshape(S, 2, T, T)
+
+    df_gols = dados.get('gols')
+    if df_gols is not None and {'ano', 'clube', 'atleta'} <= set(df_gols.columns):
+        artilheiros = df_gols.groupby(['ano', 'clube', 'atleta'], observed=True).size()
+    else:
+        artilheiros = pd.Series(dtype='int64')
+    return Confrontos(
+        [int(t) for t in temporadas], times, matriz,
+        _por_time(df_gols, 'gol', times, temporadas),
+        _por_time(dados.get('cartoes'), 'cartao', times, temporadas),
+        artilheiros,
+    )
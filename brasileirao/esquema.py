@@ -0,0 +1,162 @@
+"""Esquema de tipos compactos dos datasets, aplicado logo após a carga.
+
+Colunas de texto repetitivas viram ``category``; placares, rodadas e contagens
+viram inteiros pequenos. Times, atletas e estados usam um dicionário único
+compartilhado entre os quatro DataFrames, de forma que o mesmo time tem o
+mesmo código em ``full``, ``gols``, ``cartoes`` e ``estatisticas``.
+"""
+import numpy as np
+import pandas as pd
+
+# Domínios compartilhados: todas as colunas marcadas com o mesmo domínio
+# recebem exatamente o mesmo CategoricalDtype
+TIMES = 'times'
+ATLETAS = 'atletas'
+ESTADOS = 'estados'
+DOMINIOS = (TIMES, ATLETAS, ESTADOS)
+
+ESQUEMA = {
+    'full': {
+        'ID': 'int32',
+        'rodata': 'int8',
+        'data': 'category',
+        'hora': 'category',
+        'mandante': TIMES,
+        'visitante': TIMES,
+        'formacao_mandante': 'category',
+        'formacao_visitante': 'category',
+        'tecnico_mandante': 'category',
+        'tecnico_visitante': 'category',
+        'vencedor': TIMES,
+        'arena': 'category',
+        'mandante_Placar': 'int8',
+        'visitante_Placar': 'int8',
+        'mandante_Estado': ESTADOS,
+        'visitante_Estado': ESTADOS,
+        'ano': 'int16',
+    },
+    'gols': {
+        'partida_id': 'int32',
+        'rodata': 'int8',
+        'data': 'category',
+        'clube': TIMES,
+        'atleta': ATLETAS,
+        'minuto': 'category',
+        'tipo_de_gol': 'category',
+        'ano': 'int16',
+    },
+    'cartoes': {
+        'partida_id': 'int32',
+        'rodata': 'int8',
+        'data': 'category',
+        'clube': TIMES,
+        'cartao': 'category',
+        'atleta': ATLETAS,
+        'num_camisa': 'int8',
+        'posicao': 'category',
+        'minuto': 'category',
+        'ano': 'int16',
+    },
+    'estatisticas': {
+        'partida_id': 'int32',
+        'rodata': 'int8',
+        'clube': TIMES,
+        'chutes': 'int16',
+        'chutes_no_alvo': 'int16',
+        'posse_de_bola': 'category',
+        'passes': 'int16',
+        'precisao_passes': 'category',
+        'faltas': 'int16',
+        'cartao_amarelo': 'int8',
+        'cartao_vermelho': 'int8',
+        'impedimentos': 'int8',
+        'escanteios': 'int8',
+    },
+}
+
+_PROMOCAO = {'int8': 'int16', 'int16': 'int32', 'int32': 'int64'}
+
+
+def _inteiro(serie, tipo):
+    """Converte para o inteiro declarado, promovendo se os valores não couberem.
+
+    Colunas com nulos usam o inteiro anulável equivalente (``Int8`` etc.).
+    Colunas não numéricas ou com frações ficam como estão.
+    """
+    numeros = pd.to_numeric(serie, errors='coerce')
+    if numeros.isna().sum() != serie.isna().sum():
+        return serie
+    validos = numeros.dropna()
+    if len(validos) and not np.array_equal(validos, np.floor(validos)):
+        return serie
+    if len(validos):
+        while tipo in _PROMOCAO and not (
+                np.iinfo(tipo).min <= validos.min() and validos.max() <= np.iinfo(tipo).max):
+            tipo = _PROMOCAO[tipo]
+    if numeros.isna().any():
+        tipo = tipo.capitalize()
+    return numeros.astype(tipo)
+
+
+def dicionarios_compartilhados(dados):
+    """Monta um ``CategoricalDtype`` por domínio com a união dos valores dos quatro frames."""
+    valores = {dominio: [] for dominio in DOMINIOS}
+    for nome, df in dados.items():
+        if df is None:
+            continue
+        for coluna, tipo in ESQUEMA.get(nome, {}).items():
+            if tipo in valores and coluna in df.columns:
+                serie = df[coluna]
+                if isinstance(serie.dtype, pd.CategoricalDtype):
+                    serie = serie.cat.categories.to_series()
+                valores[tipo].append(serie.dropna().astype(str).unique())
+    return {
+        dominio: pd.CategoricalDtype(np.unique(np.concatenate(partes)) if partes else [])
+        for dominio, partes in valores.items()
+    }
+
+
+def aplicar_esquema(df, nome, dicionarios):
+    """Aplica ao DataFrame os tipos declarados em ``ESQUEMA[nome]`` (em um novo frame)."""
+    colunas = {}
+    for coluna, tipo in ESQUEMA.get(nome, {}).items():
+        if coluna not in df.columns:
+            continue
+        serie = df[coluna]
+        if tipo in dicionarios:
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                serie = serie.astype(str).where(serie.notna())
+            colunas[coluna] = serie.astype(dicionarios[tipo])
+        elif tipo == 'category':
+            colunas[coluna] = serie.astype('category')
+        else:
+            colunas[coluna] = _inteiro(serie, tipo)
+    return df.assign(**colunas)
+
+
+def memoria(df):
+    """Bytes ocupados pelo DataFrame, contando o conteúdo das strings."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def compactar(dados):
+    """Aplica o esquema a ``{nome: df}`` e devolve ``(dados, relatorio_de_memoria)``.
+
+    Datasets ausentes (``None``) são mantidos como estão.
+    """
+    dicionarios = dicionarios_compartilhados(dados)
+    compactos = {}
+    relatorio = []
+    for nome, df in dados.items():
+        if df is None:
+            compactos[nome] = None
+            continue
+        compactos[nome] = aplicar_esquema(df, nome, dicionarios)
+        antes, depois = memoria(df), memoria(compactos[nome])
+        relatorio.append({
+            'dataset': nome,
+            'antes_mb': round(antes / 2**20, 2),
+            'depois_mb': round(depois / 2**20, 2),
+            'reducao_%': round(100 * (1 - depois / antes), 1) if antes else 0.0,
+        })
+    return compactos, relatorio
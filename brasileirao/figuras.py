@@ -0,0 +1,117 @@
+"""Cache e orçamento de payload das figuras Plotly.
+
+Montar uma figura com ``plotly.express`` custa dezenas de milissegundos e a
+mesma figura era remontada a cada reexecução do script. ``CacheFiguras`` guarda
+a figura pronta por ``(análise, período, versão dos dados, ...)`` no processo,
+compartilhada entre as sessões: o Streamlit só lê a figura ao serializá-la.
+
+No modo enxuto a figura vai menor para o navegador:
+
+- ``enxugar`` arredonda os números de ponto flutuante dos traces (em float32), remove
+  atributos iguais ao padrão do plotly.js e deixa no template só as entradas
+  dos tipos de trace usados (o template completo é a maior parte do JSON);
+- ``reduzir_pontos`` reduz séries longas no servidor, mantendo o primeiro, o
+  último e o mínimo e o máximo de cada faixa (os picos não somem).
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from .instrumentacao import contar_cache, secao
+
+# Casas decimais dos dados no modo enxuto e pontos por série antes de reduzir
+CASAS = 2
+MAX_PONTOS = 400
+
+# Atributos que o plotly.express preenche com o valor padrão do plotly.js
+PADROES_TRACE = {'legendgroup': '', 'offsetgroup': '', 'alignmentgroup': '', 'xaxis': 'x', 'yaxis': 'y'}
+ARRAYS_TRACE = ('x', 'y', 'z', 'customdata')
+
+
+def _arredondar(valores, casas):
+    """Array arredondado em float32, ou None se não for de ponto flutuante.
+
+    O plotly serializa arrays numéricos em binário (base64), então o ganho vem
+    de metade dos bytes por valor; o arredondamento evita ruído de float32.
+    """
+    if valores is None or isinstance(valores, dict):
+        return None
+    array = np.asarray(valores)
+    return np.round(array, casas).astype(np.float32) if array.dtype.kind == 'f' else None
+
+
+def enxugar(fig, casas=CASAS):
+    """Reduz o JSON da figura sem mudar o que é desenhado; devolve a própria figura."""
+    for trace in fig.data:
+        propriedades = trace.to_plotly_json()
+        for atributo, padrao in PADROES_TRACE.items():
+            if propriedades.get(atributo) == padrao:
+                trace[atributo] = None
+        if 'textposition' in propriedades and 'text' not in propriedades and 'texttemplate' not in propriedades:
+            trace['textposition'] = None
+        for atributo in ARRAYS_TRACE:
+            arredondado = _arredondar(propriedades.get(atributo), casas)
+            if arredondado is not None:
+                trace[atributo] = arredondado
+        cor = _arredondar(propriedades.get('marker', {}).get('color'), casas)
+        if cor is not None:
+            trace.marker.color = cor
+    # Do template só interessam os padrões dos tipos de trace presentes
+    template = fig.layout.template
+    tipos = {trace.type for trace in fig.data}
+    template.data = go.layout.template.Data({
+        tipo: valor for tipo, valor in template.data.to_plotly_json().items() if tipo in tipos})
+    return fig
+
+
+def reduzir_pontos(df, x, y, grupo=None, maximo=MAX_PONTOS):
+    """Até ~``maximo`` pontos por série (``grupo``), com o mínimo e o máximo de ``y`` por faixa de ``x``."""
+    maior = df.groupby(grupo, observed=True).size().max() if grupo else len(df)
+    if len(df) == 0 or maior <= maximo:
+        return df
+    df = df.sort_values([grupo, x] if grupo else x).reset_index(drop=True)
+    if grupo:
+        series = df.groupby(grupo, observed=True)
+        posicao, tamanho = series.cumcount(), series[x].transform('size')
+    else:
+        posicao, tamanho = pd.Series(np.arange(len(df))), len(df)
+    faixa = posicao * (maximo // 2) // tamanho
+    por_faixa = df[y].groupby([df[grupo], faixa] if grupo else faixa, observed=True)
+    manter = np.concatenate([por_faixa.idxmin().to_numpy(), por_faixa.idxmax().to_numpy(),
+                             np.flatnonzero((posicao == 0) | (posicao == tamanho - 1))])
+    return df.loc[np.unique(manter)]
+
+
+class CacheFiguras:
+    """LRU de figuras prontas, compartilhado pelas sessões do processo."""
+
+    def __init__(self, maximo=128):
+        self._figuras = OrderedDict()
+        self._maximo = maximo
+        self._trava = threading.Lock()
+
+    def obter(self, chave, construir):
+        """Figura de ``chave``, montada por ``construir()`` só na primeira vez."""
+        with self._trava:
+            if chave in self._figuras:
+                self._figuras.move_to_end(chave)
+                contar_cache('figuras', True)
+                return self._figuras[chave]
+        contar_cache('figuras', False)
+        with secao('figura', 'render'):
+            fig = construir()
+        with self._trava:
+            self._figuras[chave] = fig
+            while len(self._figuras) > self._maximo:
+                self._figuras.popitem(last=False)
+        return fig
+
+    def limpar(self):
+        with self._trava:
+            self._figuras.clear()
+
+
+FIGURAS = CacheFiguras()
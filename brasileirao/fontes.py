@@ -0,0 +1,80 @@
+"""Configuração das fontes de dados e do diretório local de snapshots.
+
+Variáveis de ambiente reconhecidas:
+
+- ``BRASILEIRAO_DIR_DADOS``: diretório dos snapshots locais (padrão ``dados/``).
+- ``BRASILEIRAO_FONTE``: diretório, ``file://`` ou URL base de um espelho dos CSVs.
+- ``BRASILEIRAO_OFFLINE``: ``1`` para nunca acessar a rede e usar só os snapshots.
+- ``BRASILEIRAO_TTL``: segundos em que um snapshot de fonte remota é considerado
+  válido sem nova verificação (padrão 24h).
+- ``BRASILEIRAO_TIMEOUT``: segundos de espera por uma fonte remota (conexão ou
+  leitura) antes de dar o dataset como indisponível (padrão 30).
+- ``BRASILEIRAO_PROCESSOS``: ``1`` para interpretar os CSVs em um pool de processos.
+- ``BRASILEIRAO_BLOCO``: linhas por bloco para ler gols e cartões em streaming,
+  direto para os agregados, sem manter as tabelas de eventos em memória
+  (padrão 0: carregar os datasets inteiros). Os blocos também usam e gravam os
+  snapshots, com o mesmo TTL.
+"""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+URL_BASE = 'https://raw.githubusercontent.com/vconceicao/ada_brasileirao_dataset/master'
+
+# Nome lógico do dataset -> arquivo CSV na fonte
+ARQUIVOS = {
+    'full': 'campeonato-brasileiro-full.csv',
+    'gols': 'campeonato-brasileiro-gols.csv',
+    'cartoes': 'campeonato-brasileiro-cartoes.csv',
+    'estatisticas': 'campeonato-brasileiro-estatisticas-full.csv',
+}
+
+DIR_PADRAO = Path(__file__).resolve().parent.parent / 'dados'
+
+
+def _verdadeiro(valor):
+    return str(valor).strip().lower() in ('1', 'true', 'sim', 'yes', 'on')
+
+
+def caminho_local(fonte):
+    """Retorna o ``Path`` de uma fonte local (caminho ou ``file://``) ou ``None`` se for remota."""
+    partes = urlparse(fonte)
+    if partes.scheme == 'file':
+        return Path(url2pathname(partes.path))
+    if partes.scheme in ('http', 'https'):
+        return None
+    return Path(fonte)
+
+
+@dataclass(frozen=True)
+class ConfigDados:
+    """Onde buscar os CSVs e onde guardar os snapshots locais."""
+    diretorio: Path = DIR_PADRAO
+    fonte_base: str = URL_BASE
+    offline: bool = False
+    ttl: float = 24 * 3600
+    timeout: float = 30
+    processos: bool = False
+    bloco: int = 0
+    arquivos: dict = field(default_factory=lambda: dict(ARQUIVOS))
+
+    @classmethod
+    def do_ambiente(cls):
+        return cls(
+            diretorio=Path(os.environ.get('BRASILEIRAO_DIR_DADOS', DIR_PADRAO)),
+            fonte_base=os.environ.get('BRASILEIRAO_FONTE', URL_BASE),
+            offline=_verdadeiro(os.environ.get('BRASILEIRAO_OFFLINE', '0')),
+            ttl=float(os.environ.get('BRASILEIRAO_TTL', 24 * 3600)),
+            timeout=float(os.environ.get('BRASILEIRAO_TIMEOUT', 30)),
+            processos=_verdadeiro(os.environ.get('BRASILEIRAO_PROCESSOS', '0')),
+            bloco=int(os.environ.get('BRASILEIRAO_BLOCO', 0)),
+        )
+
+    def fonte(self, nome):
+        """Caminho ou URL do CSV de um dataset."""
+        arquivo = self.arquivos[nome]
+        if '://' in self.fonte_base:
+            return f"{self.fonte_base.rstrip('/')}/{arquivo}"
+        return str(Path(self.fonte_base) / arquivo)
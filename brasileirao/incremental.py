@@ -0,0 +1,292 @@
+"""Carga dos dados do processo e atualização incremental por novas rodadas.
+
+A primeira carga passa pelo caminho completo (ingestão, esquema compacto,
+classificação, particionamento, agregados e tabela). Depois disso,
+``atualizar`` consulta as fontes com ``apenas_novas=True``: quando os CSVs só
+ganharam linhas no fim, apenas essas linhas são interpretadas, convertidas
+para o esquema e anexadas aos frames, e os agregados e a tabela são
+atualizados pela diferença:
+
+- rankings (artilheiros, cartões, vitórias, jogos por estado, partidas com
+  mais gols): o armazém das linhas novas é somado ao atual;
+- tabela: só as temporadas que receberam partidas novas são recalculadas.
+
+Se alguma fonte foi reescrita (não é só um acréscimo), um dataset está
+faltando ou gols/cartões são lidos em streaming (``ConfigDados.bloco``), a
+atualização cai para a carga completa.
+"""
+import threading
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from .agregados import ano_dos_eventos, construir_agregados
+from .classificacao import DATASET_EVENTO, classificar
+from .compartilhado import DadosSomenteLeitura
+from .esquema import DOMINIOS, ESQUEMA, aplicar_esquema, compactar, dicionarios_compartilhados
+from .ingestao import DATASETS, ingerir, versao_dados
+from .snapshot import sondar
+from .instrumentacao import secao
+from .streaming import agregar_em_blocos
+from .tabela import atualizar_tabela, construir_tabela, temporada_das_partidas
+from .temporadas import PARTICIONADOS, particionar, tipo_anulavel
+
+# Espera (s) antes de tentar de novo os datasets que falharam; dobra a cada nova falha
+ESPERA_FALHA = 30
+ESPERA_FALHA_MAX = 600
+
+
+@dataclass(frozen=True)
+class Estado:
+    """Dados preparados de uma versão e os derivados mantidos por incremento.
+
+    ``dados`` é um ``DadosSomenteLeitura``: o estado é compartilhado entre as
+    sessões e nenhuma delas consegue alterar os frames.
+    """
+    dados: dict
+    versao: str
+    relatorio_carga: list
+    relatorio_memoria: list
+    agregados: object
+    tabela: object
+
+
+def preparar(dados):
+    """Esquema compacto, classes de gol/cartão e partições por temporada."""
+    # Tipos compactos e dicionário único de times/atletas/estados
+    dados, relatorio_memoria = compactar(dados)
+    # Tipo de gol/cartão vira um código inteiro, classificado uma vez por valor distinto
+    dados = classificar(dados)
+    # Linhas agrupadas por temporada: cada temporada vira um bloco contíguo
+    return particionar(dados), relatorio_memoria
+
+
+def carregar(config, forcar=False):
+    """Carga completa dos quatro datasets; falhas individuais não derrubam os demais.
+
+    Com ``config.bloco`` > 0, gols e cartões vão em streaming direto para os
+    agregados e ficam como ``None`` em ``dados``. ``forcar=True`` consulta as
+    fontes remotas mesmo dentro do TTL dos snapshots.
+    """
+    eventos = tuple(DATASET_EVENTO) if config.bloco else ()
+    with secao('ingestao', 'carga'):
+        resultados = ingerir(config, tuple(nome for nome in DATASETS if nome not in eventos), forcar=forcar)
+    with secao('preparar', 'carga'):
+        dados, relatorio_memoria = preparar({nome: r.df for nome, r in resultados.items()})
+    with secao('agregados', 'carga'):
+        agregados = construir_agregados(dados)
+    if eventos:
+        with secao('streaming', 'carga'):
+            resultados.update(agregar_em_blocos(config, agregados, dados.get('full'), eventos, forcar))
+        dados.update(dict.fromkeys(eventos))
+    resultados = {nome: resultados[nome] for nome in DATASETS}
+    with secao('tabela', 'carga'):
+        tabela = construir_tabela(dados.get('full'))
+    return Estado(
+        dados=DadosSomenteLeitura({nome: dados[nome] for nome in DATASETS}),
+        versao=versao_dados(resultados),
+        relatorio_carga=[r.resumo() for r in resultados.values()],
+        relatorio_memoria=relatorio_memoria,
+        agregados=agregados,
+        tabela=tabela,
+    )
+
+
+def _unir_dicionarios(atuais, novos):
+    """Dicionário de cada domínio com as categorias atuais mais as novas.
+
+    Mantém o mesmo ``CategoricalDtype`` (e os mesmos códigos) quando não há
+    valor novo.
+    """
+    unidos = {}
+    for dominio in DOMINIOS:
+        categorias = atuais[dominio].categories
+        extras = novos[dominio].categories.difference(categorias)
+        unidos[dominio] = atuais[dominio] if extras.empty else \
+            pd.CategoricalDtype(np.unique(np.concatenate([categorias, extras])))
+    return unidos
+
+
+def _concatenar(antigo, novo):
+    """Concatena mantendo as colunas ``category`` (une as categorias quando diferem)."""
+    colunas = {}
+    for coluna in antigo.columns.intersection(novo.columns):
+        a, b = antigo[coluna].dtype, novo[coluna].dtype
+        if isinstance(a, pd.CategoricalDtype) and isinstance(b, pd.CategoricalDtype) and a != b:
+            tipo = pd.CategoricalDtype(a.categories.union(b.categories))
+            colunas[coluna] = tipo
+    if colunas:
+        antigo = antigo.astype(colunas)
+        novo = novo.astype(colunas)
+    return pd.concat([antigo, novo], ignore_index=True)
+
+
+def anexar(dados, novos):
+    """Anexa linhas brutas ``{nome: df}`` aos frames preparados.
+
+    Devolve ``(dados, delta, resolvidos)``: os frames completos, só as linhas
+    novas já preparadas (com ``ano`` e códigos de classe), para atualizar os
+    derivados, e os gols/cartões antigos que estavam sem ano (chegaram antes da
+    partida) e ganharam o ano com as partidas novas.
+    """
+    novos = {nome: df for nome, df in novos.items() if df is not None and len(df)}
+    dicionarios = _unir_dicionarios(dicionarios_compartilhados(dados), dicionarios_compartilhados(novos))
+    anexados, delta = {}, {}
+    # Valor novo em um domínio muda o dicionário: os frames sem linhas novas
+    # também são recodificados, para todos continuarem com o mesmo dtype
+    for nome, df in dados.items():
+        colunas = {} if df is None else {
+            coluna: df[coluna].cat.set_categories(dicionarios[tipo].categories)
+            for coluna, tipo in ESQUEMA.get(nome, {}).items()
+            if tipo in dicionarios and coluna in df.columns and df[coluna].dtype != dicionarios[tipo]}
+        anexados[nome] = df.assign(**colunas) if colunas else df
+    reordenar = False
+    # 'full' primeiro: o ano dos eventos novos sai das partidas
+    for nome in sorted(novos, key=lambda n: n != 'full'):
+        antigo = anexados[nome]
+        novo = classificar({nome: aplicar_esquema(novos[nome], nome, dicionarios)})[nome]
+        if nome in PARTICIONADOS and 'ano' in antigo.columns:
+            if 'ano' not in novo.columns:
+                # Gol/cartão que chega antes da partida fica sem ano (<NA>)
+                tipo = tipo_anulavel(antigo['ano'].dtype)
+                novo = novo.assign(ano=ano_dos_eventos(novo, anexados.get('full')).astype(tipo))
+            anos_antigos = antigo['ano'].to_numpy(dtype='float64')
+            anos_novos = novo['ano'].to_numpy(dtype='float64')
+            # Fora de ordem se chegaram linhas de uma temporada anterior à última
+            # ou linhas com ano depois das sem ano (que ficam no fim)
+            reordenar |= bool(len(anos_antigos) and (
+                (anos_novos < np.nanmax(anos_antigos, initial=-np.inf)).any()
+                or (np.isnan(anos_antigos[-1]) and not np.isnan(anos_novos).all())))
+        anexados[nome] = _concatenar(antigo, novo)
+        delta[nome] = novo
+    resolvidos = _resolver_anos(anexados) if 'full' in delta else {}
+    if reordenar or resolvidos:
+        anexados = particionar(anexados)
+    return anexados, delta, resolvidos
+
+
+def _resolver_anos(dados):
+    """Preenche em ``dados`` (no lugar) o ano dos eventos sem ano cuja partida já está em ``full``.
+
+    Devolve ``{nome: linhas}`` só com as linhas que ganharam o ano.
+    """
+    resolvidos = {}
+    for nome in DATASET_EVENTO:
+        df = dados.get(nome)
+        if df is None or 'ano' not in df.columns:
+            continue
+        sem_ano = np.flatnonzero(np.isnan(df['ano'].to_numpy(dtype='float64')))
+        if not len(sem_ano):
+            continue
+        anos = ano_dos_eventos(df.iloc[sem_ano].drop(columns='ano'), dados.get('full')).to_numpy(dtype='float64')
+        achados = ~np.isnan(anos)
+        if not achados.any():
+            continue
+        ano = df['ano'].copy()
+        ano.iloc[sem_ano[achados]] = anos[achados]
+        dados[nome] = df.assign(ano=ano)
+        resolvidos[nome] = dados[nome].iloc[sem_ano[achados]]
+    return resolvidos
+
+
+def atualizar(estado, config):
+    """Novo ``Estado`` com as linhas acrescentadas às fontes desde ``estado``.
+
+    A atualização é pedida explicitamente, então as fontes são consultadas
+    mesmo com o TTL dos snapshots válido. Devolve o próprio ``estado`` se nada mudou.
+    """
+    if config.bloco or any(df is None for df in estado.dados.values()):
+        return carregar(config, forcar=True)
+    with secao('ingestao', 'atualizacao'):
+        resultados = ingerir(config, apenas_novas=True, forcar=True)
+    if any(not r.ok or r.medidas.get('origem') == 'fonte' for r in resultados.values()):
+        return carregar(config)
+    novos = {nome: r.df for nome, r in resultados.items() if r.medidas.get('origem') == 'incremental'}
+    if not novos:
+        return estado
+
+    with secao('anexar', 'atualizacao'):
+        dados, delta, resolvidos = anexar(estado.dados, novos)
+    with secao('agregados', 'atualizacao'):
+        agregados = estado.agregados.somar(construir_agregados(delta))
+        if resolvidos:
+            # Já contados no histórico (sem ano); faltava só o ranking da temporada
+            agregados = agregados.somar(construir_agregados(resolvidos).por_temporada())
+    tabela = estado.tabela
+    if 'full' in delta:
+        with secao('tabela', 'atualizacao'):
+            temporadas = np.unique(temporada_das_partidas(delta['full']))
+            tabela = atualizar_tabela(tabela, dados['full'], [int(t) for t in temporadas if not np.isnan(t)])
+
+    relatorio_carga = [{**r.resumo(), 'linhas': len(dados[nome])} for nome, r in resultados.items()]
+    return replace(estado, dados=DadosSomenteLeitura(dados), versao=versao_dados(resultados), relatorio_carga=relatorio_carga,
+                   agregados=agregados, tabela=tabela)
+
+
+def falhas(estado):
+    """Datasets que não carregaram em ``estado``."""
+    return [r['dataset'] for r in estado.relatorio_carga if r['status'] != 'ok']
+
+
+class Carga:
+    """Estado atual dos dados de um processo, trocado por inteiro a cada atualização.
+
+    Quem já leu ``estado`` continua com a versão anterior, que não é alterada.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._trava = threading.Lock()
+        self._espera = ESPERA_FALHA
+        self._trocar(carregar(config))
+
+    def _trocar(self, estado):
+        """Troca o estado e reagenda a próxima tentativa dos datasets que falharam."""
+        if not falhas(estado):
+            self._espera = ESPERA_FALHA
+        self._proxima_tentativa = time.monotonic() + self._espera
+        self.estado = estado
+
+    def atualizar(self):
+        with self._trava:
+            self._trocar(atualizar(self.estado, self.config))
+        return self.estado
+
+    def tentar_falhas(self):
+        """Tenta de novo os datasets que falharam, com espera exponencial entre as tentativas.
+
+        Só os datasets com falha são consultados; a carga completa só é refeita
+        quando algum deles volta. A espera dobra enquanto continuar havendo
+        falha. Sem falhas, fora do prazo ou com outra tentativa em andamento,
+        devolve o estado atual sem consultar nada.
+        """
+        nomes = falhas(self.estado)
+        if not nomes or time.monotonic() < self._proxima_tentativa or not self._trava.acquire(blocking=False):
+            return self.estado
+        try:
+            if self._voltaram(nomes):
+                self._trocar(carregar(self.config))
+            if falhas(self.estado):
+                self._espera = min(self._espera * 2, ESPERA_FALHA_MAX)
+                self._proxima_tentativa = time.monotonic() + self._espera
+        finally:
+            self._trava.release()
+        return self.estado
+
+    def _voltaram(self, nomes):
+        """Indica se algum dos datasets ``nomes`` voltou a responder."""
+        eventos = set(DATASET_EVENTO) if self.config.bloco else set()
+        em_memoria = tuple(nome for nome in nomes if nome not in eventos)
+        if em_memoria and any(r.ok for r in ingerir(self.config, em_memoria).values()):
+            return True
+        # Em streaming, gols/cartões não são materializados só para testar a fonte
+        for nome in nomes:
+            if nome in eventos:
+                try:
+                    sondar(self.config, nome)
+                    return True
+                except Exception:
+                    pass
+        return False
@@ -0,0 +1,93 @@
+"""Ingestão concorrente e instrumentada dos quatro datasets.
+
+Cada dataset é buscado em uma thread própria (a leitura é dominada por I/O);
+opcionalmente a interpretação do CSV vai para um pool de processos. A falha de
+um dataset não derruba os demais: o resultado dele fica com ``df=None`` e a
+mensagem de erro, e o app renderiza o que foi possível carregar.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from .instrumentacao import propagar, secao
+from .snapshot import carregar_dataset, interpretar_csv
+
+DATASETS = ('full', 'gols', 'cartoes', 'estatisticas')
+
+
+@dataclass
+class ResultadoIngestao:
+    """Resultado da carga de um dataset, com a quebra de tempo e bytes."""
+    nome: str
+    df: object = None
+    erro: str = None
+    total: float = 0.0
+    medidas: dict = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        return self.erro is None and (self.df is not None or self.medidas.get('origem') == 'streaming')
+
+    @property
+    def checksum(self):
+        return self.medidas.get('checksum') if self.ok else None
+
+    def resumo(self):
+        """Linha para tabelas de diagnóstico."""
+        return {
+            'dataset': self.nome,
+            'status': 'ok' if self.ok else 'falhou',
+            'origem': self.medidas.get('origem', '-'),
+            'linhas': len(self.df) if self.df is not None else self.medidas.get('linhas', 0),
+            'novas': self.medidas.get('novas', 0),
+            'bytes': self.medidas.get('bytes', 0),
+            'leitura_s': round(self.medidas.get('leitura', 0.0), 3),
+            'interpretacao_s': round(self.medidas.get('interpretacao', 0.0), 3),
+            'snapshot_s': round(self.medidas.get('snapshot', 0.0), 3),
+            'total_s': round(self.total, 3),
+            'erro': self.erro or '',
+        }
+
+
+def _carregar(config, nome, interpretar, apenas_novas, forcar):
+    resultado = ResultadoIngestao(nome)
+    inicio = time.perf_counter()
+    try:
+        with secao(f'carga {nome}', 'ingestao', apenas_novas=apenas_novas) as evento:
+            resultado.df = carregar_dataset(config, nome, resultado.medidas, interpretar, apenas_novas, forcar)
+            evento['origem'] = resultado.medidas.get('origem')
+    except Exception as e:
+        resultado.erro = f'{type(e).__name__}: {e}'
+    resultado.total = time.perf_counter() - inicio
+    return resultado
+
+
+def ingerir(config, nomes=DATASETS, processos=None, apenas_novas=False, forcar=False):
+    """Carrega os datasets em paralelo e devolve ``{nome: ResultadoIngestao}``.
+
+    Com ``processos=True`` a interpretação dos CSVs baixados roda em um pool de
+    processos, útil quando o parse domina (arquivos grandes, muitos núcleos).
+    Por padrão segue ``config.processos``. Com ``apenas_novas=True`` cada
+    resultado traz só as linhas novas desde o snapshot e com ``forcar=True`` as
+    fontes remotas são consultadas mesmo dentro do TTL (ver ``carregar_dataset``).
+    """
+    if processos is None:
+        processos = config.processos
+    pool_processos = ProcessPoolExecutor(max_workers=len(nomes)) if processos else None
+    if pool_processos is None:
+        interpretar = interpretar_csv
+    else:
+        def interpretar(dados):
+            return pool_processos.submit(interpretar_csv, dados).result()
+    try:
+        with ThreadPoolExecutor(max_workers=len(nomes), thread_name_prefix='ingestao') as pool:
+            futuros = {nome: pool.submit(propagar(_carregar), config, nome, interpretar, apenas_novas, forcar) for nome in nomes}
+            return {nome: futuro.result() for nome, futuro in futuros.items()}
+    finally:
+        if pool_processos is not None:
+            pool_processos.shutdown()
+
+
+def versao_dados(resultados):
+    """Identificador do conteúdo carregado, estável enquanto as fontes não mudarem."""
+    return '|'.join(f'{nome}:{(r.checksum or "-")[:12]}' for nome, r in sorted(resultados.items()))
@@ -0,0 +1,259 @@
+"""Instrumentação opcional: seções cronometradas, sondas de memória e acessos a cache.
+
+Sem rastreador ativo, ``secao`` devolve um ``nullcontext`` e o custo é
+desprezível. Com um ``Rastreador`` ativo (painel de diagnóstico do app ou
+``BRASILEIRAO_INSTRUMENTAR=1``; ``=memoria`` liga também o ``tracemalloc``),
+cada seção registra a duração, a variação da memória residente e, no modo de
+memória, o pico alocado durante a seção. Os loaders em cache e a memoização
+das análises contam acertos e falhas.
+
+O rastreador vale para o contexto atual (``contextvars``); os pools de threads
+da carga submetem as tarefas com ``propagar`` para as seções das threads irem
+para o mesmo rastro. ``exportar_chrome`` gera o formato Trace Event (JSON),
+aberto por ``chrome://tracing``, Perfetto ou speedscope.
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+_rastreador = contextvars.ContextVar('rastreador', default=None)
+_execucoes = contextvars.ContextVar('execucoes_em_cache', default=None)
+_ORIGEM = time.perf_counter()
+_PAGINA = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# Estado global do tracemalloc: quantos rastreadores o usam e as seções abertas
+_trava = threading.Lock()
+_usuarios_tracemalloc = 0
+_abertas = set()
+
+# Acertos/falhas de cache desde o início do processo, com ou sem rastreador
+CACHE_PROCESSO = Counter()
+
+
+def do_ambiente():
+    """``(ativa, memoria)`` conforme ``BRASILEIRAO_INSTRUMENTAR`` (``1`` ou ``memoria``)."""
+    valor = os.environ.get('BRASILEIRAO_INSTRUMENTAR', '0').strip().lower()
+    return valor in ('1', 'true', 'sim', 'memoria'), valor == 'memoria'
+
+
+def _rss_mb():
+    """Memória residente do processo (MB), ou None fora do Linux."""
+    try:
+        with open('/proc/self/statm') as arquivo:
+            return int(arquivo.read().split()[1]) * _PAGINA / 2**20
+    except OSError:
+        return None
+
+
+class _Aberta:
+    """Seção em andamento no modo de memória."""
+    __slots__ = ('inicial', 'maximo')
+
+
+def _amostrar():
+    """Repassa o pico do tracemalloc desde a última amostra às seções abertas."""
+    atual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for aberta in _abertas:
+        aberta.maximo = max(aberta.maximo, pico)
+    return atual
+
+
+class Rastreador:
+    """Eventos de uma execução: seções cronometradas e acessos a cache.
+
+    O pico de memória de uma seção é o maior valor do ``tracemalloc`` entre a
+    entrada e a saída; com várias sessões instrumentando ao mesmo tempo ele
+    inclui o que as outras alocaram no período.
+    """
+
+    def __init__(self, nome='execucao', memoria=False):
+        global _usuarios_tracemalloc
+        self.nome = nome
+        self.memoria = memoria
+        self.eventos = []
+        self.cache = Counter()
+        self.threads = {}
+        self.duracao = None
+        self._inicio = time.perf_counter()
+        self._trava = threading.Lock()
+        self._token = None
+        if memoria:
+            with _trava:
+                if _usuarios_tracemalloc == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                _usuarios_tracemalloc += 1
+
+    def __enter__(self):
+        self._token = _rastreador.set(self)
+        return self
+
+    def __exit__(self, *excecao):
+        _rastreador.reset(self._token)
+        self.encerrar()
+
+    @contextmanager
+    def secao(self, nome, categoria='app', **args):
+        """Cronometra o bloco; ``args`` (e o que for posto no dict devolvido) vão para o evento."""
+        thread = threading.current_thread()
+        aberta = None
+        if self.memoria and self.duracao is None:
+            aberta = _Aberta()
+            with _trava:
+                aberta.inicial = aberta.maximo = _amostrar()
+                _abertas.add(aberta)
+        rss = _rss_mb()
+        inicio = time.perf_counter()
+        try:
+            yield args
+        finally:
+            fim = time.perf_counter()
+            evento = {'nome': nome, 'categoria': categoria, 'inicio': inicio - _ORIGEM,
+                      'duracao': fim - inicio, 'thread': thread.ident, 'args': args}
+            depois = _rss_mb()
+            if rss is not None and depois is not None:
+                evento['rss_mb'] = round(depois - rss, 2)
+            if aberta is not None:
+                with _trava:
+                    atual = _amostrar()
+                    _abertas.discard(aberta)
+                evento['pico_mb'] = round((aberta.maximo - aberta.inicial) / 2**20, 2)
+                evento['alocado_mb'] = round((atual - aberta.inicial) / 2**20, 2)
+            with self._trava:
+                self.threads[thread.ident] = thread.name
+                self.eventos.append(evento)
+
+    def contar(self, nome, acerto):
+        with self._trava:
+            self.cache[nome, 'acertos' if acerto else 'falhas'] += 1
+
+    def encerrar(self):
+        """Fecha a execução (evento ``nome`` com a duração total) e libera o tracemalloc."""
+        global _usuarios_tracemalloc
+        if self.duracao is not None:
+            return
+        self.duracao = time.perf_counter() - self._inicio
+        thread = threading.current_thread()
+        with self._trava:
+            self.threads[thread.ident] = thread.name
+            self.eventos.insert(0, {'nome': self.nome, 'categoria': 'execucao', 'inicio': self._inicio - _ORIGEM,
+                                    'duracao': self.duracao, 'thread': thread.ident, 'args': {}})
+        if self.memoria:
+            with _trava:
+                _usuarios_tracemalloc -= 1
+                if _usuarios_tracemalloc == 0 and tracemalloc.is_tracing():
+                    tracemalloc.stop()
+
+    def secoes(self):
+        """Uma linha por seção, na ordem de início, para tabelas de diagnóstico."""
+        linhas = []
+        for evento in sorted(self.eventos, key=lambda e: e['inicio']):
+            linhas.append({
+                'secao': evento['nome'],
+                'categoria': evento['categoria'],
+                'inicio_ms': round((evento['inicio'] + _ORIGEM - self._inicio) * 1000, 1),
+                'ms': round(evento['duracao'] * 1000, 2),
+                'rss_mb': evento.get('rss_mb'),
+                'pico_mb': evento.get('pico_mb'),
+                'thread': self.threads.get(evento['thread'], ''),
+            })
+        return linhas
+
+    def acessos_cache(self):
+        """Acertos/falhas de cada cache nesta execução e desde o início do processo."""
+        nomes = sorted({nome for nome, _ in self.cache} | {nome for nome, _ in CACHE_PROCESSO})
+        return [{
+            'cache': nome,
+            'acertos': self.cache[nome, 'acertos'],
+            'falhas': self.cache[nome, 'falhas'],
+            'acertos_processo': CACHE_PROCESSO[nome, 'acertos'],
+            'falhas_processo': CACHE_PROCESSO[nome, 'falhas'],
+        } for nome in nomes]
+
+
+def ativar(rastreador):
+    """Define o rastreador do contexto atual (``None`` desliga a instrumentação)."""
+    _rastreador.set(rastreador)
+
+
+def atual():
+    return _rastreador.get()
+
+
+def secao(nome, categoria='app', **args):
+    """Seção do rastreador atual, ou um ``nullcontext`` se não houver."""
+    rastreador = _rastreador.get()
+    return nullcontext(args) if rastreador is None else rastreador.secao(nome, categoria, **args)
+
+
+def propagar(funcao):
+    """``funcao`` presa ao contexto atual, para submeter a um pool sem perder o rastreador."""
+    return functools.partial(contextvars.copy_context().run, funcao)
+
+
+def contar_cache(nome, acerto):
+    """Registra um acesso a cache no processo e no rastreador atual."""
+    with _trava:
+        CACHE_PROCESSO[nome, 'acertos' if acerto else 'falhas'] += 1
+    rastreador = _rastreador.get()
+    if rastreador is not None:
+        rastreador.contar(nome, acerto)
+
+
+def com_contagem(nome, cache):
+    """Decorador: ``cache(funcao)`` contando acertos e falhas como ``nome``.
+
+    Falha é quando a função original executa durante a chamada. ``clear`` do
+    cache continua disponível na função decorada.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def executar(*args, **kwargs):
+            execucoes = _execucoes.get()
+            if execucoes is not None:
+                execucoes.append(nome)
+            return funcao(*args, **kwargs)
+
+        em_cache = cache(executar)
+
+        @functools.wraps(funcao)
+        def chamar(*args, **kwargs):
+            execucoes = []
+            token = _execucoes.set(execucoes)
+            try:
+                with secao(f'cache {nome}', 'cache') as evento:
+                    resultado = em_cache(*args, **kwargs)
+                    evento['acerto'] = nome not in execucoes
+            finally:
+                _execucoes.reset(token)
+            contar_cache(nome, nome not in execucoes)
+            return resultado
+
+        chamar.clear = em_cache.clear
+        return chamar
+    return decorador
+
+
+def exportar_chrome(rastreadores):
+    """Eventos dos rastreadores no formato Trace Event (JSON do ``chrome://tracing``/Perfetto)."""
+    pid = os.getpid()
+    eventos = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'brasileirao'}}]
+    threads = {}
+    for rastreador in rastreadores:
+        threads.update(rastreador.threads)
+        for evento in rastreador.eventos:
+            args = dict(evento['args'])
+            args.update({chave: evento[chave] for chave in ('rss_mb', 'pico_mb', 'alocado_mb') if chave in evento})
+            eventos.append({
+                'name': evento['nome'], 'cat': evento['categoria'], 'ph': 'X',
+                'ts': round(evento['inicio'] * 1e6, 1), 'dur': round(evento['duracao'] * 1e6, 1),
+                'pid': pid, 'tid': evento['thread'], 'args': args,
+            })
+    eventos += [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': nome}}
+                for tid, nome in threads.items()]
+    return {'traceEvents': eventos, 'displayTimeUnit': 'ms'}
@@ -0,0 +1,300 @@
+"""Índice por partida ligando jogos, gols, cartões e estatísticas.
+
+Cada dataset filho (``gols``, ``cartoes``, ``estatisticas``) ganha, na carga,
+uma permutação que o ordena por ``partida_id`` (os frames em si não são
+reordenados). Os eventos de uma partida são então localizados com duas buscas
+binárias, O(log n), e lidos com ``iloc`` nas posições encontradas; a partida
+em ``full`` é localizada pelo ``ID`` da mesma forma. Nenhuma visão precisa
+fazer ``merge`` para detalhar um jogo.
+
+``ExploradorPartidas`` usa a mesma estrutura como índice invertido (valor ->
+posições em ``full``) para time, estado, arena, temporada, rodada e total de
+gols. Uma consulta materializa só as posições do filtro mais seletivo, testa
+os demais filtros nessas posições, ordena e devolve uma página: o custo
+acompanha o tamanho do resultado, não o do dataset, e só a página vira
+DataFrame.
+"""
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+FILHOS = ('gols', 'cartoes', 'estatisticas')
+
+
+def _minuto(valor):
+    """Minuto numérico para ordenação (``'45+2'`` -> 45.02)."""
+    numeros = re.findall(r'\d+', str(valor))
+    if not numeros:
+        return np.inf
+    return int(numeros[0]) + (int(numeros[1]) / 100 if len(numeros) > 1 else 0)
+
+
+def _por_minuto(df):
+    if 'minuto' not in df.columns or len(df) < 2:
+        return df
+    return df.iloc[np.argsort([_minuto(m) for m in df['minuto']], kind='stable')]
+
+
+class _IndiceOrdenado:
+    """Chaves ordenadas + permutação para as posições originais.
+
+    ``posicoes`` permite indexar várias colunas juntas: a chave ``i`` aponta
+    para a linha ``posicoes[i]``.
+    """
+
+    def __init__(self, chaves, posicoes=None):
+        chaves = pd.to_numeric(pd.Series(chaves), errors='coerce').to_numpy(dtype='float64')
+        ordem = np.argsort(chaves, kind='stable')
+        self.chaves = chaves[ordem]
+        self.ordem = (ordem if posicoes is None else posicoes[ordem]).astype('int32')
+
+    def _faixa(self, inicio, fim):
+        a = 0 if inicio is None else np.searchsorted(self.chaves, inicio, side='left')
+        b = len(self.chaves) if fim is None else np.searchsorted(self.chaves, fim, side='right')
+        return a, max(a, b)
+
+    def posicoes(self, chave):
+        a, b = self._faixa(chave, chave)
+        return self.ordem[a:b]
+
+    def entre(self, inicio=None, fim=None):
+        """Posições com ``inicio <= chave <= fim`` (``None`` = sem limite)."""
+        a, b = self._faixa(inicio, fim)
+        return self.ordem[a:b]
+
+    def contagem(self, inicio=None, fim=None):
+        a, b = self._faixa(inicio, fim)
+        return b - a
+
+
+@dataclass
+class DetalhePartida:
+    partida: pd.Series
+    gols: pd.DataFrame
+    cartoes: pd.DataFrame
+    estatisticas: pd.DataFrame
+
+
+class IndicePartidas:
+    """Acesso por ``partida_id`` à partida e aos seus eventos."""
+
+    def __init__(self, dados):
+        self.dados = dados
+        df_full = dados.get('full')
+        self._full = _IndiceOrdenado(df_full['ID']) if df_full is not None and 'ID' in df_full.columns else None
+        self._filhos = {
+            nome: _IndiceOrdenado(dados[nome]['partida_id'])
+            for nome in FILHOS
+            if dados.get(nome) is not None and 'partida_id' in dados[nome].columns
+        }
+
+    def __contains__(self, partida_id):
+        return self._full is not None and len(self._full.posicoes(partida_id)) > 0
+
+    def partida(self, partida_id):
+        """Linha de ``full`` da partida (``None`` se não existir)."""
+        if self._full is None:
+            return None
+        posicoes = self._full.posicoes(partida_id)
+        return self.dados['full'].iloc[posicoes[0]] if len(posicoes) else None
+
+    def eventos(self, nome, partida_id):
+        """Linhas de ``gols``/``cartoes``/``estatisticas`` da partida, na ordem original."""
+        indice = self._filhos.get(nome)
+        if indice is None:
+            return pd.DataFrame()
+        return self.dados[nome].iloc[np.sort(indice.posicoes(partida_id))]
+
+    def detalhe(self, partida_id):
+        """Partida expandida com artilheiros, cartões e estatísticas por time."""
+        return DetalhePartida(
+            partida=self.partida(partida_id),
+            gols=_por_minuto(self.eventos('gols', partida_id)),
+            cartoes=_por_minuto(self.eventos('cartoes', partida_id)),
+            estatisticas=self.eventos('estatisticas', partida_id),
+        )
+
+
+# Filtros por valor (várias colunas = o valor em qualquer uma delas) e por faixa
+FILTROS_VALOR = {
+    'times': ('mandante', 'visitante'),
+    'estados': ('mandante_Estado', 'visitante_Estado'),
+    'arenas': ('arena',),
+}
+FILTROS_FAIXA = {'temporadas': 'ano', 'rodadas': 'rodata', 'gols': 'total_gols'}
+ORDENACOES = ('data', 'total_gols', 'rodata', 'mandante', 'visitante', 'arena')
+COLUNAS_PAGINA = ['ID', 'data', 'ano', 'rodata', 'mandante', 'mandante_Placar', 'visitante_Placar',
+                  'visitante', 'arena', 'total_gols']
+
+# Abaixo desta fração das linhas o resultado é ordenado sozinho; acima, pela ordem global
+_FRACAO_ORDENACAO_LOCAL = 1 / 16
+
+
+def _codigos(df, colunas):
+    """``(categorias, [códigos por coluna])`` com um dicionário comum às colunas."""
+    series = [df[coluna] for coluna in colunas]
+    tipo = series[0].dtype
+    if isinstance(tipo, pd.CategoricalDtype) and all(serie.dtype == tipo for serie in series):
+        return tipo.categories, [serie.array.codes for serie in series]
+    categorias = pd.Index(sorted(set().union(*(serie.dropna().astype(str).unique() for serie in series))))
+    return categorias, [categorias.get_indexer(serie.astype(str).where(serie.notna())) for serie in series]
+
+
+def _numeros(serie):
+    return pd.to_numeric(serie, errors='coerce').to_numpy(dtype='float64')
+
+
+@dataclass
+class PaginaPartidas:
+    linhas: pd.DataFrame
+    total: int
+    numero: int
+    paginas: int
+
+
+class ExploradorPartidas:
+    """Filtros, ordenação e paginação de ``full`` respondidos por índices invertidos."""
+
+    def __init__(self, df_full):
+        self.df = df_full
+        self._valores, self._faixas, self._chaves, self._ordens = {}, {}, {}, {}
+        # Opções dos filtros, calculadas uma vez: o app as lê a cada execução
+        self._opcoes = {}
+        if df_full is None:
+            return
+        linhas = np.arange(len(df_full), dtype='int32')
+        for filtro, colunas in FILTROS_VALOR.items():
+            colunas = [coluna for coluna in colunas if coluna in df_full.columns]
+            if colunas:
+                categorias, codigos = _codigos(df_full, colunas)
+                indice = _IndiceOrdenado(np.concatenate(codigos), np.tile(linhas, len(colunas)))
+                self._valores[filtro] = (categorias, codigos, indice)
+                presentes = np.unique(indice.chaves[indice.chaves >= 0]).astype(int)
+                self._opcoes[filtro] = tuple(str(valor) for valor in categorias[presentes])
+        for filtro, coluna in FILTROS_FAIXA.items():
+            valores = self._coluna(coluna)
+            if valores is not None:
+                indice = _IndiceOrdenado(valores)
+                self._faixas[filtro] = (valores, indice)
+                # Chaves ordenadas com NaN no fim: mínimo na primeira, máximo na última válida
+                validas = len(indice.chaves) - int(np.isnan(indice.chaves).sum())
+                self._opcoes[filtro] = (int(indice.chaves[0]), int(indice.chaves[validas - 1])) if validas else None
+
+    def _coluna(self, coluna):
+        """Valores numéricos de uma coluna (``total_gols`` é derivado dos placares)."""
+        if coluna == 'total_gols':
+            if not {'mandante_Placar', 'visitante_Placar'} <= set(self.df.columns):
+                return None
+            return _numeros(self.df['mandante_Placar']) + _numeros(self.df['visitante_Placar'])
+        return _numeros(self.df[coluna]) if coluna in self.df.columns else None
+
+    def opcoes(self, filtro):
+        """Valores existentes de um filtro: lista para os de valor, ``(mínimo, máximo)`` para os de faixa."""
+        opcoes = self._opcoes.get(filtro)
+        return list(opcoes) if filtro in self._valores else opcoes
+
+    def _chave(self, coluna):
+        """Chave numérica de ordenação (códigos em ordem alfabética para texto)."""
+        if coluna not in self._chaves:
+            if coluna == 'data' and 'data_dt' in self.df.columns:
+                datas = self.df['data_dt'].to_numpy(dtype='datetime64[ns]')
+                chave = datas.view('int64').astype('float64')
+                chave[np.isnat(datas)] = np.nan
+            elif coluna in ('mandante', 'visitante', 'arena'):
+                serie = self.df[coluna]
+                if not (isinstance(serie.dtype, pd.CategoricalDtype) and serie.cat.categories.is_monotonic_increasing):
+                    serie = serie.astype(str).astype('category')
+                chave = serie.array.codes.astype('float64')
+            else:
+                chave = self._coluna(coluna)
+            self._chaves[coluna] = chave
+        return self._chaves[coluna]
+
+    def _ordem(self, coluna):
+        """Permutação de todas as linhas ordenadas por ``coluna`` (calculada no primeiro uso)."""
+        if coluna not in self._ordens:
+            self._ordens[coluna] = np.argsort(self._chave(coluna), kind='stable').astype('int32')
+        return self._ordens[coluna]
+
+    def _filtros(self, filtros):
+        """``[(tamanho, posições(), teste(posições))]`` de cada filtro ativo."""
+        ativos = []
+        for filtro, valores in filtros.items():
+            if filtro in FILTROS_VALOR:
+                if not valores or filtro not in self._valores:
+                    continue
+                categorias, codigos, indice = self._valores[filtro]
+                alvo = categorias.get_indexer([str(valor) for valor in valores])
+                alvo = alvo[alvo >= 0]
+
+                def posicoes(indice=indice, alvo=alvo):
+                    partes = [indice.posicoes(codigo) for codigo in alvo]
+                    return np.unique(np.concatenate(partes)) if partes else np.empty(0, dtype='int32')
+
+                def teste(linhas, codigos=codigos, alvo=alvo):
+                    return np.logical_or.reduce([np.isin(c[linhas], alvo) for c in codigos])
+
+                ativos.append((sum(indice.contagem(c, c) for c in alvo), posicoes, teste))
+            elif filtro in FILTROS_FAIXA:
+                if valores is None or filtro not in self._faixas or valores == (None, None):
+                    continue
+                inicio, fim = valores
+                coluna, indice = self._faixas[filtro]
+
+                def posicoes(indice=indice, inicio=inicio, fim=fim):
+                    return np.sort(indice.entre(inicio, fim))
+
+                def teste(linhas, coluna=coluna, inicio=inicio, fim=fim):
+                    valores = coluna[linhas]
+                    return ((valores >= inicio) if inicio is not None else True) & \
+                        ((valores <= fim) if fim is not None else True)
+
+                ativos.append((indice.contagem(inicio, fim), posicoes, teste))
+            else:
+                raise ValueError(f"Filtro desconhecido: '{filtro}'")
+        return ativos
+
+    def selecionar(self, **filtros):
+        """Posições (ordenadas) das partidas que atendem a todos os filtros; ``None`` = todas.
+
+        ``times``/``estados``/``arenas`` recebem listas de valores;
+        ``temporadas``/``rodadas``/``gols`` recebem ``(inicio, fim)``.
+        """
+        ativos = self._filtros(filtros)
+        if not ativos:
+            return None
+        # O índice do filtro mais seletivo dá os candidatos; os outros só são testados neles
+        ativos.sort(key=lambda filtro: filtro[0])
+        linhas = ativos[0][1]()
+        for _, _, teste in ativos[1:]:
+            linhas = linhas[teste(linhas)]
+        return linhas
+
+    def consultar(self, ordenar='data', decrescente=True, numero=1, tamanho=25, **filtros):
+        """Uma página do resultado dos filtros, ordenada por ``ordenar``."""
+        if self.df is None:
+            return PaginaPartidas(pd.DataFrame(columns=COLUNAS_PAGINA), 0, 1, 1)
+        if ordenar not in ORDENACOES:
+            raise ValueError(f"Ordenação desconhecida: '{ordenar}'")
+        linhas = self.selecionar(**filtros)
+        total = len(self.df) if linhas is None else len(linhas)
+        paginas = max(1, -(-total // tamanho))
+        numero = min(max(1, numero), paginas)
+        if linhas is None:
+            ordem = self._ordem(ordenar)
+        elif len(linhas) <= len(self.df) * _FRACAO_ORDENACAO_LOCAL:
+            ordem = linhas[np.argsort(self._chave(ordenar)[linhas], kind='stable')]
+        else:
+            marcadas = np.zeros(len(self.df), dtype=bool)
+            marcadas[linhas] = True
+            ordem = self._ordem(ordenar)
+            ordem = ordem[marcadas[ordem]]
+        if decrescente:
+            ordem = ordem[::-1]
+        posicoes = ordem[(numero - 1) * tamanho:numero * tamanho]
+        pagina = self.df.iloc[posicoes]
+        if 'gols' in self._faixas:
+            pagina = pagina.assign(total_gols=pagina['mandante_Placar'] + pagina['visitante_Placar'])
+        return PaginaPartidas(pagina[[c for c in COLUNAS_PAGINA if c in pagina.columns]], total, numero, paginas)
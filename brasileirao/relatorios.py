@@ -0,0 +1,168 @@
+"""Cálculo em lote de todos os relatórios do dashboard, sem Streamlit.
+
+Carrega os dados com a mesma configuração do app (variáveis ``BRASILEIRAO_*``),
+avalia cada análise do ``REGISTRO`` e grava os resultados em JSON e/ou
+Parquet, um arquivo por tabela, mais um ``indice.json`` com a versão dos
+dados e o que foi gerado::
+
+    python -m brasileirao.relatorios --saida relatorios --por-temporada --processos 4
+
+Com ``--por-temporada`` cada análise é calculada também para cada temporada
+isolada; com ``--processos N`` as análises são distribuídas entre N processos,
+cada um com sua própria cópia dos dados (lida dos snapshots locais). Com
+``--trace arquivo.json`` a carga e os cálculos do processo principal são
+instrumentados e gravados no formato Trace Event (``chrome://tracing``).
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
+from pathlib import Path
+
+import pandas as pd
+
+from .analises import REGISTRO, montar_contexto
+from .fontes import ConfigDados
+from .incremental import carregar
+from .instrumentacao import Rastreador, exportar_chrome
+from .temporadas import formatar_periodo
+
+FORMATOS = ('json', 'parquet')
+
+
+def tabelas(analise, resultado):
+    """Converte o resultado de uma análise em ``{parte: DataFrame}`` (``''`` = tabela única)."""
+    if isinstance(resultado, pd.Series):
+        df = resultado.reset_index()
+        colunas = analise.apresentacao.get('colunas')
+        if colunas and len(colunas) == len(df.columns):
+            df.columns = list(colunas)
+        return {'': df}
+    if isinstance(resultado, pd.DataFrame):
+        return {'': resultado}
+    if isinstance(resultado, dict):
+        return {parte: valor for parte, valor in resultado.items() if isinstance(valor, pd.DataFrame)}
+    if hasattr(resultado, 'tabela'):
+        return {'': resultado.tabela()}
+    raise TypeError(f"Resultado de '{analise.chave}' sem conversão para tabela: {type(resultado).__name__}")
+
+
+def gravar(df, destino, formatos):
+    """Grava ``df`` em ``destino.<formato>`` para cada formato; devolve os caminhos."""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    df = df.reset_index(drop=True)
+    df.columns = [str(c) for c in df.columns]
+    caminhos = []
+    for formato in formatos:
+        caminho = destino.with_name(f'{destino.name}.{formato}')
+        if formato == 'parquet':
+            df.to_parquet(caminho, index=False)
+        else:
+            df.to_json(caminho, orient='records', force_ascii=False, date_format='iso', indent=1)
+        caminhos.append(str(caminho))
+    return caminhos
+
+
+def executar(contexto, chave, params, saida, formatos):
+    """Calcula uma análise, grava as tabelas e devolve a entrada do índice."""
+    analise = REGISTRO[chave]
+    inicio = time.perf_counter()
+    resultado = REGISTRO.avaliar(chave, contexto, **params)
+    calculo = time.perf_counter() - inicio
+    periodo = formatar_periodo(params.get('inicio'), params.get('fim')) or 'todas'
+    arquivos, linhas = [], 0
+    for parte, df in (tabelas(analise, resultado) if len(resultado) else {}).items():
+        nome = f'{periodo}.{parte}' if parte else periodo
+        arquivos += gravar(df, Path(saida) / chave / nome, formatos)
+        linhas += len(df)
+    entrada = {'analise': chave, **params, 'linhas': linhas, 'arquivos': arquivos,
+               'calculo_s': round(calculo, 4)}
+    if isinstance(resultado, dict) and 'temporada' in resultado:
+        entrada['temporada'] = resultado['temporada']
+    return entrada
+
+
+def tarefas(contexto, chaves=None, por_temporada=False):
+    """Lista de ``(chave, params)``: cada análise com seus parâmetros padrão e, opcionalmente, por temporada."""
+    lista = []
+    for chave in chaves or REGISTRO.chaves():
+        if REGISTRO.faltantes(chave, contexto):
+            continue
+        padrao = dict(REGISTRO[chave].parametros)
+        lista.append((chave, padrao))
+        if por_temporada:
+            lista += [(chave, {**padrao, 'inicio': t, 'fim': t}) for t in contexto.temporadas.temporadas
+                      if (padrao['inicio'], padrao['fim']) != (t, t)]
+    return lista
+
+
+# Contexto de cada processo do pool, montado uma vez no inicializador
+_contexto_processo = None
+
+
+def _iniciar_processo(config):
+    global _contexto_processo
+    estado = carregar(config)
+    _contexto_processo = montar_contexto(estado.dados, estado.versao, estado.agregados, estado.tabela)
+
+
+def _executar_no_processo(chave, params, saida, formatos):
+    return executar(_contexto_processo, chave, params, saida, formatos)
+
+
+def gerar(config, saida, formatos=('parquet',), por_temporada=False, processos=0, chaves=None):
+    """Calcula e grava todos os relatórios; devolve o índice (também gravado em ``indice.json``)."""
+    inicio = time.perf_counter()
+    estado = carregar(config)
+    contexto = montar_contexto(estado.dados, estado.versao, estado.agregados, estado.tabela)
+    lista = tarefas(contexto, chaves, por_temporada)
+    if processos and processos > 1:
+        # Os processos leem os snapshots que a carga acima acabou de validar (em
+        # blocos ou não), sem voltar à fonte nem depender do TTL
+        config_processos = replace(config, offline=True)
+        with ProcessPoolExecutor(processos, initializer=_iniciar_processo,
+                                 initargs=(config_processos,)) as pool:
+            futuros = [pool.submit(_executar_no_processo, chave, params, saida, formatos)
+                       for chave, params in lista]
+            relatorios = [futuro.result() for futuro in futuros]
+    else:
+        relatorios = [executar(contexto, chave, params, saida, formatos) for chave, params in lista]
+    indice = {
+        'versao': estado.versao,
+        'gerado_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'total_s': round(time.perf_counter() - inicio, 3),
+        'carga': estado.relatorio_carga,
+        'relatorios': relatorios,
+    }
+    Path(saida).mkdir(parents=True, exist_ok=True)
+    with open(Path(saida) / 'indice.json', 'w', encoding='utf-8') as arquivo:
+        json.dump(indice, arquivo, indent=2, ensure_ascii=False, default=str)
+    return indice
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--saida', default='relatorios', help='diretório de saída (padrão: relatorios)')
+    parser.add_argument('--formato', choices=FORMATOS, action='append',
+                        help='json e/ou parquet (repetível; padrão: parquet)')
+    parser.add_argument('--por-temporada', action='store_true', help='calcula também cada temporada isolada')
+    parser.add_argument('--processos', type=int, default=0, help='processos em paralelo (padrão: sem pool)')
+    parser.add_argument('--analise', action='append', choices=REGISTRO.chaves(), dest='analises',
+                        help='restringe às análises indicadas (repetível)')
+    parser.add_argument('--trace', metavar='ARQUIVO', help='grava um trace da execução (formato Trace Event)')
+    args = parser.parse_args(argv)
+    rastreador = Rastreador('relatorios') if args.trace else None
+    with rastreador or nullcontext():
+        indice = gerar(ConfigDados.do_ambiente(), args.saida, tuple(args.formato or ('parquet',)),
+                       args.por_temporada, args.processos, args.analises)
+    if args.trace:
+        with open(args.trace, 'w', encoding='utf-8') as arquivo:
+            json.dump(exportar_chrome([rastreador]), arquivo, default=str)
+    print(f"{len(indice['relatorios'])} relatórios gravados em {args.saida} "
+          f"(dados {indice['versao']}) em {indice['total_s']}s")
+
+
+if __name__ == '__main__':
+    main()
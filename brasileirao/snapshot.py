@@ -0,0 +1,411 @@
+"""Snapshots colunares (Parquet) dos CSVs, com colunas derivadas já calculadas.
+
+A primeira carga baixa e interpreta o CSV, deriva ``data_dt``/``ano`` e grava
+``<dataset>.parquet`` junto de um ``<dataset>.json`` com os metadados da fonte.
+As cargas seguintes leem o Parquet direto. O snapshot é invalidado quando:
+
+- a fonte é local e mudou de mtime/tamanho *e* de checksum;
+- a fonte é remota, o TTL expirou e o checksum do conteúdo baixado mudou.
+
+Quando o conteúdo novo é o antigo com linhas acrescentadas no fim (caso de uma
+nova rodada), só o trecho acrescentado é interpretado e gravado como mais uma
+parte do snapshot (``<dataset>.<n>.parquet``); o acréscimo é reconhecido pelo
+checksum do prefixo com o tamanho antigo. Com ``MAX_PARTES`` partes o snapshot
+é reescrito em um arquivo só.
+
+No modo offline a fonte nunca é consultada: o snapshot existente é usado como
+está e a ausência dele é um erro.
+
+O modo de streaming (``ler_blocos``) segue as mesmas regras: com o snapshot
+válido, lê os lotes do Parquet; senão, lê a fonte em blocos e grava cada bloco
+no snapshot novo enquanto o repassa, sem materializar o dataset.
+"""
+import hashlib
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+from urllib.request import urlopen
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .fontes import caminho_local
+from .instrumentacao import secao
+
+# Incrementar quando mudar o formato gravado ou as colunas derivadas
+VERSAO_SNAPSHOT = 1
+
+# Partes anexadas acumuladas antes de reescrever o snapshot inteiro
+MAX_PARTES = 8
+
+
+def preparar_datas(df):
+    """Converte a coluna ``data`` para datetime e extrai o ano."""
+    if 'data' in df.columns:
+        with secao('datas', 'ingestao', linhas=len(df)):
+            df['data_dt'] = pd.to_datetime(df['data'], format='%d/%m/%Y', errors='coerce')
+            df['ano'] = df['data_dt'].dt.year
+    return df
+
+
+def ler_bytes(fonte, timeout=None):
+    """Lê o conteúdo bruto de uma fonte local, ``file://`` ou HTTP(S).
+
+    ``timeout`` (s) limita a conexão e cada leitura de uma fonte remota.
+    """
+    if '://' in fonte:
+        with urlopen(fonte, timeout=timeout) as resposta:
+            return resposta.read()
+    with open(fonte, 'rb') as arquivo:
+        return arquivo.read()
+
+
+def interpretar_csv(dados):
+    """Interpreta os bytes de um CSV e deriva as colunas de data."""
+    return preparar_datas(pd.read_csv(io.BytesIO(dados), encoding='utf-8'))
+
+
+def _caminhos(config, nome):
+    return config.diretorio / f'{nome}.parquet', config.diretorio / f'{nome}.json'
+
+
+def _partes(config, nome, meta):
+    return [config.diretorio / parte for parte in meta.get('partes', [f'{nome}.parquet'])]
+
+
+def _ler_meta(caminho_meta):
+    try:
+        with open(caminho_meta, encoding='utf-8') as arquivo:
+            meta = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('versao') == VERSAO_SNAPSHOT else None
+
+
+def _gravar_meta(caminho_meta, meta):
+    temporario = caminho_meta.with_suffix('.json.tmp')
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(meta, arquivo, indent=2)
+    os.replace(temporario, caminho_meta)
+
+
+def _estado_local(fonte):
+    caminho = caminho_local(fonte)
+    if caminho is None:
+        return None
+    estado = caminho.stat()
+    return {'mtime': estado.st_mtime, 'tamanho': estado.st_size}
+
+
+def _dispensa_verificacao(meta, fonte, config, forcar=False):
+    """Indica se o snapshot pode ser usado sem reler a fonte.
+
+    Com ``forcar=True`` a fonte remota é consultada mesmo dentro do TTL.
+    """
+    if meta.get('fonte') != fonte:
+        return False
+    estado = _estado_local(fonte)
+    if estado is not None:
+        return estado['mtime'] == meta.get('mtime') and estado['tamanho'] == meta.get('tamanho')
+    return not forcar and time.time() - meta.get('verificado_em', 0) < config.ttl
+
+
+def _gravar_parquet(df, caminho):
+    temporario = caminho.with_suffix('.parquet.tmp')
+    df.to_parquet(temporario, index=False)
+    os.replace(temporario, caminho)
+
+
+def gravar_snapshot(config, nome, df, fonte, checksum, tamanho=None):
+    """Grava o DataFrame e os metadados da fonte de forma atômica.
+
+    ``tamanho`` é o número de bytes do conteúdo da fonte, usado depois para
+    reconhecer acréscimos no fim do arquivo.
+    """
+    caminho, caminho_meta = _caminhos(config, nome)
+    config.diretorio.mkdir(parents=True, exist_ok=True)
+    _gravar_parquet(df, caminho)
+    return _gravar_meta_partes(caminho_meta, [caminho.name], len(df), fonte, checksum, tamanho)
+
+
+def _gravar_meta_partes(caminho_meta, partes, linhas, fonte, checksum, tamanho):
+    meta = {
+        'versao': VERSAO_SNAPSHOT,
+        'fonte': fonte,
+        'checksum': checksum,
+        'bytes': tamanho,
+        'linhas': linhas,
+        'partes': partes,
+        'verificado_em': time.time(),
+    }
+    meta.update(_estado_local(fonte) or {})
+    _gravar_meta(caminho_meta, meta)
+    return meta
+
+
+def anexar_snapshot(config, nome, meta, df_novas, fonte, checksum, tamanho):
+    """Acrescenta ``df_novas`` ao snapshot como uma parte nova e atualiza ``meta`` no lugar."""
+    partes = _partes(config, nome, meta)
+    if len(partes) >= MAX_PARTES:
+        df = pd.concat([*(pd.read_parquet(p) for p in partes), df_novas], ignore_index=True)
+        novo = gravar_snapshot(config, nome, df, fonte, checksum, tamanho)
+        meta.clear()
+        meta.update(novo)
+        return
+    caminho = config.diretorio / f'{nome}.{len(partes)}.parquet'
+    _gravar_parquet(df_novas, caminho)
+    meta.update(
+        fonte=fonte,
+        checksum=checksum,
+        bytes=tamanho,
+        linhas=meta.get('linhas', 0) + len(df_novas),
+        partes=[p.name for p in partes] + [caminho.name],
+        verificado_em=time.time(),
+    )
+    meta.update(_estado_local(fonte) or {})
+    _gravar_meta(config.diretorio / f'{nome}.json', meta)
+
+
+def _checksums(dados, tamanho):
+    """Checksum do conteúdo todo e dos primeiros ``tamanho`` bytes, em uma passada só."""
+    h = hashlib.sha256()
+    prefixo = None
+    if tamanho and tamanho < len(dados):
+        h.update(memoryview(dados)[:tamanho])
+        prefixo = h.copy().hexdigest()
+        h.update(memoryview(dados)[tamanho:])
+    else:
+        h.update(dados)
+    return h.hexdigest(), prefixo
+
+
+@contextmanager
+def _medir(medidas, fase, nome):
+    """Soma a duração do bloco em ``medidas[fase]`` (e a registra como seção, se instrumentado)."""
+    inicio = time.perf_counter()
+    with secao(f'{fase} {nome}', 'ingestao'):
+        yield
+    medidas[fase] += time.perf_counter() - inicio
+
+
+def carregar_dataset(config, nome, medidas=None, interpretar=interpretar_csv, apenas_novas=False, forcar=False):
+    """Carrega um dataset pelo snapshot local, recriando-o se a fonte mudou.
+
+    Se ``medidas`` for um dict, recebe ``origem`` (``snapshot``, ``incremental``
+    ou ``fonte``), ``bytes``, o ``checksum`` do conteúdo, ``novas`` (linhas
+    interpretadas da fonte) e os tempos (s) de ``leitura`` da fonte,
+    ``interpretacao`` do CSV e ``snapshot`` (ler/gravar Parquet).
+
+    Com ``apenas_novas=True`` o snapshot não é lido: devolve um DataFrame vazio
+    se nada mudou, só as linhas acrescentadas (origem ``incremental``) ou o
+    dataset inteiro se a fonte foi reescrita (origem ``fonte``). ``forcar=True``
+    consulta a fonte remota mesmo com o TTL ainda válido (atualização pedida).
+    """
+    medidas = {} if medidas is None else medidas
+    medidas.update(origem='snapshot', bytes=0, novas=0, leitura=0.0, interpretacao=0.0, snapshot=0.0)
+    caminho, caminho_meta = _caminhos(config, nome)
+    meta = _ler_meta(caminho_meta) if caminho.exists() else None
+
+    def ler_snapshot():
+        medidas['checksum'] = meta['checksum']
+        if apenas_novas:
+            return pd.DataFrame()
+        partes = _partes(config, nome, meta)
+        with _medir(medidas, 'snapshot', nome):
+            df = pd.concat([pd.read_parquet(p) for p in partes], ignore_index=True) \
+                if len(partes) > 1 else pd.read_parquet(partes[0])
+        if medidas['origem'] == 'snapshot':
+            medidas['bytes'] = sum(p.stat().st_size for p in partes)
+        return df
+
+    if config.offline:
+        if meta is None:
+            raise FileNotFoundError(
+                f"Modo offline: snapshot de '{nome}' não encontrado em {config.diretorio}")
+        return ler_snapshot()
+
+    fonte = config.fonte(nome)
+    if meta is not None and _dispensa_verificacao(meta, fonte, config, forcar):
+        return ler_snapshot()
+
+    with _medir(medidas, 'leitura', nome):
+        dados = ler_bytes(fonte, config.timeout)
+        tamanho_anterior = meta.get('bytes') if meta is not None else None
+        checksum, checksum_prefixo = _checksums(dados, tamanho_anterior)
+    if meta is not None and meta.get('checksum') == checksum:
+        # Conteúdo idêntico (mesmo vindo de outro espelho): só renova a verificação
+        meta['fonte'] = fonte
+        meta['verificado_em'] = time.time()
+        meta.update(_estado_local(fonte) or {})
+        _gravar_meta(caminho_meta, meta)
+        return ler_snapshot()
+
+    if (checksum_prefixo is not None and checksum_prefixo == meta.get('checksum')
+            and dados[tamanho_anterior - 1:tamanho_anterior] == b'\n'):
+        # Só linhas novas no fim: interpreta o cabeçalho + o trecho acrescentado
+        medidas['origem'] = 'incremental'
+        medidas['checksum'] = checksum
+        medidas['bytes'] = len(dados) - tamanho_anterior
+        with _medir(medidas, 'interpretacao', nome):
+            cabecalho = dados[:dados.index(b'\n') + 1]
+            df_novas = interpretar(cabecalho + dados[tamanho_anterior:])
+        medidas['novas'] = len(df_novas)
+        with _medir(medidas, 'snapshot', nome):
+            anexar_snapshot(config, nome, meta, df_novas, fonte, checksum, len(dados))
+        return df_novas if apenas_novas else ler_snapshot()
+
+    medidas['origem'] = 'fonte'
+    medidas['checksum'] = checksum
+    medidas['bytes'] = len(dados)
+    with _medir(medidas, 'interpretacao', nome):
+        df = interpretar(dados)
+    medidas['novas'] = len(df)
+    with _medir(medidas, 'snapshot', nome):
+        gravar_snapshot(config, nome, df, fonte, checksum, len(dados))
+    return df
+
+
+class _LeitorComChecksum:
+    """Envolve um arquivo binário e calcula o checksum do que for lido."""
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.hash = hashlib.sha256()
+        self.bytes = 0
+
+    def read(self, tamanho=-1):
+        dados = self.arquivo.read(tamanho)
+        self.hash.update(dados)
+        self.bytes += len(dados)
+        return dados
+
+    def readline(self, tamanho=-1):
+        dados = self.arquivo.readline(tamanho)
+        self.hash.update(dados)
+        self.bytes += len(dados)
+        return dados
+
+    def __iter__(self):
+        return iter(self.readline, b'')
+
+
+def _abrir(fonte, timeout=None):
+    return urlopen(fonte, timeout=timeout) if '://' in fonte else open(fonte, 'rb')
+
+
+class _GravadorBlocos:
+    """Grava os blocos lidos da fonte como partes de um snapshot novo.
+
+    Os blocos vão para arquivos temporários; ``concluir`` os move para os nomes
+    finais e grava os metadados, então um streaming interrompido não altera o
+    snapshot anterior. Um bloco com tipos que não convertem para o esquema da
+    parte atual (ex.: coluna só de nulos no bloco anterior) abre uma parte nova.
+    """
+
+    def __init__(self, config, nome):
+        self.config = config
+        self.nome = nome
+        self.partes = []
+        self.linhas = 0
+        self._escritor = None
+
+    def adicionar(self, bloco):
+        tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+        if self._escritor is not None:
+            try:
+                tabela = tabela.cast(self._escritor.schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                self._escritor.close()
+                self._escritor = None
+        if self._escritor is None:
+            self.config.diretorio.mkdir(parents=True, exist_ok=True)
+            final = self.config.diretorio / (
+                f'{self.nome}.{len(self.partes)}.parquet' if self.partes else f'{self.nome}.parquet')
+            self.partes.append(final)
+            self._escritor = pq.ParquetWriter(final.with_suffix('.parquet.tmp'), tabela.schema)
+        self._escritor.write_table(tabela)
+        self.linhas += len(bloco)
+
+    def _fechar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
+
+    def concluir(self, fonte, checksum, tamanho):
+        self._fechar()
+        if not self.partes:
+            return
+        for final in self.partes:
+            os.replace(final.with_suffix('.parquet.tmp'), final)
+        _gravar_meta_partes(_caminhos(self.config, self.nome)[1], [p.name for p in self.partes],
+                            self.linhas, fonte, checksum, tamanho)
+        self.partes = []
+
+    def descartar(self):
+        """Apaga os temporários de um streaming que não chegou ao fim."""
+        self._fechar()
+        for final in self.partes:
+            final.with_suffix('.parquet.tmp').unlink(missing_ok=True)
+        self.partes = []
+
+
+def sondar(config, nome):
+    """Abre a fonte de um dataset e lê o primeiro byte; propaga o erro se ela não responder."""
+    with _abrir(config.fonte(nome), config.timeout) as arquivo:
+        arquivo.read(1)
+
+
+def ler_blocos(config, nome, linhas, medidas=None, forcar=False):
+    """Gera o dataset em DataFrames de até ``linhas`` linhas, sem materializá-lo inteiro.
+
+    Com o snapshot válido (ou no modo offline) lê os lotes do Parquet; senão lê
+    a fonte CSV em blocos (``data_dt``/``ano`` derivados em cada bloco) e grava
+    um snapshot novo com eles, que vale para as próximas cargas. ``forcar=True``
+    consulta a fonte remota mesmo dentro do TTL. ``medidas`` recebe
+    ``origem='streaming'``, ``bytes``, ``checksum``, ``linhas``, ``novas``
+    (linhas lidas da fonte), ``snapshot`` e ``leitura`` (do primeiro ao último
+    bloco, incluindo o consumo) ao fim da iteração.
+    """
+    medidas = {} if medidas is None else medidas
+    medidas.update(origem='streaming', bytes=0, linhas=0, novas=0, leitura=0.0, interpretacao=0.0, snapshot=0.0)
+    inicio = time.perf_counter()
+    caminho, caminho_meta = _caminhos(config, nome)
+    meta = _ler_meta(caminho_meta) if caminho.exists() else None
+    if config.offline and meta is None:
+        raise FileNotFoundError(
+            f"Modo offline: snapshot de '{nome}' não encontrado em {config.diretorio}")
+    fonte = config.fonte(nome)
+    if config.offline or (meta is not None and _dispensa_verificacao(meta, fonte, config, forcar)):
+        for parte in _partes(config, nome, meta):
+            for lote in pq.ParquetFile(parte).iter_batches(batch_size=linhas):
+                bloco = lote.to_pandas()
+                medidas['linhas'] += len(bloco)
+                yield bloco
+            medidas['bytes'] += parte.stat().st_size
+        medidas['checksum'] = meta['checksum']
+    else:
+        gravador = _GravadorBlocos(config, nome)
+        try:
+            with _abrir(fonte, config.timeout) as arquivo:
+                leitor = _LeitorComChecksum(arquivo)
+                for bloco in pd.read_csv(leitor, encoding='utf-8', chunksize=linhas):
+                    bloco = preparar_datas(bloco)
+                    with _medir(medidas, 'snapshot', nome):
+                        gravador.adicionar(bloco)
+                    medidas['linhas'] += len(bloco)
+                    yield bloco
+                # O parser pode parar antes do fim do arquivo (linhas em branco finais)
+                while leitor.read(1 << 20):
+                    pass
+            checksum = leitor.hash.hexdigest()
+            with _medir(medidas, 'snapshot', nome):
+                gravador.concluir(fonte, checksum, leitor.bytes)
+        finally:
+            gravador.descartar()
+        medidas['bytes'] = leitor.bytes
+        medidas['checksum'] = checksum
+        medidas['novas'] = medidas['linhas']
+    medidas['leitura'] = time.perf_counter() - inicio
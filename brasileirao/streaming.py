@@ -0,0 +1,77 @@
+"""Modo de streaming: gols e cartões lidos em blocos direto para os agregados.
+
+Com ``ConfigDados.bloco`` > 0, ``gols`` e ``cartoes`` não viram DataFrames: cada
+bloco de linhas é contado por ``(ano, classe, atleta)`` e por partida e somado
+às contagens correntes, e o bloco é descartado. A memória fica limitada ao
+tamanho do bloco mais o número de combinações distintas (atletas x temporadas),
+não ao número de eventos. No fim, as contagens passam pelo mesmo
+``guardar_eventos`` do caminho em memória, então os rankings são idênticos.
+
+As análises que precisam das linhas de eventos (detalhe de partida, gols e
+cartões no perfil dos times) ficam sem esses dados nesse modo.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .agregados import contar_eventos, guardar_eventos, somar_contagens
+from .classificacao import DATASET_EVENTO
+from .ingestao import ResultadoIngestao
+from .instrumentacao import propagar, secao
+from .snapshot import ler_blocos
+
+
+class AcumuladorEventos:
+    """Contagens correntes de um dataset de eventos, somadas bloco a bloco."""
+
+    def __init__(self, nome, df_full):
+        self.nome = nome
+        self.evento = DATASET_EVENTO[nome]
+        self.df_full = df_full
+        self.contagem = None
+        self.por_partida = None
+        self.blocos = 0
+
+    def adicionar(self, bloco):
+        if 'atleta' not in bloco.columns:
+            return
+        contagem, por_partida = contar_eventos(bloco, self.df_full, self.evento)
+        self.contagem = somar_contagens(self.contagem, contagem)
+        self.por_partida = somar_contagens(self.por_partida, por_partida)
+        self.blocos += 1
+
+    def guardar(self, armazem):
+        if self.contagem is not None:
+            guardar_eventos(armazem, self.nome, self.evento, self.contagem, self.por_partida)
+            armazem.datasets.add(self.nome)
+
+
+def _agregar(config, nome, df_full, forcar):
+    resultado = ResultadoIngestao(nome)
+    acumulador = AcumuladorEventos(nome, df_full)
+    inicio = time.perf_counter()
+    try:
+        with secao(f'streaming {nome}', 'ingestao', bloco=config.bloco):
+            for bloco in ler_blocos(config, nome, config.bloco, resultado.medidas, forcar):
+                acumulador.adicionar(bloco)
+    except Exception as e:
+        resultado.erro = f'{type(e).__name__}: {e}'
+        acumulador = None
+    resultado.total = time.perf_counter() - inicio
+    return resultado, acumulador
+
+
+def agregar_em_blocos(config, armazem, df_full, nomes=tuple(DATASET_EVENTO), forcar=False):
+    """Lê ``nomes`` em blocos de ``config.bloco`` linhas e guarda os rankings em ``armazem``.
+
+    Os datasets são lidos em paralelo, do snapshot quando ainda válido (``forcar``
+    consulta a fonte remota mesmo dentro do TTL). Devolve ``{nome: ResultadoIngestao}``
+    com ``df=None`` (nada é materializado).
+    """
+    with ThreadPoolExecutor(max_workers=len(nomes), thread_name_prefix='streaming') as pool:
+        futuros = {nome: pool.submit(propagar(_agregar), config, nome, df_full, forcar) for nome in nomes}
+        resultados = {}
+        for nome, futuro in futuros.items():
+            resultados[nome], acumulador = futuro.result()
+            if acumulador is not None:
+                acumulador.guardar(armazem)
+    return resultados
@@ -0,0 +1,193 @@
+"""Tabela de classificação rodada a rodada de todas as temporadas.
+
+A tabela é montada sem laços por partida: cada jogo vira duas linhas (mandante
+e visitante) com pontos, vitórias, gols etc., que são somadas por
+``(temporada, rodada, time)`` com ``np.bincount`` e acumuladas ao longo das
+rodadas com ``cumsum``. O resultado é um array denso ``[campo, temporada,
+rodada, time]`` de ``int16`` e as posições saem de uma única ordenação por
+``(temporada, rodada)``, com os critérios de desempate do Brasileirão:
+pontos, vitórias, saldo de gols e gols pró.
+
+A temporada de cada jogo é o ano da partida, exceto para rodadas do segundo
+turno disputadas entre janeiro e março, que pertencem à temporada anterior
+(caso de 2020, encerrada em fevereiro de 2021).
+"""
+import numpy as np
+import pandas as pd
+
+from .temporadas import faixa_anos
+
+CAMPOS = ('pontos', 'jogos', 'vitorias', 'empates', 'derrotas', 'gols_pro', 'gols_contra')
+_P, _J, _V, _E, _D, _GP, _GC = range(len(CAMPOS))
+
+
+def temporada_das_partidas(df_full):
+    """Temporada esportiva de cada partida (ver docstring do módulo)."""
+    anos = df_full['ano'].to_numpy(dtype='float64')
+    if 'data_dt' not in df_full.columns or 'rodata' not in df_full.columns:
+        return anos
+    mes = df_full['data_dt'].dt.month.to_numpy(dtype='float64')
+    rodada = df_full['rodata'].to_numpy(dtype='float64')
+    return np.where((mes <= 3) & (rodada > 19), anos - 1, anos)
+
+
+def codigos_times(df_full):
+    """Códigos de mandante/visitante no mesmo dicionário e a lista de nomes."""
+    mandante, visitante = df_full['mandante'], df_full['visitante']
+    if (isinstance(mandante.dtype, pd.CategoricalDtype)
+            and mandante.dtype == visitante.dtype):
+        return (mandante.cat.codes.to_numpy(), visitante.cat.codes.to_numpy(),
+                list(mandante.cat.categories))
+    codigos, nomes = pd.factorize(pd.concat([mandante, visitante], ignore_index=True))
+    n = len(df_full)
+    return codigos[:n], codigos[n:], list(nomes)
+
+
+class TabelaCampeonato:
+    """Classificação acumulada de cada time após cada rodada de cada temporada."""
+
+    def __init__(self, temporadas, rodadas, times, acumulado, posicao, participante):
+        self.temporadas = temporadas        # [S] anos
+        self.rodadas = rodadas              # [S] última rodada de cada temporada
+        self.times = times                  # [T] nomes (dicionário compartilhado)
+        self.acumulado = acumulado          # [campo, S, R, T] int16
+        self.posicao = posicao              # [S, R, T] int8 (0 = não participa)
+        self.participante = participante    # [S, T] bool
+        self._indice = {t: i for i, t in enumerate(temporadas)}
+
+    def __contains__(self, temporada):
+        return temporada in self._indice
+
+    def _coordenadas(self, temporada, rodada):
+        s = self._indice[temporada]
+        r = int(self.rodadas[s] if rodada is None else min(rodada, self.rodadas[s]))
+        return s, r - 1
+
+    def tabela(self, temporada, rodada=None):
+        """Classificação após ``rodada`` (padrão: a última), ordenada por posição."""
+        s, r = self._coordenadas(temporada, rodada)
+        times = np.flatnonzero(self.participante[s])
+        valores = {campo: self.acumulado[i, s, r, times] for i, campo in enumerate(CAMPOS)}
+        df = pd.DataFrame({'posicao': self.posicao[s, r, times],
+                           'time': [self.times[t] for t in times], **valores})
+        df['saldo'] = df['gols_pro'] - df['gols_contra']
+        return df.sort_values('posicao').reset_index(drop=True)
+
+    def evolucao(self, temporada):
+        """Formato longo ``(rodada, time, posicao, pontos)`` de uma temporada, para gráficos."""
+        s, ultima = self._coordenadas(temporada, None)
+        times = np.flatnonzero(self.participante[s])
+        rodadas = np.arange(1, ultima + 2)
+        return pd.DataFrame({
+            'rodada': np.repeat(rodadas, len(times)),
+            'time': np.tile(np.array(self.times, dtype=object)[times], len(rodadas)),
+            'posicao': self.posicao[s, :ultima + 1][:, times].ravel(),
+            'pontos': self.acumulado[_P, s, :ultima + 1][:, times].ravel(),
+        })
+
+
+def construir_tabela(df_full):
+    """Monta a classificação de todas as temporadas a partir de ``df_full``."""
+    colunas = ('mandante', 'visitante', 'mandante_Placar', 'visitante_Placar', 'rodata', 'ano')
+    if df_full is None or not set(colunas) <= set(df_full.columns):
+        return None
+    temporada = temporada_das_partidas(df_full)
+    validos = ~np.isnan(temporada) & df_full['rodata'].notna().to_numpy() \
+        & df_full['mandante_Placar'].notna().to_numpy() & df_full['visitante_Placar'].notna().to_numpy()
+    casa, fora, times = codigos_times(df_full)
+    casa, fora, temporada = casa[validos], fora[validos], temporada[validos]
+    rodada = df_full['rodata'].to_numpy()[validos].astype('int64') - 1
+    gm = df_full['mandante_Placar'].to_numpy()[validos].astype('int64')
+    gv = df_full['visitante_Placar'].to_numpy()[validos].astype('int64')
+
+    temporadas, s = np.unique(temporada.astype('int64'), return_inverse=True)
+    S, R, T = len(temporadas), int(rodada.max()) + 1 if len(rodada) else 1, len(times)
+
+    # Duas linhas por jogo: o mandante (com gm, gv) e o visitante (com gv, gm)
+    time = np.concatenate([casa, fora])
+    pro = np.concatenate([gm, gv])
+    contra = np.concatenate([gv, gm])
+    chave = (np.tile(s, 2) * R + np.tile(rodada, 2)) * T + time
+    vitoria, empate = pro > contra, pro == contra
+    por_jogo = {
+        _P: 3 * vitoria + empate,
+        _J: np.ones_like(pro),
+        _V: vitoria,
+        _E: empate,
+        _D: pro < contra,
+        _GP: pro,
+        _GC: contra,
+    }
+    acumulado = np.empty((len(CAMPOS), S, R, T), dtype='int16')
+    for campo, valores in por_jogo.items():
+        soma = np.bincount(chave, weights=valores, minlength=S * R * T).reshape(S, R, T)
+        acumulado[campo] = np.cumsum(soma, axis=1)
+
+    participante = acumulado[_J, :, -1, :] > 0
+    # Chave única de desempate: pontos > vitórias > saldo > gols pró
+    saldo = acumulado[_GP].astype('int64') - acumulado[_GC]
+    criterio = ((acumulado[_P].astype('int64') * 64 + acumulado[_V]) * 1024 + (saldo + 512)) * 1024 \
+        + acumulado[_GP]
+    criterio = np.where(participante[:, None, :], criterio, -1)
+    ordem = np.argsort(-criterio, axis=2, kind='stable')
+    posicao = np.empty_like(ordem)
+    np.put_along_axis(posicao, ordem, np.arange(1, T + 1), axis=2)
+    posicao = np.where(participante[:, None, :], posicao, 0).astype('int8')
+
+    ultima_rodada = np.zeros(S, dtype='int64')
+    np.maximum.at(ultima_rodada, s, rodada + 1)
+    return TabelaCampeonato([int(t) for t in temporadas], ultima_rodada, times,
+                            acumulado, posicao, participante)
+
+
+def _por_times(valores, de, para):
+    """Reindexa o último eixo (times) de ``valores`` da lista ``de`` para a lista ``para``."""
+    if list(de) == list(para):
+        return valores
+    saida = np.zeros(valores.shape[:-1] + (len(para),), dtype=valores.dtype)
+    indice = {t: i for i, t in enumerate(para)}
+    saida[..., [indice[t] for t in de]] = valores
+    return saida
+
+
+def _por_rodadas(valores, eixo, rodadas):
+    """Estende o eixo de rodadas repetindo a última (os valores são acumulados)."""
+    faltam = rodadas - valores.shape[eixo]
+    if faltam <= 0:
+        return valores
+    largura = [(0, 0)] * valores.ndim
+    largura[eixo] = (0, faltam)
+    return np.pad(valores, largura, mode='edge')
+
+
+def atualizar_tabela(tabela, df_full, temporadas):
+    """Recalcula só as ``temporadas`` indicadas e as encaixa em ``tabela``.
+
+    ``df_full`` é o frame já particionado por ano (ver ``temporadas.particionar``),
+    de modo que as partidas dessas temporadas saem de uma fatia contígua; as
+    demais temporadas são copiadas de ``tabela`` sem recálculo.
+    """
+    if tabela is None or not len(temporadas):
+        return construir_tabela(df_full) if tabela is None else tabela
+    # A temporada T tem jogos no ano T e, no máximo, no começo do ano T + 1
+    a, b = faixa_anos(df_full['ano'].astype('float64').to_numpy(), min(temporadas), max(temporadas) + 1)
+    recorte = df_full.iloc[a:b]
+    recorte = recorte[np.isin(temporada_das_partidas(recorte), list(temporadas))]
+    parcial = construir_tabela(recorte)
+    if parcial is None:
+        return tabela
+
+    times = list(parcial.times) + [t for t in tabela.times if t not in set(parcial.times)]
+    rodadas = max(tabela.acumulado.shape[2], parcial.acumulado.shape[2])
+    todas = sorted(set(tabela.temporadas) | set(parcial.temporadas))
+    acumulado = np.zeros((len(CAMPOS), len(todas), rodadas, len(times)), dtype='int16')
+    posicao = np.zeros((len(todas), rodadas, len(times)), dtype='int8')
+    participante = np.zeros((len(todas), len(times)), dtype=bool)
+    ultima_rodada = np.zeros(len(todas), dtype='int64')
+    for origem in (tabela, parcial):
+        s = [todas.index(t) for t in origem.temporadas]
+        acumulado[:, s] = _por_rodadas(_por_times(origem.acumulado, origem.times, times), 2, rodadas)
+        posicao[s] = _por_rodadas(_por_times(origem.posicao, origem.times, times), 1, rodadas)
+        participante[s] = _por_times(origem.participante, origem.times, times)
+        ultima_rodada[s] = origem.rodadas
+    return TabelaCampeonato(todas, ultima_rodada, times, acumulado, posicao, participante)
@@ -0,0 +1,100 @@
+"""Particionamento dos datasets por temporada.
+
+Na carga, jogos, gols e cartões são reordenados uma única vez por ``ano``
+(ordenação estável, preservando a ordem original dentro da temporada). A
+partir daí uma temporada ou um intervalo de temporadas é um bloco contíguo de
+linhas: o índice guarda o início e o fim de cada temporada e ``fatia`` devolve
+``df.iloc[a:b]``, uma visão sem cópia, em vez de uma máscara booleana + ``copy``.
+"""
+import numpy as np
+import pandas as pd
+
+from .agregados import ano_dos_eventos
+
+PARTICIONADOS = ('full', 'gols', 'cartoes')
+
+
+def tipo_anulavel(tipo):
+    """Versão anulável do tipo de ``ano`` (``int16`` -> ``Int16``).
+
+    Gol ou cartão cuja partida não está em ``full`` fica sem ano (``<NA>``).
+    """
+    return pd.api.types.pandas_dtype(str(tipo).capitalize())
+
+
+def particionar(dados):
+    """Ordena os datasets por temporada, incluindo ``ano`` em gols/cartões quando faltar."""
+    df_full = dados.get('full')
+    ordenados = dict(dados)
+    for nome in PARTICIONADOS:
+        df = dados.get(nome)
+        if df is None:
+            continue
+        anos = ano_dos_eventos(df, df_full)
+        if anos.isna().all():
+            continue
+        if 'ano' not in df.columns:
+            tipo = df_full['ano'].dtype if df_full is not None and 'ano' in df_full.columns else 'Int16'
+            df = df.assign(ano=anos.astype(tipo_anulavel(tipo)))
+        chave = anos.astype('float64').to_numpy()
+        ordem = np.argsort(chave, kind='stable')  # NaN vai para o fim
+        if not np.array_equal(ordem, np.arange(len(ordem))):
+            df = df.take(ordem).reset_index(drop=True)
+        ordenados[nome] = df
+    return ordenados
+
+
+def faixa_anos(anos, inicio=None, fim=None):
+    """Posições ``(a, b)`` dos anos de ``inicio`` a ``fim`` (inclusive) em ``anos`` ordenado.
+
+    Busca binária; ``NaN`` no fim de ``anos`` (eventos sem ano) fica fora de
+    qualquer faixa com ``fim``.
+    """
+    a = 0 if inicio is None else int(np.searchsorted(anos, inicio, side='left'))
+    b = len(anos) if fim is None else int(np.searchsorted(anos, fim, side='right'))
+    return a, max(a, b)
+
+
+class IndiceTemporadas:
+    """Limites ``[inicio, fim)`` de cada temporada nos datasets já particionados."""
+
+    def __init__(self, dados):
+        self.dados = dados
+        self._anos = {}
+        for nome in PARTICIONADOS:
+            df = dados.get(nome)
+            if df is not None and 'ano' in df.columns:
+                anos = df['ano'].astype('float64').to_numpy()
+                self._anos[nome] = anos[~np.isnan(anos)]
+        base = self._anos.get('full', next(iter(self._anos.values()), np.array([])))
+        self.temporadas = [int(a) for a in np.unique(base)]
+
+    def faixa(self, nome, inicio=None, fim=None):
+        """Posições ``(a, b)`` das linhas de ``inicio`` a ``fim`` (inclusive), por busca binária."""
+        anos = self._anos.get(nome)
+        if anos is None:
+            return 0, 0
+        return faixa_anos(anos, inicio, fim)
+
+    def fatia(self, nome, inicio=None, fim=None):
+        """Visão (sem cópia) das linhas das temporadas de ``inicio`` a ``fim``."""
+        df = self.dados.get(nome)
+        if df is None:
+            return None
+        if nome not in self._anos:
+            return df
+        a, b = self.faixa(nome, inicio, fim)
+        return df.iloc[a:b]
+
+    def contagem(self, nome, inicio=None, fim=None):
+        a, b = self.faixa(nome, inicio, fim)
+        return b - a
+
+
+def formatar_periodo(inicio, fim):
+    """``'2008'``, ``'2003-2022'`` ou ``''`` (sem filtro)."""
+    if inicio is None and fim is None:
+        return ''
+    if inicio == fim:
+        return str(inicio)
+    return f"{inicio if inicio is not None else '...'}-{fim if fim is not None else '...'}"
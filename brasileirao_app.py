@@ -1,460 +1,546 @@
+import json
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from brasileirao.analises import REGISTRO, Contexto
+from brasileirao.confrontos import construir_confrontos
+from brasileirao.figuras import FIGURAS, enxugar, reduzir_pontos
+from brasileirao.fontes import ConfigDados
+from brasileirao.incremental import Carga
+from brasileirao.instrumentacao import Rastreador, ativar, atual, com_contagem, do_ambiente, exportar_chrome, secao
+from brasileirao.partidas import ORDENACOES, ExploradorPartidas, IndicePartidas
+from brasileirao.temporadas import IndiceTemporadas, formatar_periodo
+
 # Configuração da página
 st.set_page_config(page_title="Análise Campeonato Brasileiro", page_icon="⚽", layout="wide")
 
 st.title("⚽ Análise do Campeonato Brasileiro (2003-2022)")
 st.markdown("---")
 
-# URLs dos arquivos CSV no GitHub (raw)
-urls = {
-    'full': 'https://raw.githubusercontent.com/vconceicao/ada_brasileirao_dataset/master/campeonato-brasileiro-full.csv',
-    'gols': 'https://raw.githubusercontent.com/vconceicao/ada_brasileirao_dataset/master/campeonato-brasileiro-gols.csv',
-    'cartoes': 'https://raw.githubusercontent.com/vconceicao/ada_brasileirao_dataset/master/campeonato-brasileiro-cartoes.csv',
-    'estatisticas': 'https://raw.githubusercontent.com/vconceicao/ada_brasileirao_dataset/master/campeonato-brasileiro-estatisticas-full.csv'
-}
+# Fontes, diretório de snapshots e modo offline vêm das variáveis BRASILEIRAO_*
+config_dados = ConfigDados.do_ambiente()
 
-@st.cache_data
-def load_data():
-    """Carrega todos os arquivos CSV"""
+# Instrumentação opcional: ligada no painel de diagnóstico ou por BRASILEIRAO_INSTRUMENTAR
+RASTROS_GUARDADOS = 20
+instrumentar_padrao, memoria_padrao = do_ambiente()
+st.session_state.setdefault("instrumentar", instrumentar_padrao)
+st.session_state.setdefault("instrumentar_memoria", memoria_padrao)
+rastro = Rastreador(memoria=st.session_state["instrumentar_memoria"]) if st.session_state["instrumentar"] else None
+ativar(rastro)
+# Gráficos enxutos: dados arredondados, template reduzido e séries longas reduzidas no servidor
+st.session_state.setdefault("graficos_enxutos", True)
+
+@com_contagem('carga', st.cache_resource)
+def load_carga():
+    """Carrega os quatro datasets em paralelo, uma vez por processo; falhas individuais não derrubam os demais"""
     with st.spinner('Carregando dados...'):
-        try:
-            df_full = pd.read_csv(urls['full'], encoding='utf-8')
-            df_gols = pd.read_csv(urls['gols'], encoding='utf-8')
-            df_cartoes = pd.read_csv(urls['cartoes'], encoding='utf-8')
-            df_estatisticas = pd.read_csv(urls['estatisticas'], encoding='utf-8')
-            
-            # Converter coluna de data para datetime e extrair o ano
-            if 'data' in df_full.columns:
-                df_full['data_dt'] = pd.to_datetime(df_full['data'], format='%d/%m/%Y', errors='coerce')
-                df_full['ano'] = df_full['data_dt'].dt.year
-            
-            if 'data' in df_gols.columns:
-                df_gols['data_dt'] = pd.to_datetime(df_gols['data'], format='%d/%m/%Y', errors='coerce')
-                df_gols['ano'] = df_gols['data_dt'].dt.year
-            
-            if 'data' in df_cartoes.columns:
-                df_cartoes['data_dt'] = pd.to_datetime(df_cartoes['data'], format='%d/%m/%Y', errors='coerce')
-                df_cartoes['ano'] = df_cartoes['data_dt'].dt.year
-            
-            return df_full, df_gols, df_cartoes, df_estatisticas
-        except Exception as e:
-            st.error(f"Erro ao carregar dados: {str(e)}")
-            return None, None, None, None
+        return Carga(config_dados)
 
-# Carregar dados
-df_full, df_gols, df_cartoes, df_estatisticas = load_data()
+@com_contagem('confrontos', st.cache_resource(max_entries=2))
+def load_confrontos(versao, _dados):
+    """Matriz time x time de confrontos e contagens de gols/cartões por clube"""
+    return construir_confrontos(_dados)
 
-if df_full is not None:
-    
-    # Debug: Mostrar colunas disponíveis (pode ser removido depois)
-    with st.expander("🔍 Ver estrutura dos dados (Debug)"):
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.write("**Colunas - Jogos:**")
-            st.write(df_full.columns.tolist())
-        with col2:
-            st.write("**Colunas - Gols:**")
-            st.write(df_gols.columns.tolist())
-        with col3:
-            st.write("**Colunas - Cartões:**")
-            st.write(df_cartoes.columns.tolist())
-    
-    # Criar tabs para organizar as análises
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
-        "🏆 Time Vencedor 2008",
-        "🗺️ Estado com Menos Jogos",
-        "⚽ Artilheiro Geral",
-        "🎯 Artilheiro de Pênaltis",
-        "🔄 Gols Contra",
-        "🟨 Cartões Amarelos",
-        "🟥 Cartões Vermelhos",
-        "🎲 Partida com Mais Gols"
-    ])
-    
-    # TAB 1: Time que mais venceu em 2008
-    with tab1:
-        st.header("🏆 Time que mais venceu jogos em 2008")
-        
-        try:
-            # Filtrar jogos de 2008
-            df_2008 = df_full[df_full['ano'] == 2008].copy()
-            
-            if len(df_2008) == 0:
-                st.warning("Não foram encontrados jogos de 2008 nos dados.")
-            else:
-                # Contar vitórias por time
-                vitorias = df_2008['vencedor'].value_counts()
-                
-                # Remover valores nulos ou '-' que indicam empate
-                vitorias = vitorias[vitorias.index.notna()]
-                vitorias = vitorias[vitorias.index != '-']
-                
-                if len(vitorias) > 0:
-                    time_campeao = vitorias.index[0]
-                    num_vitorias = vitorias.values[0]
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("Time com mais vitórias", time_campeao, f"{num_vitorias} vitórias")
-                        
-                        st.subheader("Top 10 times com mais vitórias em 2008")
-                        top10 = vitorias.head(10).reset_index()
-                        top10.columns = ['Time', 'Vitórias']
-                        st.dataframe(top10, use_container_width=True)
-                    
-                    with col2:
-                        fig = px.bar(vitorias.head(10), 
-                                   title='Top 10 Times - Vitórias em 2008',
-                                   labels={'value': 'Número de Vitórias', 'index': 'Time'},
-                                   color=vitorias.head(10).values,
-                                   color_continuous_scale='Greens')
-                        st.plotly_chart(fig, use_container_width=True)
-        except Exception as e:
-            st.error(f"Erro ao processar dados de 2008: {str(e)}")
-    
-    # TAB 2: Estado com menos jogos
-    with tab2:
-        st.header("🗺️ Estado com menos jogos (2003-2022)")
-        
-        try:
-            # Filtrar período
-            df_periodo = df_full[(df_full['ano'] >= 2003) & (df_full['ano'] <= 2022)].copy()
-            
-            # Contar jogos por estado (mandante e visitante)
-            jogos_mandante = df_periodo['mandante_Estado'].value_counts()
-            jogos_visitante = df_periodo['visitante_Estado'].value_counts()
-            
-            # Somar jogos como mandante e visitante
-            total_jogos = jogos_mandante.add(jogos_visitante, fill_value=0).sort_values()
-            
-            if len(total_jogos) > 0:
-                estado_menos_jogos = total_jogos.index[0]
-                num_jogos = int(total_jogos.values[0])
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.metric("Estado com menos jogos", estado_menos_jogos, f"{num_jogos} jogos")
-                    
-                    st.subheader("Estados com menos jogos")
-                    bottom10 = total_jogos.head(10).reset_index()
-                    bottom10.columns = ['Estado', 'Número de Jogos']
-                    st.dataframe(bottom10, use_container_width=True)
-                
-                with col2:
-                    fig = px.bar(total_jogos.head(10), 
-                               title='10 Estados com Menos Jogos (2003-2022)',
-                               labels={'value': 'Número de Jogos', 'index': 'Estado'},
-                               color=total_jogos.head(10).values,
-                               color_continuous_scale='Reds_r')
-                    st.plotly_chart(fig, use_container_width=True)
-        except Exception as e:
-            st.error(f"Erro ao processar dados de estados: {str(e)}")
-    
-    # TAB 3: Jogador com mais gols
-    with tab3:
-        st.header("⚽ Artilheiro Geral")
-        
-        try:
-            # Verificar se a coluna 'atleta' existe
-            if 'atleta' in df_gols.columns:
-                artilheiros = df_gols['atleta'].value_counts()
-                
-                # Remover valores nulos
-                artilheiros = artilheiros[artilheiros.index.notna()]
-                
-                if len(artilheiros) > 0:
-                    artilheiro = artilheiros.index[0]
-                    num_gols = artilheiros.values[0]
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("Artilheiro Geral", artilheiro, f"{num_gols} gols")
-                        
-                        st.subheader("Top 20 Artilheiros")
-                        top20 = artilheiros.head(20).reset_index()
-                        top20.columns = ['Jogador', 'Gols']
-                        st.dataframe(top20, use_container_width=True)
-                    
-                    with col2:
-                        fig = px.bar(artilheiros.head(15), 
-                                   title='Top 15 Artilheiros',
-                                   labels={'value': 'Gols', 'index': 'Jogador'},
-                                   color=artilheiros.head(15).values,
-                                   color_continuous_scale='Blues')
-                        fig.update_xaxis(tickangle=-45)
-                        st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.warning("Coluna 'atleta' não encontrada no dataset de gols.")
-        except Exception as e:
-            st.error(f"Erro ao processar artilheiros: {str(e)}")
-    
-    # TAB 4: Jogador com mais gols de pênalti
-    with tab4:
-        st.header("🎯 Artilheiro de Pênaltis")
-        
-        try:
-            # Verificar se as colunas existem
-            if 'atleta' in df_gols.columns and 'tipo_de_gol' in df_gols.columns:
-                # Filtrar apenas gols de pênalti
-                penaltis = df_gols[df_gols['tipo_de_gol'].str.contains('Penalty|Pênalti|Penalti', case=False, na=False)]
-                artilheiros_penalti = penaltis['atleta'].value_counts()
-                
-                # Remover valores nulos
-                artilheiros_penalti = artilheiros_penalti[artilheiros_penalti.index.notna()]
-                
-                if len(artilheiros_penalti) > 0:
-                    artilheiro_penalti = artilheiros_penalti.index[0]
-                    num_penaltis = artilheiros_penalti.values[0]
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("Maior cobrador de pênaltis", artilheiro_penalti, f"{num_penaltis} gols")
-                        
-                        st.subheader("Top 15 Cobradores de Pênaltis")
-                        top15_pen = artilheiros_penalti.head(15).reset_index()
-                        top15_pen.columns = ['Jogador', 'Pênaltis Convertidos']
-                        st.dataframe(top15_pen, use_container_width=True)
-                    
-                    with col2:
-                        fig = px.bar(artilheiros_penalti.head(15), 
-                                   title='Top 15 Cobradores de Pênaltis',
-                                   labels={'value': 'Pênaltis', 'index': 'Jogador'},
-                                   color=artilheiros_penalti.head(15).values,
-                                   color_continuous_scale='Purples')
-                        fig.update_xaxis(tickangle=-45)
-                        st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("Não foram encontrados gols de pênalti nos dados.")
-            else:
-                st.warning("Colunas necessárias não encontradas no dataset de gols.")
-        except Exception as e:
-            st.error(f"Erro ao processar pênaltis: {str(e)}")
-    
-    # TAB 5: Jogador com mais gols contra
-    with tab5:
-        st.header("🔄 Gols Contra")
+@com_contagem('indice_partidas', st.cache_resource(max_entries=2))
+def load_indice_partidas(versao, _dados):
+    """Índice por partida_id sobre gols, cartões e estatísticas"""
+    return IndicePartidas(_dados)
+
+@com_contagem('explorador', st.cache_resource(max_entries=2))
+def load_explorador(versao, _dados):
+    """Índices invertidos de time, estado, arena, temporada, rodada e gols sobre as partidas"""
+    return ExploradorPartidas(_dados['full'])
+
+@com_contagem('indice_temporadas', st.cache_resource(max_entries=2))
+def load_indice_temporadas(versao, _dados):
+    """Limites de cada temporada nos datasets particionados, para fatiar sem cópia"""
+    return IndiceTemporadas(_dados)
+
+def figura(textos, contexto, nome, construir, *extras):
+    """Figura do cache do processo, montada uma vez por análise, período, versão dos dados e modo"""
+    enxuto = st.session_state["graficos_enxutos"]
+    chave = (textos['chave'], textos['periodo'], contexto.versao, nome, enxuto, *extras)
+    return FIGURAS.obter(chave, lambda: enxugar(construir(enxuto)) if enxuto else construir(enxuto))
+
+def exibir_figura(fig):
+    """Envia a figura ao navegador; instrumentado, mede também os bytes do JSON"""
+    with secao('plotly_chart', 'render') as evento:
+        st.plotly_chart(fig, use_container_width=True)
+        if atual() is not None:
+            evento['bytes'] = len(fig.to_json(validate=False))
+
+def exibir_ranking(serie, textos, contexto):
+    """Métrica do líder, tabela do top N e gráfico de barras de um ranking"""
+    lider = serie.index[0]
+    valor = int(serie.values[0])
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric(textos['metrica'], lider, f"{valor} {textos['unidade']}")
         
-        try:
-            if 'atleta' in df_gols.columns and 'tipo_de_gol' in df_gols.columns:
-                # Filtrar apenas gols contra
-                gols_contra = df_gols[df_gols['tipo_de_gol'].str.contains('Gol Contra|Contra|Own Goal', case=False, na=False)]
-                jogadores_gols_contra = gols_contra['atleta'].value_counts()
-                
-                # Remover valores nulos
-                jogadores_gols_contra = jogadores_gols_contra[jogadores_gols_contra.index.notna()]
-                
-                if len(jogadores_gols_contra) > 0:
-                    jogador_mais_gc = jogadores_gols_contra.index[0]
-                    num_gc = jogadores_gols_contra.values[0]
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("Jogador com mais gols contra", jogador_mais_gc, f"{num_gc} gols contra")
-                        
-                        st.subheader("Top 15 Jogadores com Gols Contra")
-                        top15_gc = jogadores_gols_contra.head(15).reset_index()
-                        top15_gc.columns = ['Jogador', 'Gols Contra']
-                        st.dataframe(top15_gc, use_container_width=True)
-                    
-                    with col2:
-                        fig = px.bar(jogadores_gols_contra.head(15), 
-                                   title='Top 15 Jogadores com Gols Contra',
-                                   labels={'value': 'Gols Contra', 'index': 'Jogador'},
-                                   color=jogadores_gols_contra.head(15).values,
-                                   color_continuous_scale='Oranges')
-                        fig.update_xaxis(tickangle=-45)
-                        st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("Não foram encontrados gols contra nos dados.")
-            else:
-                st.warning("Colunas necessárias não encontradas no dataset de gols.")
-        except Exception as e:
-            st.error(f"Erro ao processar gols contra: {str(e)}")
-    
-    # TAB 6: Jogador com mais cartões amarelos
-    with tab6:
-        st.header("🟨 Cartões Amarelos")
+        st.subheader(textos['titulo_tabela'])
+        tabela = serie.head(textos['top_tabela']).reset_index()
+        tabela.columns = list(textos['colunas'])
+        st.dataframe(tabela, use_container_width=True)
+    
+    with col2:
+        def construir(enxuto):
+            topo = serie.head(textos['top_grafico'])
+            fig = px.bar(topo, 
+                       title=textos['titulo_grafico'],
+                       labels={'value': textos['eixo'], 'index': textos['item']},
+                       color=topo.values,
+                       color_continuous_scale=textos['escala'])
+            if textos.get('inclinar'):
+                fig.update_xaxes(tickangle=-45)
+            return fig
+        exibir_figura(figura(textos, contexto, 'ranking', construir))
+
+def exibir_partidas(top_partidas, textos, contexto):
+    """Placar da partida com mais gols, seus detalhes e o top 10"""
+    partida_mais_gols = top_partidas.iloc[0]
+    
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.subheader("🏟️ Partida com maior número de gols")
+    
+        # Criar um placar visual
+        placar_html = f"""
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                    padding: 30px; 
+                    border-radius: 15px; 
+                    text-align: center;
+                    box-shadow: 0 10px 30px rgba(0,0,0,0.3);">
+            <h2 style="color: white; margin: 0; font-size: 24px;">{partida_mais_gols['mandante']}</h2>
+            <h1 style="color: #FFD700; margin: 20px 0; font-size: 48px; font-weight: bold;">
+                {int(partida_mais_gols['mandante_Placar'])} x {int(partida_mais_gols['visitante_Placar'])}
+            </h1>
+            <h2 style="color: white; margin: 0; font-size: 24px;">{partida_mais_gols['visitante']}</h2>
+            <p style="color: #f0f0f0; margin-top: 20px; font-size: 18px;">
+                📅 {partida_mais_gols['data']} | 🏆 Rodada {int(partida_mais_gols['rodata'])}
+            </p>
+            <p style="color: #FFD700; margin-top: 10px; font-size: 22px; font-weight: bold;">
+                ⚽ Total: {int(partida_mais_gols['total_gols'])} gols
+            </p>
+        </div>
+        """
+        st.markdown(placar_html, unsafe_allow_html=True)
+    
+        st.markdown("---")
+        st.subheader("Detalhes da partida")
+    
+        detalhes = {
+            'Informação': ['Mandante', 'Visitante', 'Placar', 'Data', 'Rodada', 'Arena', 'Vencedor', 'Total de Gols'],
+            'Valor': [
+                partida_mais_gols['mandante'],
+                partida_mais_gols['visitante'],
+                f"{int(partida_mais_gols['mandante_Placar'])} x {int(partida_mais_gols['visitante_Placar'])}",
+                partida_mais_gols['data'],
+                int(partida_mais_gols['rodata']),
+                partida_mais_gols['arena'],
+                partida_mais_gols['vencedor'],
+                int(partida_mais_gols['total_gols'])
+            ]
+        }
+    
+        df_detalhes = pd.DataFrame(detalhes)
+        st.dataframe(df_detalhes, use_container_width=True, hide_index=True)
+
+    with col2:
+        st.subheader("📊 Top 10 Partidas")
+        top10_gols = top_partidas[['mandante', 'visitante', 'mandante_Placar', 'visitante_Placar', 'total_gols', 'data']].copy()
+        top10_gols['Placar'] = top10_gols['mandante_Placar'].astype(int).astype(str) + ' x ' + top10_gols['visitante_Placar'].astype(int).astype(str)
+        top10_gols['Jogo'] = top10_gols['mandante'].astype(str) + ' vs ' + top10_gols['visitante'].astype(str)
+    
+        display_df = top10_gols[['Jogo', 'Placar', 'total_gols']].copy()
+        display_df.columns = ['Partida', 'Placar', 'Total']
+        display_df = display_df.reset_index(drop=True)
+        display_df.index = display_df.index + 1
+    
+        st.dataframe(display_df, use_container_width=True)
+    
+    if contexto.partidas is not None:
+        st.markdown("---")
+        st.subheader("🔎 Detalhes de uma partida")
+        opcoes = {
+            f"{p['mandante']} {int(p['mandante_Placar'])} x {int(p['visitante_Placar'])} {p['visitante']} ({p['data']})": int(p['ID'])
+            for _, p in top_partidas.iterrows()
+        }
+        escolhida = st.selectbox("Partida", list(opcoes), key="detalhe_partida")
+        exibir_detalhe_partida(contexto.partidas.detalhe(opcoes[escolhida]))
+    
+    if contexto.explorador is not None and contexto.explorador.df is not None:
+        st.markdown("---")
+        exibir_explorador(contexto.explorador, textos['inicio'], textos['fim'])
+
+def exibir_explorador(explorador, inicio=None, fim=None):
+    """Partidas filtradas, ordenadas e paginadas no servidor; só a página visível vai para o navegador
+
+    O período da sidebar (``inicio``/``fim``) limita o filtro de temporadas.
+    """
+    st.subheader("🗂️ Explorar partidas")
+    
+    def voltar_ao_inicio():
+        st.session_state["explorador_pagina"] = 1
+    
+    def faixa(rotulo, filtro, limites=None):
+        """Slider de faixa dentro de ``limites``; a faixa com todos os valores não filtra"""
+        todos = explorador.opcoes(filtro)
+        if todos is None:
+            return None
+        limites = tuple(limites or todos)
+        escolhida = limites
+        if limites[0] < limites[1]:
+            # Chave por limites: o slider recomeça quando o período da sidebar muda
+            escolhida = st.slider(rotulo, *limites, value=limites, key=f"explorador_{filtro}_{limites[0]}_{limites[1]}",
+                                  on_change=voltar_ao_inicio)
+        return None if tuple(escolhida) == tuple(todos) else tuple(escolhida)
+    
+    periodo = None
+    if (inicio is not None or fim is not None) and explorador.opcoes('temporadas') is not None:
+        primeira, ultima = explorador.opcoes('temporadas')
+        periodo = (primeira if inicio is None else max(primeira, inicio), ultima if fim is None else min(ultima, fim))
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        times = st.multiselect("Times", explorador.opcoes('times') or [], key="explorador_times", on_change=voltar_ao_inicio)
+        temporadas = faixa("Temporadas", 'temporadas', periodo)
+    with col2:
+        estados = st.multiselect("Estados", explorador.opcoes('estados') or [], key="explorador_estados", on_change=voltar_ao_inicio)
+        rodadas = faixa("Rodadas", 'rodadas')
+    with col3:
+        arenas = st.multiselect("Arenas", explorador.opcoes('arenas') or [], key="explorador_arenas", on_change=voltar_ao_inicio)
+        gols = faixa("Total de gols", 'gols')
+    
+    rotulos_ordem = {'data': 'Data', 'total_gols': 'Total de gols', 'rodata': 'Rodada',
+                     'mandante': 'Mandante', 'visitante': 'Visitante', 'arena': 'Arena'}
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        ordenar = st.selectbox("Ordenar por", ORDENACOES, format_func=rotulos_ordem.get, key="explorador_ordem")
+    with col2:
+        decrescente = st.toggle("Decrescente", value=True, key="explorador_decrescente")
+    with col3:
+        tamanho = st.selectbox("Por página", [25, 50, 100], key="explorador_tamanho", on_change=voltar_ao_inicio)
+    with col4:
+        st.session_state.setdefault("explorador_pagina", 1)
+        numero = st.number_input("Página", min_value=1, step=1, key="explorador_pagina")
+    
+    with secao('explorador', 'render'):
+        pagina = explorador.consultar(ordenar=ordenar, decrescente=decrescente, numero=int(numero), tamanho=tamanho,
+                                      times=times, estados=estados, arenas=arenas,
+                                      temporadas=temporadas, rodadas=rodadas, gols=gols)
+    st.caption(f"{pagina.total} partidas · página {pagina.numero} de {pagina.paginas}")
+    linhas = pagina.linhas
+    if len(linhas):
+        exibicao = pd.DataFrame({
+            'ID': linhas['ID'],
+            'Data': linhas['data'].astype(str),
+            'Rodada': linhas['rodata'],
+            'Mandante': linhas['mandante'].astype(str),
+            'Placar': linhas['mandante_Placar'].astype(str) + ' x ' + linhas['visitante_Placar'].astype(str),
+            'Visitante': linhas['visitante'].astype(str),
+            'Arena': linhas['arena'].astype(str),
+            'Gols': linhas['total_gols'],
+        })
+        st.dataframe(exibicao, use_container_width=True, hide_index=True)
+    else:
+        st.caption("Nenhuma partida com esses filtros.")
+
+def exibir_detalhe_partida(detalhe):
+    """Gols, cartões e estatísticas de uma partida, lidos do índice por partida_id"""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**⚽ Gols**")
+        if len(detalhe.gols):
+            gols = detalhe.gols[[c for c in ['minuto', 'clube', 'atleta', 'tipo_de_gol'] if c in detalhe.gols.columns]].copy()
+            gols.columns = ['Minuto', 'Clube', 'Jogador', 'Tipo'][:len(gols.columns)]
+            st.dataframe(gols, use_container_width=True, hide_index=True)
+        else:
+            st.caption("Sem gols registrados para esta partida.")
+    
+    with col2:
+        st.write("**🟨🟥 Cartões**")
+        if len(detalhe.cartoes):
+            cartoes = detalhe.cartoes[[c for c in ['minuto', 'clube', 'atleta', 'cartao'] if c in detalhe.cartoes.columns]].copy()
+            cartoes.columns = ['Minuto', 'Clube', 'Jogador', 'Cartão'][:len(cartoes.columns)]
+            st.dataframe(cartoes, use_container_width=True, hide_index=True)
+        else:
+            st.caption("Sem cartões registrados para esta partida.")
+    
+    st.write("**📊 Estatísticas**")
+    if len(detalhe.estatisticas) and 'clube' in detalhe.estatisticas.columns:
+        estatisticas = detalhe.estatisticas.drop(columns=['partida_id', 'rodata'], errors='ignore')
+        estatisticas = estatisticas.set_index(estatisticas['clube'].astype(str)).drop(columns='clube').T.astype(str)
+        st.dataframe(estatisticas, use_container_width=True)
+    else:
+        st.caption("Sem estatísticas registradas para esta partida.")
+
+def exibir_tabela(resultado, textos, contexto):
+    """Classificação final da temporada e gráfico de posição ao longo das rodadas"""
+    temporada = resultado['temporada']
+    tabela = resultado['tabela']
+    evolucao = resultado['evolucao']
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.subheader(f"Classificação final {temporada}")
+        st.metric("Campeão", tabela['time'].iloc[0], f"{int(tabela['pontos'].iloc[0])} pontos")
+        exibicao = tabela[['posicao', 'time', 'pontos', 'jogos', 'vitorias', 'empates', 'derrotas', 'gols_pro', 'gols_contra', 'saldo']]
+        exibicao.columns = ['Pos', 'Time', 'P', 'J', 'V', 'E', 'D', 'GP', 'GC', 'SG']
+        st.dataframe(exibicao, use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.subheader("Posição rodada a rodada")
+        times = st.multiselect(
+            "Times",
+            tabela['time'].tolist(),
+            default=tabela['time'].head(4).tolist(),
+            key=f"times_classificacao_{temporada}",
+        )
+        def construir(enxuto):
+            pontos = evolucao[evolucao['time'].isin(times)]
+            if enxuto:
+                pontos = reduzir_pontos(pontos, 'rodada', 'posicao', 'time')
+            fig = px.line(pontos,
+                          x='rodada', y='posicao', color='time', markers=True,
+                          title=f'Evolução na tabela - {temporada}',
+                          labels={'rodada': 'Rodada', 'posicao': 'Posição', 'time': 'Time'},
+                          hover_data=['pontos'])
+            fig.update_yaxes(autorange='reversed', dtick=1)
+            return fig
+        exibir_figura(figura(textos, contexto, 'evolucao', construir, temporada, tuple(times)))
+
+def exibir_confrontos(recorte, textos, contexto):
+    """Confronto direto entre dois times e o perfil do primeiro"""
+    times = recorte.times_ativos()
+    col1, col2 = st.columns(2)
+    with col1:
+        time = st.selectbox("Time", times, key="confronto_time")
+    with col2:
+        adversarios = [t for t in times if t != time]
+        adversario = st.selectbox("Adversário", adversarios, key="confronto_adversario")
+    
+    if adversario is not None:
+        st.subheader(f"⚔️ {time} x {adversario}")
+        confronto = recorte.confronto(time, adversario)
+        total = confronto.loc['Total']
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Jogos", int(total['jogos']))
+        col2.metric(f"Vitórias {time}", int(total['vitorias']))
+        col3.metric("Empates", int(total['empates']))
+        col4.metric(f"Vitórias {adversario}", int(total['derrotas']))
+        exibicao = confronto.copy()
+        exibicao.columns = ['Jogos', 'Vitórias', 'Empates', 'Derrotas', 'Gols Pró', 'Gols Contra']
+        st.dataframe(exibicao, use_container_width=True)
+    
+    st.markdown("---")
+    st.subheader(f"📋 Perfil - {time}")
+    perfil = recorte.perfil(time)
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.write("**Campanha**")
+        campanha = perfil['campanha'].copy()
+        campanha.columns = ['Jogos', 'Vitórias', 'Empates', 'Derrotas', 'Gols Pró', 'Gols Contra']
+        st.dataframe(campanha, use_container_width=True)
         
-        try:
-            if 'atleta' in df_cartoes.columns and 'cartao' in df_cartoes.columns:
-                # Filtrar cartões amarelos
-                cartoes_amarelos = df_cartoes[df_cartoes['cartao'] == 'Amarelo']
-                jogadores_amarelos = cartoes_amarelos['atleta'].value_counts()
-                
-                # Remover valores nulos
-                jogadores_amarelos = jogadores_amarelos[jogadores_amarelos.index.notna()]
-                
-                if len(jogadores_amarelos) > 0:
-                    jogador_mais_amarelos = jogadores_amarelos.index[0]
-                    num_amarelos = jogadores_amarelos.values[0]
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("Jogador com mais cartões amarelos", jogador_mais_amarelos, f"{num_amarelos} cartões")
-                        
-                        st.subheader("Top 20 Jogadores - Cartões Amarelos")
-                        top20_am = jogadores_amarelos.head(20).reset_index()
-                        top20_am.columns = ['Jogador', 'Cartões Amarelos']
-                        st.dataframe(top20_am, use_container_width=True)
-                    
-                    with col2:
-                        fig = px.bar(jogadores_amarelos.head(15), 
-                                   title='Top 15 - Cartões Amarelos',
-                                   labels={'value': 'Cartões Amarelos', 'index': 'Jogador'},
-                                   color=jogadores_amarelos.head(15).values,
-                                   color_continuous_scale='YlOrBr')
-                        fig.update_xaxis(tickangle=-45)
-                        st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("Não foram encontrados cartões amarelos nos dados.")
-            else:
-                st.warning("Colunas necessárias não encontradas no dataset de cartões.")
-        except Exception as e:
-            st.error(f"Erro ao processar cartões amarelos: {str(e)}")
-    
-    # TAB 7: Jogador com mais cartões vermelhos
-    with tab7:
-        st.header("🟥 Cartões Vermelhos")
+        st.write("**Adversários mais enfrentados**")
+        contra = recorte.adversarios(time).head(10).reset_index()
+        contra.columns = ['Adversário', 'Jogos', 'Vitórias', 'Empates', 'Derrotas', 'Gols Pró', 'Gols Contra']
+        st.dataframe(contra, use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.write("**Gols e cartões do clube**")
+        eventos = pd.DataFrame({
+            'Evento': ['Gols', 'Pênaltis', 'Gols contra', 'Cartões amarelos', 'Cartões vermelhos'],
+            'Total': [
+                int(perfil['gols'].sum()),
+                int(perfil['gols']['penalti']),
+                int(perfil['gols']['contra']),
+                int(perfil['cartoes']['amarelo']),
+                int(perfil['cartoes']['vermelho']),
+            ],
+        })
+        st.dataframe(eventos, use_container_width=True, hide_index=True)
         
-        try:
-            if 'atleta' in df_cartoes.columns and 'cartao' in df_cartoes.columns:
-                # Filtrar cartões vermelhos
-                cartoes_vermelhos = df_cartoes[df_cartoes['cartao'] == 'Vermelho']
-                jogadores_vermelhos = cartoes_vermelhos['atleta'].value_counts()
-                
-                # Remover valores nulos
-                jogadores_vermelhos = jogadores_vermelhos[jogadores_vermelhos.index.notna()]
-                
-                if len(jogadores_vermelhos) > 0:
-                    jogador_mais_vermelhos = jogadores_vermelhos.index[0]
-                    num_vermelhos = jogadores_vermelhos.values[0]
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("Jogador com mais cartões vermelhos", jogador_mais_vermelhos, f"{num_vermelhos} cartões")
-                        
-                        st.subheader("Top 20 Jogadores - Cartões Vermelhos")
-                        top20_vm = jogadores_vermelhos.head(20).reset_index()
-                        top20_vm.columns = ['Jogador', 'Cartões Vermelhos']
-                        st.dataframe(top20_vm, use_container_width=True)
-                    
-                    with col2:
-                        fig = px.bar(jogadores_vermelhos.head(15), 
-                                   title='Top 15 - Cartões Vermelhos',
-                                   labels={'value': 'Cartões Vermelhos', 'index': 'Jogador'},
-                                   color=jogadores_vermelhos.head(15).values,
-                                   color_continuous_scale='Reds')
-                        fig.update_xaxis(tickangle=-45)
-                        st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("Não foram encontrados cartões vermelhos nos dados.")
-            else:
-                st.warning("Colunas necessárias não encontradas no dataset de cartões.")
-        except Exception as e:
-            st.error(f"Erro ao processar cartões vermelhos: {str(e)}")
-    
-    # TAB 8: Partida com mais gols
-    with tab8:
-        st.header("🎲 Partida com Mais Gols")
+        st.write("**Artilheiros**")
+        artilheiros = perfil['artilheiros'].reset_index()
+        artilheiros.columns = ['Jogador', 'Gols']
+        st.dataframe(artilheiros, use_container_width=True, hide_index=True)
+
+EXIBIDORES = {
+    'ranking': exibir_ranking,
+    'partidas': exibir_partidas,
+    'tabela': exibir_tabela,
+    'confrontos': exibir_confrontos,
+}
+
+def exibir_analise(analise, contexto, **params):
+    """Avalia uma única análise do registro (com memoização) e renderiza o resultado"""
+    textos = analise.textos(**params)
+    st.header(textos['titulo'])
+    if params:
+        st.caption(f"📅 Temporadas: {formatar_periodo(params.get('inicio'), params.get('fim'))}")
+    
+    faltantes = REGISTRO.faltantes(analise.chave, contexto)
+    if faltantes:
+        st.warning(f"Dataset indisponível: {', '.join(faltantes)}.")
+        return
+    
+    try:
+        resultado = REGISTRO.avaliar(analise.chave, contexto, **params)
+        if len(resultado) == 0:
+            st.warning(textos['vazio'])
+        else:
+            with secao(f'render {analise.chave}', 'render'):
+                EXIBIDORES[analise.tipo](resultado, textos, contexto)
+    except Exception as e:
+        st.error(f"Erro ao processar {textos['rotulo']}: {str(e)}")
+
+def total_linhas(nome, contexto, **params):
+    """Linhas de um dataset no período, sem filtrar os frames"""
+    if contexto.dados.get(nome) is not None:
+        # Busca binária no índice de temporadas
+        return contexto.temporadas.contagem(nome, **params)
+    if nome in contexto.agregados.datasets:
+        # Modo de streaming: soma dos eventos por partida guardados nos agregados
+        return int(contexto.agregados.intervalo(f'{nome}_por_partida', **params).sum())
+    return "—"
+
+def exibir_diagnostico(rastro, dados):
+    """Painel da sidebar com a instrumentação da execução, os caches e as colunas dos datasets"""
+    with st.expander("🩺 Diagnóstico"):
+        st.toggle("Instrumentar execuções", key="instrumentar",
+                  help="Cronometra carga, análises e gráficos e conta acertos dos caches a partir da próxima execução.")
+        st.toggle("Picos de memória (tracemalloc)", key="instrumentar_memoria",
+                  disabled=not st.session_state["instrumentar"], help="Mais preciso, porém deixa a execução mais lenta.")
+        st.toggle("Gráficos enxutos", key="graficos_enxutos",
+                  help="Arredonda os dados, reduz o template e as séries longas dos gráficos enviados ao navegador.")
         
-        try:
-            # Calcular total de gols por partida
-            df_full['total_gols'] = df_full['mandante_Placar'] + df_full['visitante_Placar']
+        if rastro is not None:
+            rastro.encerrar()
+            rastros = st.session_state.setdefault("rastros", [])
+            rastros.append(rastro)
+            del rastros[:-RASTROS_GUARDADOS]
             
-            # Encontrar partida com mais gols
-            partida_mais_gols = df_full.loc[df_full['total_gols'].idxmax()]
-            
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                st.subheader("🏟️ Partida com maior número de gols")
-                
-                # Criar um placar visual
-                placar_html = f"""
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                            padding: 30px; 
-                            border-radius: 15px; 
-                            text-align: center;
-                            box-shadow: 0 10px 30px rgba(0,0,0,0.3);">
-                    <h2 style="color: white; margin: 0; font-size: 24px;">{partida_mais_gols['mandante']}</h2>
-                    <h1 style="color: #FFD700; margin: 20px 0; font-size: 48px; font-weight: bold;">
-                        {int(partida_mais_gols['mandante_Placar'])} x {int(partida_mais_gols['visitante_Placar'])}
-                    </h1>
-                    <h2 style="color: white; margin: 0; font-size: 24px;">{partida_mais_gols['visitante']}</h2>
-                    <p style="color: #f0f0f0; margin-top: 20px; font-size: 18px;">
-                        📅 {partida_mais_gols['data']} | 🏆 Rodada {int(partida_mais_gols['rodata'])}
-                    </p>
-                    <p style="color: #FFD700; margin-top: 10px; font-size: 22px; font-weight: bold;">
-                        ⚽ Total: {int(partida_mais_gols['total_gols'])} gols
-                    </p>
-                </div>
-                """
-                st.markdown(placar_html, unsafe_allow_html=True)
-                
-                st.markdown("---")
-                st.subheader("Detalhes da partida")
-                
-                detalhes = {
-                    'Informação': ['Mandante', 'Visitante', 'Placar', 'Data', 'Rodada', 'Arena', 'Vencedor', 'Total de Gols'],
-                    'Valor': [
-                        partida_mais_gols['mandante'],
-                        partida_mais_gols['visitante'],
-                        f"{int(partida_mais_gols['mandante_Placar'])} x {int(partida_mais_gols['visitante_Placar'])}",
-                        partida_mais_gols['data'],
-                        int(partida_mais_gols['rodata']),
-                        partida_mais_gols['arena'],
-                        partida_mais_gols['vencedor'],
-                        int(partida_mais_gols['total_gols'])
-                    ]
-                }
-                
-                df_detalhes = pd.DataFrame(detalhes)
-                st.dataframe(df_detalhes, use_container_width=True, hide_index=True)
-            
-            with col2:
-                st.subheader("📊 Top 10 Partidas")
-                top10_gols = df_full.nlargest(10, 'total_gols')[['mandante', 'visitante', 'mandante_Placar', 'visitante_Placar', 'total_gols', 'data']].copy()
-                top10_gols['Placar'] = top10_gols['mandante_Placar'].astype(int).astype(str) + ' x ' + top10_gols['visitante_Placar'].astype(int).astype(str)
-                top10_gols['Jogo'] = top10_gols['mandante'] + ' vs ' + top10_gols['visitante']
-                
-                display_df = top10_gols[['Jogo', 'Placar', 'total_gols']].copy()
-                display_df.columns = ['Partida', 'Placar', 'Total']
-                display_df = display_df.reset_index(drop=True)
-                display_df.index = display_df.index + 1
-                
-                st.dataframe(display_df, use_container_width=True)
-        except Exception as e:
-            st.error(f"Erro ao processar partidas: {str(e)}")
-    
-    # Sidebar com informações gerais
-    with st.sidebar:
-        st.header("📊 Informações Gerais")
-        st.metric("Total de Jogos", len(df_full))
-        st.metric("Total de Gols", len(df_gols))
-        st.metric("Total de Cartões", len(df_cartoes))
-        st.metric("Período", "2003-2022")
+            st.metric("Última execução", f"{rastro.duracao * 1000:.0f} ms")
+            st.write("**Seções**")
+            secoes = pd.DataFrame(rastro.secoes())
+            st.dataframe(secoes.dropna(axis=1, how='all'), hide_index=True)
+            st.write("**Caches**")
+            st.dataframe(pd.DataFrame(rastro.acessos_cache()), hide_index=True)
+            st.download_button(
+                f"⬇️ Exportar trace ({len(rastros)} execuções)",
+                json.dumps(exportar_chrome(rastros), default=str),
+                file_name="brasileirao-trace.json",
+                mime="application/json",
+                help="Formato Trace Event: abre em chrome://tracing, Perfetto ou speedscope.",
+                use_container_width=True,
+            )
         
+        st.write("**Colunas dos datasets**")
+        st.dataframe(pd.DataFrame([
+            {'dataset': nome, 'colunas': ', '.join(map(str, df.columns)) if df is not None else '—'}
+            for nome, df in dados.items()
+        ]), hide_index=True)
+
+# Rastro encerrado mesmo se a execução for interrompida (rerun/stop) ou falhar:
+# um rastro aberto com memória manteria o tracemalloc ligado no processo
+try:
+    # Carregar dados
+    carga = load_carga()
+    # Datasets que falharam são tentados de novo com espera crescente, sem refazer a carga a cada interação
+    estado = carga.tentar_falhas()
+    dados, relatorio_carga, relatorio_memoria, versao = estado.dados, estado.relatorio_carga, estado.relatorio_memoria, estado.versao
+    for r in relatorio_carga:
+        if r['status'] != 'ok':
+            st.warning(f"⚠️ Dataset '{r['dataset']}' indisponível: {r['erro']}")
+
+    df_full = dados['full']
+    df_gols = dados['gols']
+    df_cartoes = dados['cartoes']
+    df_estatisticas = dados['estatisticas']
+    agregados = estado.agregados
+    indice_temporadas = load_indice_temporadas(versao, dados)
+    tabela_campeonato = estado.tabela
+    confrontos = load_confrontos(versao, dados)
+    indice_partidas = load_indice_partidas(versao, dados)
+    explorador = load_explorador(versao, dados) if dados['full'] is not None else None
+
+    if any(df is not None for df in dados.values()):
+    
+        # Seletor de temporadas: quando ativo, vale para todas as análises
+        temporadas = indice_temporadas.temporadas
+        with st.sidebar:
+            st.header("📅 Temporadas")
+            filtrar_temporadas = st.toggle("Filtrar temporadas", key="filtrar_temporadas", disabled=not temporadas)
+            if temporadas:
+                inicio, fim = st.select_slider(
+                    "Período",
+                    options=temporadas,
+                    value=(temporadas[0], temporadas[-1]),
+                    disabled=not filtrar_temporadas,
+                    key="periodo",
+                )
+        params_periodo = {'inicio': inicio, 'fim': fim} if filtrar_temporadas else {}
+    
+        # Seletor de análise: só a análise escolhida é calculada e renderizada
+        contexto = Contexto(dados, agregados, versao, indice_temporadas, tabela_campeonato, confrontos, indice_partidas,
+                            explorador)
+        chave_analise = st.radio(
+            "Análise",
+            REGISTRO.chaves(),
+            format_func=lambda chave: REGISTRO[chave].textos(**params_periodo)['rotulo'],
+            horizontal=True,
+            label_visibility="collapsed",
+            key="analise",
+        )
         st.markdown("---")
-        st.markdown("### 📁 Datasets Carregados")
-        st.success("✅ Campeonato Full")
-        st.success("✅ Gols")
-        st.success("✅ Cartões")
-        st.success("✅ Estatísticas")
+        exibir_analise(REGISTRO[chave_analise], contexto, **params_periodo)
+    
+        # Sidebar com informações gerais
+        with st.sidebar:
+            st.header("📊 Informações Gerais")
+            st.metric("Total de Jogos", total_linhas('full', contexto, **params_periodo))
+            st.metric("Total de Gols", total_linhas('gols', contexto, **params_periodo))
+            st.metric("Total de Cartões", total_linhas('cartoes', contexto, **params_periodo))
+            st.metric("Período", formatar_periodo(*params_periodo.values()) if params_periodo else "2003-2022")
+            if config_dados.offline:
+                st.caption(f"📴 Modo offline — snapshots em `{config_dados.diretorio}`")
         
-        st.markdown("---")
-        st.markdown("#### 💡 Sobre")
-        st.info("Análise completa dos dados do Campeonato Brasileiro entre 2003 e 2022.")
+            st.markdown("---")
+            st.markdown("### 📁 Datasets Carregados")
+            nomes_datasets = {'full': 'Campeonato Full', 'gols': 'Gols', 'cartoes': 'Cartões', 'estatisticas': 'Estatísticas'}
+            for r in relatorio_carga:
+                if r['status'] == 'ok':
+                    st.success(f"✅ {nomes_datasets[r['dataset']]}")
+                else:
+                    st.error(f"❌ {nomes_datasets[r['dataset']]}")
+            # Só as linhas acrescentadas às fontes são lidas; rankings e tabela são atualizados pela diferença
+            st.button("🔄 Buscar novas rodadas", on_click=carga.atualizar, disabled=config_dados.offline,
+                      use_container_width=True)
+            with st.expander("⏱️ Tempo de carga por dataset"):
+                st.dataframe(pd.DataFrame(relatorio_carga).drop(columns='erro'), hide_index=True)
+            with st.expander("💾 Memória por dataset"):
+                st.dataframe(pd.DataFrame(relatorio_memoria), hide_index=True)
+        
+            st.markdown("---")
+            st.markdown("#### 💡 Sobre")
+            st.info("Análise completa dos dados do Campeonato Brasileiro entre 2003 e 2022.")
 
-else:
-    st.error("❌ Não foi possível carregar os dados. Verifique a conexão com o repositório GitHub.")
\ No newline at end of file
+    else:
+        st.error("❌ Não foi possível carregar os dados. Verifique a conexão com o repositório GitHub.")
+
+    # Diagnóstico por último: a tabela de seções cobre toda a execução acima
+    with st.sidebar:
+        exibir_diagnostico(rastro, dados)
+finally:
+    if rastro is not None:
+        rastro.encerrar()
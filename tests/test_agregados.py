@@ -0,0 +1,23 @@
+"""Consultas ao armazém de agregados."""
+import numpy as np
+
+from benchmarks.sintetico import gerar_partidas
+from brasileirao.agregados import construir_agregados
+from brasileirao.snapshot import preparar_datas
+
+
+def test_alterar_o_ranking_obtido_nao_altera_o_armazem():
+    full = preparar_datas(gerar_partidas(1, np.random.default_rng(0)))
+    armazem = construir_agregados({'full': full})
+    original = armazem.obter('vitorias', 2010).copy()
+
+    for ranking in (armazem.obter('vitorias', 2010), armazem.intervalo('vitorias', 2010, 2010)):
+        ranking.iloc[0] = -1
+        ranking.sort_index(inplace=True)
+        ranking.drop(ranking.index[-1], inplace=True)
+    partidas = armazem.obter('partidas_mais_gols', 2010)
+    partidas.loc[partidas.index[0], 'total_gols'] = -1
+
+    assert armazem.obter('vitorias', 2010).equals(original)
+    assert (armazem.obter('partidas_mais_gols', 2010)['total_gols'] > 0).all()
+    assert armazem.obter('inexistente').empty
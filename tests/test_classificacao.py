@@ -0,0 +1,60 @@
+"""Códigos de ``tipo_de_gol``/``cartao`` comparados com os filtros de texto originais."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar_eventos, gerar_partidas
+from brasileirao.classificacao import CLASSES, classe_de, classificar, codificar, filtros
+from brasileirao.snapshot import preparar_datas
+
+# Filtros do app antes da classificação na carga
+ORIGINAIS = {
+    ('gol', 'penalti'): lambda s: s.str.contains('Penalty|Pênalti|Penalti', case=False, na=False),
+    ('gol', 'contra'): lambda s: s.str.contains('Gol Contra|Contra|Own Goal', case=False, na=False),
+    ('cartao', 'amarelo'): lambda s: s == 'Amarelo',
+    ('cartao', 'vermelho'): lambda s: s == 'Vermelho',
+}
+
+VALORES = {
+    'gol': ['Penalty', 'Gol Contra', None, 'pênalti', 'PENALTI', 'Own Goal', 'contra', 'Normal', '', 'Cabeça'],
+    'cartao': ['Amarelo', 'Vermelho', None, 'Outro'],
+}
+
+
+@pytest.mark.parametrize('evento', ['gol', 'cartao'])
+def test_codificar_igual_aos_filtros_originais(evento):
+    serie = pd.Series(VALORES[evento] * 3, dtype=object)
+    codigos = codificar(serie, evento)
+    assert codigos.dtype == np.int8
+    assert codigos.tolist() == [classe_de(v, evento) for v in serie]
+    for classe, codigo in filtros(evento).items():
+        np.testing.assert_array_equal(codigos == codigo, ORIGINAIS[evento, classe](serie).to_numpy(), err_msg=classe)
+
+
+def test_variacoes_de_grafia_e_idioma():
+    gol, cartao = CLASSES['gol'], CLASSES['cartao']
+    assert classe_de('  GOL   contra ', 'gol') == gol.index('contra')
+    assert classe_de('Autogol', 'gol') == gol.index('contra')
+    assert classe_de('Pênalti', 'gol') == gol.index('penalti')
+    assert classe_de('Gol contra de pênalti', 'gol') == gol.index('contra')  # contra vence pênalti
+    assert classe_de('Contragolpe', 'gol') == 0                              # só palavra inteira
+    assert classe_de(np.nan, 'gol') == 0
+    assert classe_de('Tarjeta Roja', 'cartao') == cartao.index('vermelho')
+    assert classe_de('yellow', 'cartao') == cartao.index('amarelo')
+    assert classe_de('Segundo amarelo (vermelho)', 'cartao') == cartao.index('vermelho')
+
+
+def test_classificar_igual_aos_filtros_nos_dados_sinteticos():
+    rng = np.random.default_rng(0)
+    full = preparar_datas(gerar_partidas(1, rng))
+    gols, cartoes, _ = gerar_eventos(full, rng)
+    # Categórica, como sai do Parquet, com nulos no meio
+    dados = classificar({'full': full, 'gols': gols.astype({'tipo_de_gol': 'category'}), 'cartoes': cartoes})
+    assert set(dados) == {'full', 'gols', 'cartoes'} and dados['full'] is full
+    for (evento, classe), original in ORIGINAIS.items():
+        nome, origem, destino = ('gols', 'tipo_de_gol', 'classe_gol') if evento == 'gol' \
+            else ('cartoes', 'cartao', 'classe_cartao')
+        df = dados[nome]
+        esperado = original(df[origem].astype(object))
+        assert esperado.any()
+        np.testing.assert_array_equal(df[destino].to_numpy() == filtros(evento)[classe], esperado.to_numpy())
@@ -0,0 +1,43 @@
+"""Confronto direto comparado com o mesmo cálculo feito em pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar_partidas
+from brasileirao.confrontos import CAMPOS, construir_confrontos
+from brasileirao.snapshot import preparar_datas
+
+
+def _campanha(jogos, gols_pro, gols_contra):
+    """Linha ``CAMPOS`` de uma seleção de jogos, do ponto de vista de um time."""
+    return [len(jogos), int((gols_pro > gols_contra).sum()), int((gols_pro == gols_contra).sum()),
+            int((gols_pro < gols_contra).sum()), int(gols_pro.sum()), int(gols_contra.sum())]
+
+
+@pytest.fixture(scope='module')
+def full():
+    return preparar_datas(gerar_partidas(1, np.random.default_rng(0)))
+
+
+@pytest.mark.parametrize('inicio, fim', [(None, None), (2010, 2015), (2022, None)])
+def test_confronto_igual_ao_filtro_em_pandas(full, inicio, fim):
+    anos = full['ano']
+    periodo = full[anos.between(inicio or anos.min(), fim or anos.max())]
+    time, adversario = periodo['mandante'].iloc[0], periodo['visitante'].iloc[0]
+    casa = periodo[(periodo['mandante'] == time) & (periodo['visitante'] == adversario)]
+    fora = periodo[(periodo['visitante'] == time) & (periodo['mandante'] == adversario)]
+    esperado = pd.DataFrame([
+        _campanha(casa, casa['mandante_Placar'], casa['visitante_Placar']),
+        _campanha(fora, fora['visitante_Placar'], fora['mandante_Placar']),
+    ], index=['Casa', 'Fora'], columns=list(CAMPOS))
+    esperado.loc['Total'] = esperado.sum()
+
+    recorte = construir_confrontos({'full': full}).recorte(inicio, fim)
+    obtido = recorte.confronto(time, adversario)
+    assert obtido['jogos'].loc['Total'] > 0
+    pd.testing.assert_frame_equal(obtido.astype('int64'), esperado.astype('int64'))
+
+    # O mesmo par visto pelo adversário: casa e fora trocados, pró e contra também
+    inverso = recorte.confronto(adversario, time)
+    assert inverso.loc['Total', 'vitorias'] == obtido.loc['Total', 'derrotas']
+    assert inverso.loc['Casa', 'gols_pro'] == obtido.loc['Fora', 'gols_contra']
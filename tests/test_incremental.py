@@ -0,0 +1,151 @@
+"""Atualização incremental: acréscimos sucessivos às fontes geram versões novas."""
+import functools
+import shutil
+import threading
+from dataclasses import replace
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar
+from brasileirao.analises import REGISTRO, montar_contexto
+from brasileirao.fontes import ARQUIVOS, ConfigDados
+from brasileirao.incremental import ESPERA_FALHA, Carga, carregar, falhas
+
+RETIDAS = 20
+
+
+@pytest.fixture
+def fonte(tmp_path):
+    """Fonte local com as últimas ``RETIDAS`` partidas de fora, mais as linhas retidas."""
+    completo, fonte = tmp_path / 'completo', tmp_path / 'fonte'
+    gerar(completo)
+    fonte.mkdir()
+    for nome, arquivo in ARQUIVOS.items():
+        shutil.copy(completo / arquivo, fonte / arquivo)
+    linhas = (completo / ARQUIVOS['full']).read_bytes().splitlines(keepends=True)
+    (fonte / ARQUIVOS['full']).write_bytes(b''.join(linhas[:-RETIDAS]))
+    return ConfigDados(diretorio=tmp_path / 'snapshots', fonte_base=str(fonte)), linhas[-RETIDAS:]
+
+
+def _acrescentar_em(config, nome, linhas):
+    with open(config.fonte(nome), 'ab') as arquivo:
+        arquivo.write(b''.join(linhas))
+
+
+def _vencedor(estado):
+    contexto = montar_contexto(estado.dados, estado.versao, estado.agregados, estado.tabela)
+    return REGISTRO.avaliar('vencedor_temporada', contexto, inicio=2022, fim=2022)
+
+
+def test_acrescimos_sucessivos_mudam_a_versao(fonte):
+    config, retidas = fonte
+    carga = Carga(config)
+    versoes = [carga.estado.versao]
+    for lote in (retidas[:RETIDAS // 2], retidas[RETIDAS // 2:]):
+        _acrescentar_em(config, 'full', lote)
+        estado = carga.atualizar()
+        assert estado.relatorio_carga[0]['origem'] == 'incremental'
+        versoes.append(estado.versao)
+    assert len(set(versoes)) == len(versoes)
+    assert all('full:-' not in versao for versao in versoes)
+
+    # A análise memoizada pela versão acompanha os dados, como uma carga do zero
+    completa = carregar(config)
+    assert completa.versao == carga.estado.versao
+    assert len(carga.estado.dados['full']) == len(completa.dados['full'])
+    assert _vencedor(carga.estado).equals(_vencedor(completa))
+
+
+def test_gol_antes_da_partida_nao_derruba_a_atualizacao(fonte):
+    config, _ = fonte
+    carga = Carga(config)
+    antes = carga.estado
+    linhas = open(config.fonte('gols'), 'rb').read().splitlines(keepends=True)
+    orfao = b'999999,' + linhas[-1].split(b',', 1)[1]
+    _acrescentar_em(config, 'gols', [orfao])
+    estado = carga.atualizar()
+    assert estado.versao != antes.versao
+    assert len(estado.dados['gols']) == len(antes.dados['gols']) + 1
+    assert estado.dados['gols']['ano'].isna().iloc[-1]
+
+    # Gols com ano depois do sem ano: reparticiona, e o sem ano continua no fim
+    _acrescentar_em(config, 'gols', linhas[-3:])
+    gols = carga.atualizar().dados['gols']
+    anos = gols['ano'].to_numpy(dtype='float64')
+    assert len(gols) == len(antes.dados['gols']) + 4
+    com_ano = int((~np.isnan(anos)).sum())
+    assert (np.diff(anos[:com_ano]) >= 0).all() and np.isnan(anos[com_ano:]).all()
+
+
+def test_atualizacao_ignora_o_ttl_da_fonte_remota(fonte):
+    config, retidas = fonte
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(
+        SimpleHTTPRequestHandler, directory=config.fonte_base))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        remota = replace(config, fonte_base=f'http://127.0.0.1:{servidor.server_address[1]}', ttl=24 * 3600)
+        carga = Carga(remota)
+        antes = len(carga.estado.dados['full'])
+        _acrescentar_em(config, 'full', retidas)
+        assert len(carregar(remota).dados['full']) == antes  # dentro do TTL: snapshot
+        assert len(carga.atualizar().dados['full']) == antes + RETIDAS
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def _armazens_iguais(a, b):
+    assert set(a.chaves()) == set(b.chaves())
+    for chave in b.chaves():
+        x, y = a._tabelas[chave], b._tabelas[chave]
+        if isinstance(y, pd.DataFrame):
+            assert x['ID'].tolist() == y['ID'].tolist(), chave
+        else:
+            assert x.sort_index().astype('int64').to_dict() == y.sort_index().astype('int64').to_dict(), chave
+
+
+def test_gols_antes_das_partidas_ganham_o_ano_quando_elas_chegam(fonte):
+    config, retidas = fonte
+    carga = Carga(config)
+    # Os gols das partidas retidas já estão na fonte: carregados sem ano
+    assert carga.estado.dados['gols']['ano'].isna().any()
+    _acrescentar_em(config, 'full', retidas)
+    estado, completa = carga.atualizar(), carregar(config)
+
+    for nome in ('gols', 'cartoes'):
+        incremental, referencia = estado.dados[nome], completa.dados[nome]
+        assert not incremental['ano'].isna().any()
+        chaves = ['partida_id', 'atleta', 'minuto']
+        pd.testing.assert_frame_equal(
+            incremental.sort_values(chaves, kind='stable').reset_index(drop=True),
+            referencia.sort_values(chaves, kind='stable').reset_index(drop=True), check_categorical=False)
+        anos = incremental['ano'].to_numpy(dtype='float64')
+        assert (np.diff(anos) >= 0).all()
+    _armazens_iguais(estado.agregados, completa.agregados)
+
+
+@pytest.mark.parametrize('bloco', [0, 5000])
+def test_falha_persistente_dobra_a_espera(fonte, bloco):
+    config, _ = fonte
+    config = replace(config, bloco=bloco)
+    arquivo = config.fonte('gols')
+    shutil.move(arquivo, f'{arquivo}.fora')
+    carga = Carga(config)
+    assert falhas(carga.estado) == ['gols']
+    estado = carga.estado
+    assert carga.tentar_falhas() is estado  # ainda dentro da espera
+
+    esperas = []
+    for _ in range(3):
+        carga._proxima_tentativa = 0
+        assert carga.tentar_falhas() is estado  # a fonte segue fora: nada é recarregado
+        esperas.append(carga._espera)
+    assert esperas == [ESPERA_FALHA * 2, ESPERA_FALHA * 4, ESPERA_FALHA * 8]
+
+    shutil.move(f'{arquivo}.fora', arquivo)
+    carga._proxima_tentativa = 0
+    assert falhas(carga.tentar_falhas()) == []
+    assert carga._espera == ESPERA_FALHA
@@ -0,0 +1,44 @@
+"""Ingestão: uma fonte remota travada vira falha só do seu dataset."""
+import functools
+import threading
+import time
+from dataclasses import replace
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmarks.sintetico import gerar
+from brasileirao.fontes import ARQUIVOS, ConfigDados
+from brasileirao.ingestao import ingerir
+
+
+class _Travado(SimpleHTTPRequestHandler):
+    """Serve os CSVs, mas não responde ao de estatísticas."""
+
+    def do_GET(self):
+        if self.path.endswith(ARQUIVOS['estatisticas']):
+            time.sleep(3)
+        return super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    gerar(tmp_path / 'fonte')
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_Travado, directory=str(tmp_path / 'fonte')))
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield ConfigDados(diretorio=tmp_path / 'snapshots', fonte_base=f'http://127.0.0.1:{servidor.server_address[1]}')
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_fonte_travada_falha_pelo_timeout(servidor):
+    inicio = time.perf_counter()
+    resultados = ingerir(replace(servidor, timeout=0.5))
+    assert time.perf_counter() - inicio < 2.5
+    assert not resultados['estatisticas'].ok
+    assert 'timed out' in resultados['estatisticas'].erro
+    assert all(resultados[nome].ok for nome in ('full', 'gols', 'cartoes'))
@@ -0,0 +1,61 @@
+"""Filtros do explorador de partidas comparados com a máscara booleana equivalente."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar_partidas
+from brasileirao.partidas import ExploradorPartidas
+from brasileirao.snapshot import preparar_datas
+
+
+@pytest.fixture(scope='module', params=['object', 'category'])
+def full(request):
+    df = preparar_datas(gerar_partidas(1, np.random.default_rng(0)))
+    if request.param == 'category':
+        # Como sai do Parquet: mandante e visitante com o mesmo dicionário
+        times = pd.CategoricalDtype(sorted(set(df['mandante']) | set(df['visitante'])))
+        df = df.astype({'mandante': times, 'visitante': times, 'arena': 'category'})
+    return df
+
+
+def _mascara(df, times=None, temporadas=(None, None), gols=(None, None)):
+    total = df['mandante_Placar'] + df['visitante_Placar']
+    mascara = pd.Series(True, index=df.index)
+    if times:
+        mascara &= df['mandante'].isin(times) | df['visitante'].isin(times)
+    for valores, (inicio, fim) in ((df['ano'], temporadas), (total, gols)):
+        if inicio is not None:
+            mascara &= valores >= inicio
+        if fim is not None:
+            mascara &= valores <= fim
+    return mascara.to_numpy()
+
+
+@pytest.mark.parametrize('filtros', [
+    {'times': ['Clube 000'], 'temporadas': (2010, 2015), 'gols': (4, None)},
+    {'times': ['Clube 000', 'Clube 003'], 'temporadas': (2003, 2003), 'gols': (0, 0)},
+    {'temporadas': (2005, None), 'gols': (None, 2)},
+    {'times': ['Clube 001', 'Inexistente'], 'gols': (3, 5)},
+])
+def test_filtros_combinados_iguais_a_mascara(full, filtros):
+    explorador = ExploradorPartidas(full)
+    esperadas = np.flatnonzero(_mascara(full, **filtros))
+    assert len(esperadas)
+    np.testing.assert_array_equal(explorador.selecionar(**filtros), esperadas)
+
+    # Páginas ordenadas por data, da mais recente, cobrindo todo o resultado
+    ordem = full.iloc[esperadas].sort_values('data_dt', kind='stable').index[::-1]
+    pagina = explorador.consultar(tamanho=10, **filtros)
+    assert (pagina.total, pagina.paginas) == (len(esperadas), -(-len(esperadas) // 10))
+    ids = [explorador.consultar(numero=n, tamanho=10, **filtros).linhas['ID'] for n in range(1, pagina.paginas + 1)]
+    assert pd.concat(ids).tolist() == full.loc[ordem, 'ID'].tolist()
+
+
+def test_sem_filtros_e_filtros_vazios(full):
+    explorador = ExploradorPartidas(full)
+    assert explorador.selecionar() is None
+    assert explorador.selecionar(times=[], temporadas=(None, None)) is None
+    assert explorador.consultar(times=[]).total == len(full)
+    assert explorador.consultar(times=['Inexistente']).total == 0
+    with pytest.raises(ValueError):
+        explorador.selecionar(placar=(1, 2))
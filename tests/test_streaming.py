@@ -0,0 +1,50 @@
+"""Streaming de gols/cartões: o snapshot Parquet é gravado e reaproveitado."""
+from dataclasses import replace
+
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar
+from brasileirao.fontes import ConfigDados
+from brasileirao.snapshot import carregar_dataset, ler_blocos
+
+
+@pytest.fixture
+def config(tmp_path):
+    gerar(tmp_path / 'fonte')
+    return ConfigDados(diretorio=tmp_path / 'snapshots', fonte_base=str(tmp_path / 'fonte'), bloco=5000)
+
+
+def _ler(config, medidas=None):
+    return pd.concat(list(ler_blocos(config, 'gols', config.bloco, medidas)), ignore_index=True)
+
+
+def test_streaming_grava_o_snapshot_e_reaproveita(config):
+    medidas = {}
+    lido = _ler(config, medidas)
+    assert medidas['novas'] == len(lido)
+    assert (config.diretorio / 'gols.json').exists()
+    assert not list(config.diretorio.glob('*.tmp'))
+
+    # Sem mudança na fonte, nem offline, os blocos saem do snapshot
+    for leitura in (config, replace(config, offline=True)):
+        medidas_snapshot = {}
+        pd.testing.assert_frame_equal(_ler(leitura, medidas_snapshot), lido, check_dtype=False)
+        assert medidas_snapshot['novas'] == 0
+        assert medidas_snapshot['checksum'] == medidas['checksum']
+
+    # O snapshot do streaming também serve à carga em memória
+    medidas_carga = {}
+    completo = carregar_dataset(config, 'gols', medidas_carga)
+    assert medidas_carga['origem'] == 'snapshot' and len(completo) == len(lido)
+
+
+def test_streaming_interrompido_mantem_o_snapshot_anterior(config):
+    _ler(config)
+    with open(config.fonte('gols'), 'ab') as arquivo:
+        arquivo.write(open(config.fonte('gols'), 'rb').read().splitlines(keepends=True)[-1])
+    blocos = ler_blocos(config, 'gols', config.bloco)
+    next(blocos)
+    blocos.close()
+    assert not list(config.diretorio.glob('*.tmp'))
+    assert len(_ler(replace(config, offline=True))) == len(_ler(config)) - 1
@@ -0,0 +1,81 @@
+"""Classificação rodada a rodada comparada com um ``sort_values`` do pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar_partidas
+from brasileirao.snapshot import preparar_datas
+from brasileirao.tabela import atualizar_tabela, construir_tabela, temporada_das_partidas
+
+CRITERIOS = ['pontos', 'vitorias', 'saldo', 'gols_pro']
+
+
+def _partidas(jogos, ano=2020):
+    """``full`` mínimo a partir de ``(rodada, mandante, gols, gols, visitante)``."""
+    df = pd.DataFrame(jogos, columns=['rodata', 'mandante', 'mandante_Placar', 'visitante_Placar', 'visitante'])
+    df.insert(0, 'ID', np.arange(1, len(df) + 1))
+    df['data'] = [f'{1 + r:02d}/05/{ano}' for r in df['rodata']]
+    return preparar_datas(df)
+
+
+def _referencia(df, times):
+    """Classificação pelas regras, em pandas: uma linha por time e jogo, soma e ``sort_values``."""
+    linhas = pd.concat([
+        pd.DataFrame({'time': df['mandante'], 'gols_pro': df['mandante_Placar'], 'gols_contra': df['visitante_Placar']}),
+        pd.DataFrame({'time': df['visitante'], 'gols_pro': df['visitante_Placar'], 'gols_contra': df['mandante_Placar']}),
+    ])
+    linhas = linhas.assign(jogos=1, vitorias=linhas['gols_pro'] > linhas['gols_contra'],
+                           empates=linhas['gols_pro'] == linhas['gols_contra'],
+                           derrotas=linhas['gols_pro'] < linhas['gols_contra'])
+    soma = linhas.groupby('time').sum().astype('int64')
+    soma['pontos'] = 3 * soma['vitorias'] + soma['empates']
+    soma['saldo'] = soma['gols_pro'] - soma['gols_contra']
+    # Empate em todos os critérios: vale a ordem do dicionário de times
+    soma = soma.reindex([t for t in times if t in soma.index])
+    return soma.sort_values(CRITERIOS, ascending=False, kind='stable')
+
+
+def test_desempate_por_vitorias_saldo_e_gols_pro():
+    df = _partidas([
+        (1, 'Alfa', 2, 0, 'Beta'), (1, 'Gama', 1, 1, 'Delta'), (1, 'Epsilon', 0, 0, 'Zeta'),
+        (2, 'Alfa', 0, 1, 'Gama'), (2, 'Beta', 3, 0, 'Delta'), (2, 'Zeta', 1, 0, 'Epsilon'),
+        (3, 'Alfa', 1, 1, 'Delta'), (3, 'Beta', 2, 2, 'Gama'), (3, 'Epsilon', 4, 0, 'Zeta'),
+    ])
+    tabela = construir_tabela(df).tabela(2020)
+    # Gama 5 pts; Alfa e Beta 4 pts, 1 vitória e saldo +1 (Beta com mais gols pró);
+    # Epsilon 4 pts, 1 vitória e saldo +3; Zeta e Delta 2 e 2 pts
+    assert tabela['time'].tolist() == ['Gama', 'Epsilon', 'Beta', 'Alfa', 'Zeta', 'Delta']
+    assert tabela['posicao'].tolist() == [1, 2, 3, 4, 5, 6]
+    assert tabela.loc[tabela['time'] == 'Beta', ['pontos', 'vitorias', 'saldo', 'gols_pro']].values.tolist() == [[4, 1, 1, 5]]
+
+    primeira = construir_tabela(df).tabela(2020, rodada=1)
+    assert primeira['time'].tolist()[:1] == ['Alfa'] and primeira['jogos'].tolist() == [1] * 6
+
+
+@pytest.mark.parametrize('semente', [0, 1])
+def test_todas_as_rodadas_iguais_ao_sort_values(semente):
+    df = preparar_datas(gerar_partidas(1, np.random.default_rng(semente)))
+    tabela = construir_tabela(df)
+    temporadas = temporada_das_partidas(df)
+    for temporada in (2003, 2014, 2022):
+        da_temporada = df[temporadas == temporada]
+        for rodada in (1, 19, 38):
+            obtida = tabela.tabela(temporada, rodada)
+            esperada = _referencia(da_temporada[da_temporada['rodata'] <= rodada], tabela.times)
+            assert obtida['time'].tolist() == esperada.index.tolist(), (temporada, rodada)
+            for campo in ['jogos', 'empates', 'derrotas', 'gols_contra', *CRITERIOS]:
+                assert obtida[campo].tolist() == esperada[campo].tolist(), (temporada, rodada, campo)
+
+
+def test_atualizar_so_as_temporadas_novas_iguala_a_tabela_completa():
+    df = preparar_datas(gerar_partidas(1, np.random.default_rng(2)))
+    parcial = construir_tabela(df.iloc[:-200])
+    atualizada = atualizar_tabela(parcial, df, [2022])
+    completa = construir_tabela(df)
+    assert atualizada.temporadas == completa.temporadas
+    # A ordem do dicionário de times pode mudar; os números de cada time, não
+    for temporada in (2003, 2021, 2022):
+        for rodada in (1, 38):
+            obtida = atualizada.tabela(temporada, rodada).drop(columns='posicao').sort_values('time')
+            esperada = completa.tabela(temporada, rodada).drop(columns='posicao').sort_values('time')
+            pd.testing.assert_frame_equal(obtida.reset_index(drop=True), esperada.reset_index(drop=True))